@@ -14,8 +14,10 @@
 # limitations under the License.
 #
 import copy
+import threading
 import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 from polygraphy import config, func, mod, util
 from polygraphy.logger import G_LOGGER, LogMode
@@ -29,6 +31,9 @@ class BaseRunner(object):
     """
     RUNNER_COUNTS = defaultdict(int)
 
+    SUPPORTS_CONCURRENT_INFERENCE = False
+    """bool: Whether ``infer()`` may be called from multiple threads at the same time, for example by ``benchmark()``."""
+
     def __init__(self, name=None, prefix=None):
         """
         Args:
@@ -50,6 +55,12 @@ class BaseRunner(object):
         self.is_active = False
         """bool: Whether this runner has been activated, either via context manager, or by calling ``activate()``."""
 
+        self.resources = None
+        """
+        Set[str]: Tags for the resources used by this runner, like ``"gpu"``. ``Comparator.run()`` may run runners concurrently
+        only if they do not share any resources. None indicates that the runner may use any resource, so it is never run concurrently.
+        """
+
         self._cached_input_metadata = None
 
 
@@ -167,6 +178,80 @@ class BaseRunner(object):
         return self.infer_impl(feed_dict)
 
 
+    def benchmark(self, feed_dict, warm_up=None, iterations=None, duration=None, threads=None):
+        """
+        Measures the latency and throughput of inference using the provided feed_dict.
+        Must be called only after activate() and before deactivate().
+
+        Args:
+            feed_dict (OrderedDict[str, numpy.ndarray]):
+                    A mapping of input tensor names to corresponding input NumPy arrays.
+            warm_up (int):
+                    The number of untimed inferences to run before benchmarking. Defaults to 1.
+            iterations (int):
+                    The number of inferences to time, across all threads. Defaults to 100.
+                    Ignored if ``duration`` is provided.
+            duration (float):
+                    The minimum amount of time, in seconds, for which to run inference, instead of
+                    running a fixed number of iterations.
+            threads (int):
+                    The number of threads from which to run inference concurrently.
+                    Using more than 1 thread requires ``SUPPORTS_CONCURRENT_INFERENCE`` to be True.
+                    Defaults to 1, which runs inferences back-to-back.
+
+        Returns:
+            BenchmarkResult:
+                    The latency of each inference, measured with ``time.perf_counter_ns()``,
+                    and the total time required for all the inferences.
+        """
+        from polygraphy.comparator.struct import BenchmarkResult
+
+        warm_up = util.default(warm_up, 1)
+        iterations = util.default(iterations, 100)
+        threads = util.default(threads, 1)
+        if threads > 1 and not self.SUPPORTS_CONCURRENT_INFERENCE:
+            G_LOGGER.critical("{:35} | Does not support running inference from multiple threads. "
+                              "Please benchmark with a single thread instead.".format(self.name))
+
+        for index in range(warm_up):
+            self.infer(feed_dict, check_inputs=index == 0)
+
+        lock = threading.Lock()
+        timed_iterations = 0
+
+        # Returns whether the thread should run another inference.
+        def should_continue():
+            nonlocal timed_iterations
+            if duration is not None:
+                return time.perf_counter_ns() < deadline
+            with lock:
+                timed_iterations += 1
+                return timed_iterations <= iterations
+
+        def run_inferences():
+            latencies = []
+            while should_continue():
+                inference_start = time.perf_counter_ns()
+                self.infer(feed_dict, check_inputs=False)
+                latencies.append(time.perf_counter_ns() - inference_start)
+            return latencies
+
+        G_LOGGER.verbose("{:35} | Benchmarking with {:} thread(s)".format(self.name, threads))
+        start = time.perf_counter_ns()
+        if duration is not None:
+            deadline = start + int(duration * 1e9)
+
+        if threads == 1:
+            latencies = run_inferences()
+        else:
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                thread_futures = [executor.submit(run_inferences) for _ in range(threads)]
+                latencies = [latency for future in thread_futures for latency in future.result()]
+        end = time.perf_counter_ns()
+
+        return BenchmarkResult(latencies, end - start, threads=threads, runner_name=self.name)
+
+
     @func.constantmethod
     def get_input_metadata_impl(self):
         """
@@ -28,6 +28,8 @@ class OnnxrtRunner(BaseRunner):
     """
     Runs inference using an ONNX-Runtime inference session.
     """
+    SUPPORTS_CONCURRENT_INFERENCE = True
+
     def __init__(self, sess, name=None):
         """
         Args:
@@ -35,6 +37,7 @@ class OnnxrtRunner(BaseRunner):
                     A callable that can supply an ONNX-Runtime inferences session.
         """
         super().__init__(name=name, prefix="onnxrt-runner")
+        self.resources = {"cpu"}
         self._sess = sess
 
 
@@ -47,14 +50,14 @@ class OnnxrtRunner(BaseRunner):
 
 
     def infer_impl(self, feed_dict):
-        start = time.time()
+        start = time.perf_counter_ns()
         inference_outputs = self.sess.run(None, feed_dict)
-        end = time.time()
+        end = time.perf_counter_ns()
 
         out_dict = OrderedDict()
         for node, out in zip(self.sess.get_outputs(), inference_outputs):
             out_dict[node.name] = out
-        self.inference_time = end - start
+        self.inference_time = (end - start) * 1e-9
         return out_dict
 
 
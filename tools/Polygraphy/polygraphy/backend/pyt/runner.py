@@ -56,14 +56,14 @@ class PytRunner(BaseRunner):
     def infer_impl(self, feed_dict):
         with torch.no_grad():
             inputs = [torch.from_numpy(val.astype(dtype)).cuda() for (val, (dtype, _)) in zip(feed_dict.values(), self.input_metadata.values())]
-            start = time.time()
+            start = time.perf_counter_ns()
             outputs = self.model(*inputs)
-            end = time.time()
+            end = time.perf_counter_ns()
 
         out_dict = OrderedDict()
         for name, output in zip(self.output_names, outputs):
             out_dict[name] = output.cpu().numpy()
-        return out_dict, end - start
+        return out_dict, (end - start) * 1e-9
 
 
     def deactivate_impl(self):
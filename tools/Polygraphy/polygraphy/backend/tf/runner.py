@@ -30,6 +30,8 @@ class TfRunner(BaseRunner):
     """
     Runs inference using a TensorFlow session.
     """
+    SUPPORTS_CONCURRENT_INFERENCE = True
+
     def __init__(self, sess, timeline_dir=None, name=None):
         """
         Args:
@@ -46,6 +48,7 @@ class TfRunner(BaseRunner):
                     A runner count and timestamp will be appended to this prefix.
         """
         super().__init__(name=name, prefix="tf-runner")
+        self.resources = {"gpu"}
 
         self._sess = sess
 
@@ -77,15 +80,15 @@ class TfRunner(BaseRunner):
 
     def infer_impl(self, feed_dict):
         G_LOGGER.extra_verbose("Received feed_dict: {:}".format(feed_dict))
-        start = time.time()
+        start = time.perf_counter_ns()
         inference_outputs = self.sess.run(self.output_names, feed_dict=feed_dict, options=self.run_options,
                                           run_metadata=self.run_metadata)
-        end = time.time()
+        end = time.perf_counter_ns()
 
         out_dict = OrderedDict()
         for name, out in zip(self.output_names, inference_outputs):
             out_dict[name] = out
-        self.inference_time = end - start
+        self.inference_time = (end - start) * 1e-9
 
         if self.timeline_dir is not None:
             from tensorflow.python.client import timeline
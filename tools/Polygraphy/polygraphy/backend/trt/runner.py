@@ -51,6 +51,7 @@ class TrtRunner(BaseRunner):
                     A runner count and timestamp will be appended to this prefix.
         """
         super().__init__(name=name, prefix="trt-runner")
+        self.resources = {"gpu"}
         self._engine_or_context = engine
 
 
@@ -191,7 +192,7 @@ class TrtRunner(BaseRunner):
                 shape = tuple(self.context.get_binding_shape(binding))
                 self.device_buffers[name].resize(shape)
 
-        start = time.time()
+        start = time.perf_counter_ns()
 
         # Use a shallow copy in case we need to replace our allocated buffers with provided DeviceViews.
         dev_bufs = copy.copy(self.device_buffers)
@@ -216,8 +217,8 @@ class TrtRunner(BaseRunner):
 
         self.stream.synchronize()
 
-        end = time.time()
-        self.inference_time = end - start
+        end = time.perf_counter_ns()
+        self.inference_time = (end - start) * 1e-9
 
         return self.host_output_buffers
 
@@ -334,7 +334,7 @@ class TrtLegacyRunner(BaseRunner):
 
 
     def infer_impl(self, feed_dict):
-        start = time.time()
+        start = time.perf_counter_ns()
         [self.input_buffers[name].device.copy_from(buffer, self.stream) for name, buffer in feed_dict.items()]
         # We will not run with smaller batch sizes than whatever the builder chose.
         bindings = [buf.device.ptr for buf in self.input_buffers.values()] + [buf.device.ptr for buf in self.output_buffers.values()]
@@ -347,10 +347,10 @@ class TrtLegacyRunner(BaseRunner):
             out.host = out.device.copy_to(out.host, self.stream)
 
         self.stream.synchronize()
-        end = time.time()
+        end = time.perf_counter_ns()
 
         out_dict = OrderedDict()
         for (name, out) in self.output_buffers.items():
             out_dict[name] = out.host
-        self.inference_time = end - start
+        self.inference_time = (end - start) * 1e-9
         return out_dict
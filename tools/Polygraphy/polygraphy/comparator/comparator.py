@@ -15,7 +15,12 @@
 #
 import contextlib
 import copy
+import functools
+import inspect
 import queue
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from multiprocessing import Process, Queue
 
 from polygraphy import mod, util
@@ -23,13 +28,25 @@ from polygraphy.common import TensorMetadata
 from polygraphy.comparator import util as comp_util
 from polygraphy.comparator.compare import CompareFunc
 from polygraphy.comparator.data_loader import DataLoader, DataLoaderCache
-from polygraphy.comparator.struct import (AccuracyResult, IterationResult,
-                                          RunResults)
+from polygraphy.comparator.struct import (AccuracyResult, BenchmarkResults,
+                                          IterationResult, RunResults)
 from polygraphy.logger import G_LOGGER, LogMode
 
 np = mod.lazy_import("numpy")
 
 
+def log_accuracy_summary(accuracy_result, runner_pair, num_iters, num_comparisons):
+    passed, _, total = accuracy_result.stats(runner_pair)
+    pass_rate = accuracy_result.percentage(runner_pair) * 100.0
+    if num_iters > 1 or num_comparisons > 1:
+        msg = "Accuracy Summary | {:} vs. {:} | Passed: {:}/{:} iterations | Pass Rate: {:}%".format(
+                runner_pair[0], runner_pair[1], passed, total, pass_rate)
+        if passed == total:
+            G_LOGGER.finish(msg)
+        else:
+            G_LOGGER.error(msg)
+
+
 @mod.export()
 class Comparator(object):
     """
@@ -38,9 +55,9 @@ class Comparator(object):
     @staticmethod
     def run(runners, data_loader=None, warm_up=None,
             use_subprocess=None, subprocess_timeout=None,
-            subprocess_polling_interval=None, save_inputs_path=None):
+            subprocess_polling_interval=None, save_inputs_path=None, input_memory_limit_mb=None, concurrent=None):
         """
-        Runs the supplied runners sequentially.
+        Runs the supplied runners sequentially, or concurrently if requested.
 
         Args:
             runners (List[BaseRunner]):
@@ -64,6 +81,10 @@ class Comparator(object):
             use_subprocess (bool):
                     Whether each runner should be run in a subprocess. This allows each runner to have exclusive
                     access to the GPU. When using a subprocess, runners and loaders will never be modified.
+                    Large outputs are sent back from each subprocess through files in a temporary directory,
+                    and are memory-mapped rather than loaded into memory. They are mapped copy-on-write, so they are writable,
+                    unless they are large enough to be swapped to the disk (see ``POLYGRAPHY_ARRAY_SWAP_THRESHOLD_MB``),
+                    in which case they are read-only, like other swapped arrays.
             subprocess_timeout (int):
                     The timeout before a subprocess is killed automatically. This is useful for handling processes
                     that never terminate. A value of None disables the timeout. Defaults to None.
@@ -75,6 +96,18 @@ class Comparator(object):
             save_inputs_path (str):
                     [EXPERIMENTAL] Path at which to save inputs used during inference. This will include all inputs generated by
                     the provided data_loader, and will be saved as a JSON List[Dict[str, numpy.ndarray]].
+            input_memory_limit_mb (float):
+                    The maximum amount of input data, in MiB, to keep in memory while running the runners.
+                    Iterations beyond the limit are spilled to a temporary directory on the disk and memory-mapped when used.
+                    When using subprocesses, all the input data is stored on the disk, and each subprocess
+                    loads it from there, rather than receiving it through a queue.
+                    Defaults to None, which keeps all the input data in memory.
+            concurrent (bool):
+                    Whether to run runners concurrently, in threads, or in subprocesses if ``use_subprocess`` is enabled.
+                    Runners are only run concurrently if they do not share any resources (see ``BaseRunner.resources``),
+                    and all runners use the same inputs, so the results are the same as when running them sequentially.
+                    When not using subprocesses, messages logged by each runner are also emitted in the same order.
+                    Defaults to False.
 
         Returns:
             RunResults:
@@ -84,11 +117,17 @@ class Comparator(object):
         warm_up = util.default(warm_up, 0)
         data_loader = util.default(data_loader, DataLoader())
         use_subprocess = util.default(use_subprocess, False)
+        concurrent = util.default(concurrent, False)
         subprocess_polling_interval = util.default(subprocess_polling_interval, 30)
-        loader_cache = DataLoaderCache(data_loader, save_inputs_path=save_inputs_path)
 
+        # Subprocesses share the on-disk store of the cache, and use it to send back their outputs,
+        # so it must be owned by this process. It is removed when this function returns.
+        store_dir = tempfile.TemporaryDirectory(prefix="polygraphy_inputs_") if use_subprocess else None
+        loader_cache = DataLoaderCache(data_loader, save_inputs_path=save_inputs_path, memory_limit_mb=input_memory_limit_mb,
+                                       store_dir=store_dir.name if store_dir is not None else None)
 
-        def execute_runner(runner, loader_cache):
+
+        def execute_runner(runner, loader_cache, on_inputs_ready):
             with runner as active_runner:
                 input_metadata = active_runner.get_input_metadata()
                 G_LOGGER.info("{:35}\n---- Model Input(s) ----\n{:}".format(active_runner.name, input_metadata),
@@ -97,6 +136,7 @@ class Comparator(object):
                 # DataLoaderCache will ensure that the feed_dict does not contain any extra entries
                 # based on the provided input_metadata.
                 loader_cache.set_input_metadata(input_metadata)
+                on_inputs_ready(loader_cache)
 
                 if warm_up:
                     G_LOGGER.start("{:35} | Running {:} warm-up run(s)".format(active_runner.name, warm_up))
@@ -137,60 +177,143 @@ class Comparator(object):
                 return iteration_results
 
 
-        # Wraps execute_runner to use a queue.
-        def execute_runner_with_queue(runner_queue, runner, loader_cache):
+        # Wraps execute_runner to use a queue. The updated loader_cache is sent back as soon as it has been populated,
+        # so that other runners can start using it, followed by the iteration results.
+        # Outputs are written to the store directory so that only their paths are sent over the queue.
+        def execute_runner_with_queue(runner_queue, runner, loader_cache, store_dir):
+            sent_loader_cache = []
+
+            def send_loader_cache(loader_cache):
+                util.try_send_on_queue(runner_queue, loader_cache)
+                sent_loader_cache.append(True)
+
             iteration_results = None
             try:
-                iteration_results = execute_runner(runner, loader_cache)
+                iteration_results = comp_util.export_iteration_results(execute_runner(runner, loader_cache, send_loader_cache), store_dir)
             except:
                 # Cannot necessarily send the exception back over the queue.
                 G_LOGGER.backrace()
+            if not sent_loader_cache:
+                send_loader_cache(loader_cache)
             util.try_send_on_queue(runner_queue, iteration_results)
-            # After finishing, send the updated loader_cache back.
-            util.try_send_on_queue(runner_queue, loader_cache)
 
 
-        # Do all inferences in one loop, then comparisons at a later stage.
-        # We run each runner in a separate process so that we can provide exclusive GPU access for each runner.
-        run_results = RunResults()
+        # Runs a single runner, in a subprocess if requested, and returns its iteration results.
+        # on_inputs_ready is called with the updated loader_cache as soon as it has been populated.
+        def run_runner(runner, loader_cache, on_inputs_ready):
+            G_LOGGER.start("{:35} | Activating and starting inference".format(runner.name))
+            if not use_subprocess:
+                return execute_runner(runner, loader_cache, on_inputs_ready)
 
-        if not runners:
-            G_LOGGER.warning("No runners were provided to Comparator.run(). Inference will not be run, and run results will be empty.")
+            runner_queue = Queue()
+            process = Process(target=execute_runner_with_queue, args=(runner_queue, runner, loader_cache, store_dir.name))
+            process.start()
 
-        for runner in runners:
-            G_LOGGER.start("{:35} | Activating and starting inference".format(runner.name))
-            if use_subprocess:
-                runner_queue = Queue()
-                process = Process(target=execute_runner_with_queue, args=(runner_queue, runner, loader_cache))
-                process.start()
-
-                # If a subprocess hangs in a certain way, then process.join could block forever. Hence,
-                # we need to keep polling the process to make sure it really is alive.
-                iteration_results = None
-                while process.is_alive() and iteration_results is None:
+            # If a subprocess hangs in a certain way, then process.join could block forever. Hence,
+            # we need to keep polling the process to make sure it really is alive.
+            # Messages may still be on the queue after the process exits.
+            received = []
+            try:
+                while len(received) < 2 and (process.is_alive() or not runner_queue.empty()):
                     try:
-                        iteration_results = util.try_receive_on_queue(runner_queue, timeout=subprocess_polling_interval / 2)
-                        # Receive updated loader cache, or fall back if it could not be sent.
-                        loader_cache = util.try_receive_on_queue(runner_queue, timeout=subprocess_polling_interval / 2)
+                        received.append(util.receive_on_queue(runner_queue, timeout=subprocess_polling_interval / 2))
                     except queue.Empty:
                         G_LOGGER.extra_verbose("Polled subprocess - still running")
+                        continue
 
-                try:
-                    assert iteration_results is not None
-                    run_results.append((runner.name, iteration_results))
-                    process.join(subprocess_timeout)
-                except:
+                    if len(received) == 1:
+                        if received[0] is None:
+                            G_LOGGER.critical("Could not send data loader cache to runner subprocess. Please try disabling subprocesses "
+                                              "by removing the --use-subprocess flag, or setting use_subprocess=False in Comparator.run()")
+                        on_inputs_ready(received[0])
+
+                if len(received) < 2 or received[1] is None:
                     G_LOGGER.critical("{:35} | Terminated prematurely. Check the exception logged above. "
                                       "If there is no exception logged above, make sure not to use the --use-subprocess "
                                       "flag or set use_subprocess=False in Comparator.run().".format(runner.name))
+                process.join(subprocess_timeout)
+            finally:
+                process.terminate()
+
+            return comp_util.import_iteration_results(received[1])
+
+
+        # Runs runners concurrently in threads. Each runner starts once all the runners before it that share any of its resources
+        # have finished, and once the first runner has populated the loader_cache, so that all runners use the same inputs
+        # as they would when run sequentially. Outputs from subprocesses cannot be captured, so logging is only deterministic without them.
+        def execute_concurrently(runners, loader_cache, capture_logs):
+            def conflicts(runner0, runner1):
+                if runner0.resources is None or runner1.resources is None:
+                    return True
+                return bool(set(runner0.resources) & set(runner1.resources))
+
+            inputs_ready = threading.Event()
+            aborted = threading.Event()
+
+            def set_loader_cache(new_loader_cache):
+                nonlocal loader_cache
+                loader_cache = new_loader_cache
+                inputs_ready.set()
+
+            # Returns None if the runner was skipped because another runner failed.
+            def run_after(index, runner, dependencies):
+                try:
+                    for dependency in dependencies:
+                        # Waits for the dependency without raising its exception.
+                        dependency.exception()
+                    if index > 0:
+                        inputs_ready.wait()
+                    if aborted.is_set():
+                        return None
+                    # In-process runners each need their own input metadata.
+                    runner_loader_cache = loader_cache.share() if not use_subprocess else loader_cache
+                    return run_runner(runner, runner_loader_cache, set_loader_cache if index == 0 else lambda _: None)
+                except:
+                    aborted.set()
+                    raise
                 finally:
-                    process.terminate()
+                    if index == 0:
+                        inputs_ready.set()
 
-                if loader_cache is None:
-                    G_LOGGER.critical("Could not send data loader cache to runner subprocess. Please try disabling subprocesses "
-                                      "by removing the --use-subprocess flag, or setting use_subprocess=False in Comparator.run()")
+            if capture_logs:
+                submit, result = comp_util.submit_with_logs, comp_util.result_with_logs
             else:
-                run_results.append((runner.name, execute_runner(runner, loader_cache)))
+                submit, result = lambda executor, func, *args: executor.submit(func, *args), lambda future: future.result()
+
+            run_results = RunResults()
+            with ThreadPoolExecutor(max_workers=max(len(runners), 1)) as executor:
+                runner_futures = []
+                for index, runner in enumerate(runners):
+                    dependencies = [future for other, future in zip(runners, runner_futures) if conflicts(runner, other)]
+                    runner_futures.append(submit(executor, run_after, index, runner, dependencies))
+
+                try:
+                    for runner, future in zip(runners, runner_futures):
+                        iteration_results = result(future)
+                        # A runner can only be skipped if a later runner failed, in which case that runner's error is raised.
+                        if iteration_results is not None:
+                            run_results.append((runner.name, iteration_results))
+                finally:
+                    aborted.set()
+            return run_results
+
+
+        # Do all inferences in one loop, then comparisons at a later stage.
+        # We run each runner in a separate process so that we can provide exclusive GPU access for each runner.
+        run_results = RunResults()
+
+        if not runners:
+            G_LOGGER.warning("No runners were provided to Comparator.run(). Inference will not be run, and run results will be empty.")
+
+        if not concurrent:
+            def update_loader_cache(new_loader_cache):
+                nonlocal loader_cache
+                loader_cache = new_loader_cache
+
+            for runner in runners:
+                run_results.append((runner.name, run_runner(runner, loader_cache, update_loader_cache)))
+        else:
+            run_results = execute_concurrently(runners, loader_cache, capture_logs=not use_subprocess)
 
         G_LOGGER.verbose("Successfully ran: {:}".format([r.name for r in runners]))
         return run_results
@@ -223,7 +346,7 @@ class Comparator(object):
 
 
     @staticmethod
-    def compare_accuracy(run_results, fail_fast=False, comparisons=None, compare_func=None):
+    def compare_accuracy(run_results, fail_fast=False, comparisons=None, compare_func=None, workers=None):
         """
         Args:
             run_results (RunResults): The result of Comparator.run()
@@ -239,6 +362,17 @@ class Comparator(object):
                     names to a boolean (or anything convertible to a boolean) indicating whether outputs matched.
                     The order of arguments to this function is guaranteed to be the same as the ordering of the
                     tuples contained in `comparisons`.
+            workers (int):
+                    The number of threads to use for comparisons. When this is greater than 1, the comparisons for
+                    all iterations are dispatched to a thread pool, and, if `compare_func` accepts an `executor`
+                    keyword argument, like the function returned by ``CompareFunc.basic_compare_func()``, so are
+                    the comparisons for each output. `compare_func` must be thread-safe in that case.
+                    Results and log messages are still processed in order, so the AccuracyResult and logging output
+                    are the same as with a single thread.
+                    NumPy releases the GIL for most of the work of comparing outputs, so comparisons can speed up
+                    by up to the number of workers, but no more than the number of available CPU cores.
+                    There is no benefit on a single core.
+                    Defaults to 1.
 
         Returns:
             AccuracyResult:
@@ -249,46 +383,255 @@ class Comparator(object):
         def find_mismatched(match_dict):
             return [name for name, matched in match_dict.items() if not bool(matched)]
 
+
+        def accepts_executor(func):
+            try:
+                return "executor" in inspect.signature(func).parameters
+            except (TypeError, ValueError):
+                return False
+
+
         compare_func = util.default(compare_func, CompareFunc.basic_compare_func())
         comparisons = util.default(comparisons, Comparator.default_comparisons(run_results))
+        workers = util.default(workers, 1)
 
         accuracy_result = AccuracyResult()
-        for runner0_index, runner1_index in comparisons:
-            (runner0_name, results0), (runner1_name, results1) = run_results[runner0_index], run_results[runner1_index]
-
-            G_LOGGER.start("Accuracy Comparison | {:} vs. {:}".format(runner0_name, runner1_name))
-            with G_LOGGER.indent():
-                runner_pair = (runner0_name, runner1_name)
-                accuracy_result[runner_pair] = []
-
-                num_iters = min(len(results0), len(results1))
-                for iteration, (result0, result1) in enumerate(zip(results0, results1)):
-                    if num_iters > 1:
-                        G_LOGGER.info("Iteration: {:}".format(iteration))
-                    with contextlib.ExitStack() as stack:
+        with contextlib.ExitStack() as stack:
+            # Futures for each iteration of each comparison, if comparing concurrently.
+            futures = None
+            if workers > 1:
+                # Outputs are compared in a separate pool so that iteration comparisons, which wait
+                # for their outputs, never wait for work queued behind them in their own pool.
+                output_executor = stack.enter_context(ThreadPoolExecutor(max_workers=workers))
+                executor = stack.enter_context(ThreadPoolExecutor(max_workers=workers))
+
+                iteration_compare_func = compare_func
+                if accepts_executor(compare_func):
+                    iteration_compare_func = functools.partial(compare_func, executor=output_executor)
+
+                futures = [[comp_util.submit_with_logs(executor, iteration_compare_func, result0, result1)
+                            for result0, result1 in zip(run_results[runner0_index][1], run_results[runner1_index][1])]
+                           for runner0_index, runner1_index in comparisons]
+
+                # Comparisons that have not started yet are not needed if we return early.
+                def cancel_pending():
+                    for comparison_futures in futures:
+                        for future in comparison_futures:
+                            future.cancel()
+
+                stack.callback(cancel_pending)
+
+
+            for comparison_index, (runner0_index, runner1_index) in enumerate(comparisons):
+                (runner0_name, results0), (runner1_name, results1) = run_results[runner0_index], run_results[runner1_index]
+
+                G_LOGGER.start("Accuracy Comparison | {:} vs. {:}".format(runner0_name, runner1_name))
+                with G_LOGGER.indent():
+                    runner_pair = (runner0_name, runner1_name)
+                    accuracy_result[runner_pair] = []
+
+                    num_iters = min(len(results0), len(results1))
+                    for iteration, (result0, result1) in enumerate(zip(results0, results1)):
                         if num_iters > 1:
-                            stack.enter_context(G_LOGGER.indent())
-                        iteration_match_dict = compare_func(result0, result1)
-                        accuracy_result[runner_pair].append(iteration_match_dict)
+                            G_LOGGER.info("Iteration: {:}".format(iteration))
+                        with contextlib.ExitStack() as iter_stack:
+                            if num_iters > 1:
+                                iter_stack.enter_context(G_LOGGER.indent())
+                            if futures is None:
+                                iteration_match_dict = compare_func(result0, result1)
+                            else:
+                                iteration_match_dict = comp_util.result_with_logs(futures[comparison_index][iteration])
+                            accuracy_result[runner_pair].append(iteration_match_dict)
+
+                            mismatched_outputs = find_mismatched(iteration_match_dict)
+                            if fail_fast and mismatched_outputs:
+                                return accuracy_result
+
+                    G_LOGGER.extra_verbose("Finished comparing {:} with {:}".format(runner0_name, runner1_name,))
+                    log_accuracy_summary(accuracy_result, runner_pair, num_iters, len(comparisons))
+        return accuracy_result
+
+
+    @staticmethod
+    def run_and_compare(runners, data_loader=None, warm_up=None, comparisons=None,
+                        compare_func=None, postprocess_func=None, fail_fast=None, keep_match_dicts=None):
+        """
+        Runs the supplied runners in lockstep and compares the outputs of each iteration as soon
+        as all the runners have produced them.
+
+        Unlike ``run()`` followed by ``compare_accuracy()``, this does not retain the inputs or outputs
+        of previous iterations, and by default only counts the iterations that matched, so memory usage
+        does not grow with the number of iterations.
+        However, all the runners are active at the same time, and, unlike with ``run()``, runners cannot
+        be run in subprocesses.
 
-                        mismatched_outputs = find_mismatched(iteration_match_dict)
-                        if fail_fast and mismatched_outputs:
+        Args:
+            runners (List[BaseRunner]):
+                    A list of runners to run.
+            data_loader (Generator -> OrderedDict[str, numpy.ndarray]):
+                    A generator or iterable that yields a dictionary that maps input names to input numpy buffers.
+                    See ``run()`` for details.
+                    Defaults to an instance of `DataLoader`.
+            warm_up (int):
+                    The number of warm up runs to perform for each runner before timing.
+                    Defaults to 0.
+            comparisons (List[Tuple[int, int]]):
+                    Comparisons to perform, specified by runner indexes.
+                    By default, this compares each runner to the subsequent one.
+                    See ``compare_accuracy()`` for details.
+            compare_func (Callable(IterationResult, IterationResult) -> OrderedDict[str, bool]):
+                    The function to use to compare outputs. See ``compare_accuracy()`` for details.
+                    Defaults to ``CompareFunc.basic_compare_func()``.
+            postprocess_func (Callable(IterationResult) -> IterationResult):
+                    A function to apply to the outputs of each runner before comparing them.
+                    See ``postprocess()`` for details. Defaults to None.
+            fail_fast (bool):
+                    Whether to exit after the first failure. Defaults to False.
+            keep_match_dicts (bool):
+                    Whether to keep the dictionary returned by ``compare_func`` for each iteration in the accuracy result,
+                    like ``compare_accuracy()`` does. Defaults to False, in which case the accuracy result only counts
+                    the iterations that matched. See ``AccuracyResult.add_counts()`` for details.
+
+        Returns:
+            AccuracyResult:
+                    A summary of the results of the comparisons.
+                    See ``compare_accuracy()`` for details.
+        """
+        warm_up = util.default(warm_up, 0)
+        data_loader = util.default(data_loader, DataLoader())
+        comparisons = util.default(comparisons, Comparator.default_comparisons(runners))
+        compare_func = util.default(compare_func, CompareFunc.basic_compare_func())
+        fail_fast = util.default(fail_fast, False)
+        keep_match_dicts = util.default(keep_match_dicts, False)
+
+        def find_mismatched(match_dict):
+            return [name for name, matched in match_dict.items() if not bool(matched)]
+
+        accuracy_result = AccuracyResult()
+        runner_pairs = [(runners[runner0_index].name, runners[runner1_index].name) for runner0_index, runner1_index in comparisons]
+        for runner_pair in runner_pairs:
+            accuracy_result[runner_pair] = []
+
+        if not runners:
+            G_LOGGER.warning("No runners were provided to Comparator.run_and_compare(). Inference will not be run, "
+                             "and the accuracy result will be empty.")
+            return accuracy_result
+
+        with contextlib.ExitStack() as stack:
+            active_runners = []
+            for runner in runners:
+                G_LOGGER.start("{:35} | Activating and starting inference".format(runner.name))
+                active_runners.append(stack.enter_context(runner))
+
+            input_metadatas = []
+            for active_runner in active_runners:
+                input_metadata = active_runner.get_input_metadata()
+                G_LOGGER.info("{:35}\n---- Model Input(s) ----\n{:}".format(active_runner.name, input_metadata),
+                              mode=LogMode.ONCE)
+                input_metadatas.append(input_metadata)
+
+            # Like in run(), the data loader generates inputs for the first runner, and the inputs
+            # are then adjusted for the other runners if needed.
+            with contextlib.suppress(AttributeError):
+                data_loader.input_metadata = input_metadatas[0]
+
+            num_iters = 0
+            total_runtimes = [0] * len(active_runners)
+            for iteration, feed_dict in enumerate(data_loader):
+                num_iters += 1
+                G_LOGGER.info("Iteration: {:}".format(iteration))
+                with G_LOGGER.indent():
+                    loader_cache = DataLoaderCache([feed_dict])
+                    iteration_results = []
+                    for index, (active_runner, input_metadata) in enumerate(zip(active_runners, input_metadatas)):
+                        loader_cache.set_input_metadata(input_metadata)
+                        runner_feed_dict = loader_cache[0]
+
+                        if iteration == 0 and warm_up:
+                            G_LOGGER.verbose("{:35} | Running {:} warm-up run(s)".format(active_runner.name, warm_up))
+                            for _ in range(warm_up):
+                                active_runner.infer(feed_dict=runner_feed_dict)
+
+                        outputs = active_runner.infer(feed_dict=runner_feed_dict)
+                        runtime = active_runner.last_inference_time()
+                        total_runtimes[index] += runtime
+                        # Without a deep copy here, outputs may be overwritten by the next inference.
+                        iteration_result = IterationResult(outputs=copy.deepcopy(outputs), runtime=runtime, runner_name=active_runner.name)
+                        if postprocess_func is not None:
+                            iteration_result = postprocess_func(iteration_result)
+                        iteration_results.append(iteration_result)
+
+                    for runner_pair, (runner0_index, runner1_index) in zip(runner_pairs, comparisons):
+                        G_LOGGER.start("Accuracy Comparison | {:} vs. {:}".format(*runner_pair))
+                        with G_LOGGER.indent():
+                            iteration_match_dict = compare_func(iteration_results[runner0_index], iteration_results[runner1_index])
+                        mismatched = find_mismatched(iteration_match_dict)
+                        if keep_match_dicts:
+                            accuracy_result[runner_pair].append(iteration_match_dict)
+                        else:
+                            accuracy_result.add_counts(runner_pair, matched=int(not mismatched), total=1)
+
+                        if fail_fast and mismatched:
                             return accuracy_result
 
-                G_LOGGER.extra_verbose("Finished comparing {:} with {:}".format(runner0_name, runner1_name,))
+            for active_runner, total_runtime in zip(active_runners, total_runtimes):
+                total_runtime_ms = total_runtime * 1000.0
+                G_LOGGER.finish("{:35} | Completed {:} iteration(s) in {:.4g} ms | Average inference time: {:.4g} ms.".format(
+                                    active_runner.name, num_iters, total_runtime_ms, total_runtime_ms / float(max(num_iters, 1))))
 
-                passed, _, total = accuracy_result.stats(runner_pair)
-                pass_rate = accuracy_result.percentage(runner_pair) * 100.0
-                if num_iters > 1 or len(comparisons) > 1:
-                    msg = "Accuracy Summary | {:} vs. {:} | Passed: {:}/{:} iterations | Pass Rate: {:}%".format(
-                            runner0_name, runner1_name, passed, total, pass_rate)
-                    if passed == total:
-                        G_LOGGER.finish(msg)
-                    else:
-                        G_LOGGER.error(msg)
+        for runner_pair in runner_pairs:
+            log_accuracy_summary(accuracy_result, runner_pair, num_iters, len(comparisons))
         return accuracy_result
 
 
+    @staticmethod
+    def benchmark(runners, data_loader=None, warm_up=None, iterations=None, duration=None, threads=None):
+        """
+        Benchmarks the supplied runners sequentially, using the first input supplied by the data loader.
+        See ``BaseRunner.benchmark()`` for details.
+
+        Args:
+            runners (List[BaseRunner]):
+                    A list of runners to benchmark.
+            data_loader (Generator -> OrderedDict[str, numpy.ndarray]):
+                    A generator or iterable that yields a dictionary that maps input names to input numpy buffers.
+                    See ``run()`` for details.
+                    Defaults to an instance of `DataLoader`.
+            warm_up (int):
+                    The number of untimed inferences to run for each runner before benchmarking. Defaults to 1.
+            iterations (int):
+                    The number of inferences to time for each runner. Defaults to 100.
+            duration (float):
+                    The minimum amount of time, in seconds, for which to run inference with each runner,
+                    instead of running a fixed number of iterations.
+            threads (int):
+                    The number of threads from which to run inference concurrently with each runner.
+                    Defaults to 1, which runs inferences back-to-back.
+
+        Returns:
+            BenchmarkResults:
+                    A mapping of runner names to the results of their benchmarks.
+                    The ordering of `runners` is preserved in this mapping.
+        """
+        data_loader = util.default(data_loader, DataLoader())
+        loader_cache = DataLoaderCache(data_loader)
+
+        benchmark_results = BenchmarkResults()
+        for runner in runners:
+            G_LOGGER.start("{:35} | Activating and starting benchmark".format(runner.name))
+            with runner as active_runner:
+                loader_cache.set_input_metadata(active_runner.get_input_metadata())
+                try:
+                    feed_dict = loader_cache[0]
+                except IndexError:
+                    G_LOGGER.critical("Data loader did not supply any data. Cannot benchmark without inputs.")
+
+                result = active_runner.benchmark(feed_dict, warm_up=warm_up, iterations=iterations, duration=duration, threads=threads)
+                benchmark_results[runner.name] = result
+                G_LOGGER.finish("{:35} | Benchmark: {:}".format(active_runner.name, result))
+        return benchmark_results
+
+
     @staticmethod
     def validate(run_results, check_inf=None, check_nan=None, fail_fast=None):
         """
@@ -84,7 +84,7 @@ class CompareFunc(object):
 
     @staticmethod
     def basic_compare_func(check_shapes=None, rtol=None, atol=None, fail_fast=None,
-                           find_output_func=None, check_error_stat=None):
+                           find_output_func=None, check_error_stat=None, fused_stats=None):
         """
         Creates a function that compares two IterationResults, and can be used as the `compare_func` argument
         in ``Comparator.compare_accuracy``.
@@ -124,12 +124,20 @@ class CompareFunc(object):
                     This can be provided on a per-output basis using a dictionary. In that case,
                     use an empty string ("") as the key to specify default error stat for outputs not explicitly listed.
                     Defaults to "elemwise".
+            fused_stats (bool):
+                    Whether to compute error statistics with ``comparator.util.compute_error_stats()``, which processes
+                    the outputs in chunks, in a few passes, instead of materializing the absolute and relative differences
+                    and computing each statistic separately. This bounds the memory usage and is considerably faster for
+                    large outputs. Statistics are computed in 64-bit floating point, so the results may differ slightly
+                    from the default implementation, which uses the dtype of the outputs.
+                    Defaults to False.
 
 
         Returns:
             Callable(IterationResult, IterationResult) -> OrderedDict[str, OutputCompareResult]:
                 A callable that returns a mapping of output names to `OutputCompareResult` s, indicating
-                whether the corresponding output matched.
+                whether the corresponding output matched. The callable also accepts an optional `executor` keyword argument,
+                a ``concurrent.futures.Executor`` with which to compare the outputs concurrently.
         """
         check_shapes = util.default(check_shapes, True)
         default_rtol = 1e-5
@@ -139,9 +147,10 @@ class CompareFunc(object):
         fail_fast = util.default(fail_fast, False)
         default_error_stat = "elemwise"
         check_error_stat = util.default(check_error_stat, default_error_stat)
+        fused_stats = util.default(fused_stats, False)
 
 
-        def compare_output(iter_result0, iter_result1):
+        def compare_output(iter_result0, iter_result1, executor=None):
             """
             Compare the outputs of two runners from a single iteration.
 
@@ -153,6 +162,10 @@ class CompareFunc(object):
             Args:
                 iter_result0 (IterationResult): The result of the first runner.
                 iter_result1 (IterationResult): The result of the second runner.
+                executor (concurrent.futures.Executor):
+                        An executor with which to compare outputs concurrently.
+                        The results and log messages are the same as when outputs are compared sequentially.
+                        Defaults to None, which compares outputs sequentially in the calling thread.
 
             Returns:
                 OrderedDict[str, OutputCompareResult]:
@@ -186,22 +199,32 @@ class CompareFunc(object):
                                             iter_result1.runner_name, out1_name, out1.dtype, out1.shape, util.indent_block(out1)))
 
                 # Check difference vs. tolerances
-                if np.issubdtype(out0.dtype, np.bool_) and np.issubdtype(out1.dtype, np.bool_):
-                    absdiff = np.logical_xor(out0, out1)
+                def compute_diffs(out0, out1):
+                    if np.issubdtype(out0.dtype, np.bool_) and np.issubdtype(out1.dtype, np.bool_):
+                        absdiff = np.logical_xor(out0, out1)
+                    else:
+                        absdiff = np.abs(out0 - out1)
+
+                    absout1 = np.abs(out1)
+                    with np.testing.suppress_warnings() as sup:
+                        sup.filter(RuntimeWarning)
+                        reldiff = absdiff / absout1
+                    return absdiff, reldiff
+
+
+                if fused_stats:
+                    error_stats = comp_util.compute_error_stats(out0, out1, atol=per_out_atol, rtol=per_out_rtol)
+                    G_LOGGER.extra_verbose("Computed error statistics in {:} pass(es)".format(error_stats.num_passes))
+                    max_absdiff, mean_absdiff, median_absdiff = error_stats.absdiff.max, error_stats.absdiff.mean, error_stats.absdiff.median
+                    max_reldiff, mean_reldiff, median_reldiff = error_stats.reldiff.max, error_stats.reldiff.mean, error_stats.reldiff.median
                 else:
-                    absdiff = np.abs(out0 - out1)
-
-                absout1 = np.abs(out1)
-                with np.testing.suppress_warnings() as sup:
-                    sup.filter(RuntimeWarning)
-                    reldiff = absdiff / absout1
-
-                max_absdiff = comp_util.compute_max(absdiff)
-                mean_absdiff = comp_util.compute_mean(absdiff)
-                median_absdiff = comp_util.compute_median(absdiff)
-                max_reldiff = comp_util.compute_max(reldiff)
-                mean_reldiff = comp_util.compute_mean(reldiff)
-                median_reldiff = comp_util.compute_median(reldiff)
+                    absdiff, reldiff = compute_diffs(out0, out1)
+                    max_absdiff = comp_util.compute_max(absdiff)
+                    mean_absdiff = comp_util.compute_mean(absdiff)
+                    median_absdiff = comp_util.compute_median(absdiff)
+                    max_reldiff = comp_util.compute_max(reldiff)
+                    mean_reldiff = comp_util.compute_mean(reldiff)
+                    median_reldiff = comp_util.compute_median(reldiff)
 
                 max_elemwiseabs = "Unknown"
                 max_elemwiserel = "Unknown"
@@ -212,6 +235,21 @@ class CompareFunc(object):
                     failed = median_absdiff > per_out_atol and (np.isnan(median_reldiff) or median_reldiff > per_out_rtol)
                 elif per_out_err_stat == "max":
                     failed = max_absdiff > per_out_atol and (np.isnan(max_reldiff) or max_reldiff > per_out_rtol)
+                elif fused_stats:
+                    assert per_out_err_stat == "elemwise", "This branch should be unreachable unless per_out_err_stat is 'elemwise'"
+                    failed = error_stats.num_mismatches > 0
+                    max_elemwiseabs = error_stats.max_elemwiseabs
+                    max_elemwiserel = error_stats.max_elemwiserel
+
+                    # The differences are only materialized if the mismatches will actually be logged.
+                    def get_mismatches():
+                        absdiff, reldiff = compute_diffs(out0, out1)
+                        return (absdiff > per_out_atol) & (reldiff > per_out_rtol)
+
+                    with G_LOGGER.indent():
+                        G_LOGGER.super_verbose(lambda: "Mismatched indices:\n{:}".format(np.argwhere(get_mismatches())))
+                        G_LOGGER.extra_verbose(lambda: "{:35} | Mismatched values:\n{:}".format(iter_result0.runner_name, out0[get_mismatches()]))
+                        G_LOGGER.extra_verbose(lambda: "{:35} | Mismatched values:\n{:}".format(iter_result1.runner_name, out1[get_mismatches()]))
                 else:
                     assert per_out_err_stat == "elemwise", "This branch should be unreachable unless per_out_err_stat is 'elemwise'"
                     mismatches = (absdiff > per_out_atol) & (reldiff > per_out_rtol)
@@ -230,10 +268,14 @@ class CompareFunc(object):
                         G_LOGGER.warning("Failing to log mismatches.\nNote: Error was: {:}".format(err))
 
                 # Log information about the outputs
-                hist_bin_range = (min(comp_util.compute_min(out0), comp_util.compute_min(out1)),
-                                  max(comp_util.compute_max(out0), comp_util.compute_max(out1)))
-                comp_util.log_output_stats(out0, failed, iter_result0.runner_name + ": " + out0_name, hist_range=hist_bin_range)
-                comp_util.log_output_stats(out1, failed, iter_result1.runner_name + ": " + out1_name, hist_range=hist_bin_range)
+                if fused_stats:
+                    comp_util.log_array_stats(error_stats.out0, failed, iter_result0.runner_name + ": " + out0_name)
+                    comp_util.log_array_stats(error_stats.out1, failed, iter_result1.runner_name + ": " + out1_name)
+                else:
+                    hist_bin_range = (min(comp_util.compute_min(out0), comp_util.compute_min(out1)),
+                                      max(comp_util.compute_max(out0), comp_util.compute_max(out1)))
+                    comp_util.log_output_stats(out0, failed, iter_result0.runner_name + ": " + out0_name, hist_range=hist_bin_range)
+                    comp_util.log_output_stats(out1, failed, iter_result1.runner_name + ": " + out1_name, hist_range=hist_bin_range)
 
                 G_LOGGER.info("Error Metrics: {:}".format(out0_name))
                 with G_LOGGER.indent():
@@ -249,8 +291,12 @@ class CompareFunc(object):
                                     per_out_err_stat,
                                     req_tol(mean_absdiff, median_absdiff, max_absdiff, max_elemwiseabs),
                                     req_tol(mean_reldiff, median_reldiff, max_reldiff, max_elemwiserel)))
-                    comp_util.log_output_stats(absdiff, failed, "Absolute Difference")
-                    comp_util.log_output_stats(reldiff, failed, "Relative Difference")
+                    if fused_stats:
+                        comp_util.log_array_stats(error_stats.absdiff, failed, "Absolute Difference")
+                        comp_util.log_array_stats(error_stats.reldiff, failed, "Relative Difference")
+                    else:
+                        comp_util.log_output_stats(absdiff, failed, "Absolute Difference")
+                        comp_util.log_output_stats(reldiff, failed, "Relative Difference")
 
                 # Finally show summary.
                 if failed:
@@ -287,11 +333,13 @@ class CompareFunc(object):
                 return [found_name]
 
 
-            nonlocal find_output_func
-            find_output_func = util.default(find_output_func, default_find_output_func)
+            # The default function refers to the current iteration's results, so it must not be stored for later calls.
+            find_output = util.default(find_output_func, default_find_output_func)
 
-            for index, (out0_name, output0) in enumerate(iter_result0.items()):
-                out1_names = util.default(find_output_func(out0_name, index, iter_result1), [])
+            # Returns whether each of the outputs found for the specified output of the first IterationResult matched it.
+            def compare_with_found_outputs(index, out0_name, output0):
+                matches = []
+                out1_names = util.default(find_output(out0_name, index, iter_result1), [])
 
                 if len(out1_names) > 1:
                     G_LOGGER.info("Will attempt to compare output: '{:}' [{:}] with multiple outputs: '{:}' [{:}]".format(
@@ -354,9 +402,32 @@ class CompareFunc(object):
                                                                 per_out_rtol=per_out_rtol, per_out_atol=per_out_atol,
                                                                 per_out_err_stat=per_out_err_stat)
 
+                        matches.append(outputs_match)
+                        if fail_fast and not outputs_match:
+                            return matches
+                return matches
+
+
+            # Outputs are compared in order in the executor's threads; their messages are emitted
+            # in the same order, so the log looks the same as when comparing them one by one.
+            futures = []
+            if executor is None:
+                all_matches = (compare_with_found_outputs(index, out0_name, output0)
+                               for index, (out0_name, output0) in enumerate(iter_result0.items()))
+            else:
+                futures = [comp_util.submit_with_logs(executor, compare_with_found_outputs, index, out0_name, output0)
+                           for index, (out0_name, output0) in enumerate(iter_result0.items())]
+                all_matches = (comp_util.result_with_logs(future) for future in futures)
+
+            try:
+                for out0_name, matches in zip(iter_result0.keys(), all_matches):
+                    for outputs_match in matches:
                         output_status[out0_name] = outputs_match
                         if fail_fast and not outputs_match:
                             return output_status
+            finally:
+                for future in futures:
+                    future.cancel()
 
 
             mismatched_output_names = [name for name, matched in output_status.items() if not matched]
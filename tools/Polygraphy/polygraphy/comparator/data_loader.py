@@ -14,6 +14,9 @@
 # limitations under the License.
 #
 import contextlib
+import os
+import tempfile
+import threading
 from collections import OrderedDict
 
 from polygraphy import constants, func, mod, util
@@ -28,7 +31,7 @@ class DataLoader(object):
     Generates synthetic input data.
     """
     def __init__(self, seed=None, iterations=None, input_metadata=None,
-                 int_range=None, float_range=None, val_range=None):
+                 int_range=None, float_range=None, val_range=None, bit_generator=None, reuse_buffers=None):
         """
         Args:
             seed (int):
@@ -67,6 +70,18 @@ class DataLoader(object):
                     minimum and maximum.
                     This can be specified on a per-input basis using a dictionary. In that case,
                     use an empty string ("") as the key to specify default range for inputs not explicitly listed.
+            bit_generator (str):
+                    The name of a NumPy bit generator, like "PCG64", to use to generate data with a ``numpy.random.Generator``.
+                    This is considerably faster than the legacy ``numpy.random.RandomState``, and floating point data is generated
+                    directly in the data type of each input. The generated values differ from those generated with the legacy
+                    random number generator, but are still guaranteed to be the same for the same seed and index.
+                    Defaults to None, which uses ``numpy.random.RandomState``.
+            reuse_buffers (bool):
+                    Whether to generate the data for each iteration into the same buffers, rather than allocating new ones.
+                    Buffers returned for previous iterations are overwritten, so this should only be used when
+                    the input data for each iteration is consumed before the next is generated.
+                    This requires `bit_generator` to be set.
+                    Defaults to False.
         """
         def default_tuple(tup, default):
             if tup is None or (not isinstance(tup, tuple) and not isinstance(tup, list)):
@@ -94,6 +109,21 @@ class DataLoader(object):
         self.default_val_range = default_tuple(val_range, (0.0, 1.0))
         self.val_range = util.default(val_range, self.default_val_range)
 
+        self.bit_generator = bit_generator
+        if self.bit_generator is not None:
+            bit_generator_types = {name.lower(): getattr(np.random, name) for name in ["MT19937", "PCG64", "PCG64DXSM", "Philox", "SFC64"]
+                                   if hasattr(np.random, name)}
+            if self.bit_generator.lower() not in bit_generator_types:
+                G_LOGGER.critical("Unknown bit generator: {:}.\nNote: Valid choices are: {:}".format(
+                                    self.bit_generator, [bit_gen.__name__ for bit_gen in bit_generator_types.values()]))
+            self._bit_generator_type = bit_generator_types[self.bit_generator.lower()]
+
+        self.reuse_buffers = util.default(reuse_buffers, False)
+        if self.reuse_buffers and self.bit_generator is None:
+            G_LOGGER.critical("Buffers can only be reused when a bit generator is used to generate data. "
+                              "Please set `bit_generator`, for example, to: 'PCG64'")
+        self._reused_buffers = {} # Dict[str, numpy.ndarray]
+
         if self.user_input_metadata:
             G_LOGGER.info("Will generate inference input data according to provided TensorMetadata: {}".format(self.user_input_metadata))
 
@@ -101,7 +131,8 @@ class DataLoader(object):
     def __repr__(self):
         return util.make_repr("DataLoader", seed=self.seed, iterations=self.iterations,
                               input_metadata=self.user_input_metadata or None, int_range=self.int_range,
-                              float_range=self.float_range, val_range=self.val_range)[0]
+                              float_range=self.float_range, val_range=self.val_range, bit_generator=self.bit_generator,
+                              reuse_buffers=self.reuse_buffers if self.reuse_buffers else None)[0]
 
 
     def _get_range(self, name, cast_type):
@@ -122,27 +153,23 @@ class DataLoader(object):
         return tuple(cast_type(val) for val in tup)
 
 
-    def __getitem__(self, index):
+    def _make_rng(self, seed):
+        if self.bit_generator is None:
+            return np.random.RandomState(seed)
+        return np.random.Generator(self._bit_generator_type(seed))
+
+
+    def _get_input_metadata(self):
         """
-        Randomly generates input data.
+        Determines the data type and static shape of the data to generate for each input, and whether
+        the input is a shape tensor.
 
         May update the DataLoader's `input_metadata` attribute.
 
-        Args:
-            index (int):
-                    Since this class behaves like an iterable, it takes an index parameter.
-                    Generated data is guaranteed to be the same for the same index.
-
         Returns:
-            OrderedDict[str, numpy.ndarray]: A mapping of input names to input numpy buffers.
+            OrderedDict[str, Tuple[numpy.dtype, Tuple[int], bool]]:
+                    A mapping of input names to their data types, static shapes, and whether they are shape tensors.
         """
-        if index >= self.iterations:
-            raise IndexError()
-
-        G_LOGGER.verbose("Generating data using numpy seed: {:}".format(self.seed + index))
-        rng = np.random.RandomState(self.seed + index)
-
-
         def get_static_shape(name, shape):
             static_shape = shape
             if util.is_shape_dynamic(shape):
@@ -166,6 +193,8 @@ class DataLoader(object):
 
             _, shape = self.input_metadata[name]
             is_shape = np.issubdtype(dtype, np.integer) and (not util.is_shape_dynamic(shape)) and (len(shape) == 1)
+            if not is_shape:
+                return False
 
             user_shape = self.user_input_metadata[name].shape
             is_shape &= len(user_shape) == shape[0]
@@ -173,31 +202,10 @@ class DataLoader(object):
             return is_shape
 
 
-        def generate_buffer(name, dtype, shape):
-            if is_shape_tensor(name, dtype):
-                buffer = np.array(shape, dtype=dtype)
-                G_LOGGER.info("Assuming {:} is a shape tensor. Setting input values to: {:}. If this is not correct, "
-                              "please set it correctly in 'input_metadata' or by providing --input-shapes".format(name, buffer), mode=LogMode.ONCE)
-            elif np.issubdtype(dtype, np.integer) or np.issubdtype(dtype, np.bool_):
-                imin, imax = self._get_range(name, cast_type=int if np.issubdtype(dtype, np.integer) else bool)
-                G_LOGGER.verbose("Input tensor: {:} | Generating input data in range: [{:}, {:}]".format(name, imin, imax),
-                                 mode=LogMode.ONCE)
-                # high is 1 greater than the max int drawn.
-                buffer = rng.randint(low=imin, high=imax + 1, size=shape, dtype=dtype)
-            else:
-                fmin, fmax = self._get_range(name, cast_type=float)
-                G_LOGGER.verbose("Input tensor: {:} | Generating input data in range: [{:}, {:}]".format(name, fmin, fmax),
-                                 mode=LogMode.ONCE)
-                buffer = (rng.random_sample(size=shape) * (fmax - fmin) + fmin).astype(dtype)
-
-            buffer = np.array(buffer) # To handle scalars, since the above functions return a float if shape is ().
-            return buffer
-
-
         if self.input_metadata is None and self.user_input_metadata is not None:
             self.input_metadata = self.user_input_metadata
 
-        buffers = OrderedDict()
+        metadata = OrderedDict()
         for name, (dtype, shape) in self.input_metadata.items():
             if name in self.user_input_metadata:
                 user_dtype, user_shape = self.user_input_metadata[name]
@@ -211,8 +219,7 @@ class DataLoader(object):
                 else:
                     shape = util.default(user_shape, shape)
 
-            static_shape = get_static_shape(name, shape)
-            buffers[name] = generate_buffer(name, dtype, shape=static_shape)
+            metadata[name] = (dtype, get_static_shape(name, shape), is_shape_tensor(name, dtype))
 
         # Warn about unused metadata
         for name in self.user_input_metadata.keys():
@@ -228,15 +235,256 @@ class DataLoader(object):
             util.check_dict_contains(self.val_range, list(self.input_metadata.keys()) + [""],
                                      check_missing=False, dict_name="val_range")
 
+        return metadata
+
+
+    def _generate(self, index, metadata, get_buffer):
+        """
+        Generates the input data for the specified index.
+
+        Args:
+            index (int): The index.
+            metadata (OrderedDict[str, Tuple[numpy.dtype, Tuple[int], bool]]): The result of `_get_input_metadata()`.
+            get_buffer (Callable(str, numpy.dtype, Tuple[int]) -> numpy.ndarray):
+                    A callable that accepts the name, data type, and shape of the data for an input, and returns
+                    the buffer into which to generate it, or None to allocate a new buffer.
+                    This is only used when a bit generator is used.
+
+        Returns:
+            OrderedDict[str, numpy.ndarray]: A mapping of input names to input numpy buffers.
+        """
+        G_LOGGER.verbose("Generating data using numpy seed: {:}".format(self.seed + index))
+        rng = self._make_rng(self.seed + index)
+
+
+        def generate_buffer(name, dtype, shape, is_shape_tensor):
+            out = None
+            if self.bit_generator is not None:
+                out = get_buffer(name, dtype, (len(shape), ) if is_shape_tensor else tuple(shape))
+
+            if is_shape_tensor:
+                buffer = np.array(shape, dtype=dtype)
+                G_LOGGER.info("Assuming {:} is a shape tensor. Setting input values to: {:}. If this is not correct, "
+                              "please set it correctly in 'input_metadata' or by providing --input-shapes".format(name, buffer), mode=LogMode.ONCE)
+            elif np.issubdtype(dtype, np.integer) or np.issubdtype(dtype, np.bool_):
+                imin, imax = self._get_range(name, cast_type=int if np.issubdtype(dtype, np.integer) else bool)
+                G_LOGGER.verbose("Input tensor: {:} | Generating input data in range: [{:}, {:}]".format(name, imin, imax),
+                                 mode=LogMode.ONCE)
+                if self.bit_generator is None:
+                    # high is 1 greater than the max int drawn.
+                    buffer = rng.randint(low=imin, high=imax + 1, size=shape, dtype=dtype)
+                else:
+                    buffer = rng.integers(low=imin, high=imax, size=shape, dtype=dtype, endpoint=True)
+            else:
+                fmin, fmax = self._get_range(name, cast_type=float)
+                G_LOGGER.verbose("Input tensor: {:} | Generating input data in range: [{:}, {:}]".format(name, fmin, fmax),
+                                 mode=LogMode.ONCE)
+                if self.bit_generator is None:
+                    buffer = (rng.random_sample(size=shape) * (fmax - fmin) + fmin).astype(dtype)
+                else:
+                    # Generator.random() only supports 32 and 64-bit floats, but can generate directly into the output buffer.
+                    random_dtype = dtype if np.dtype(dtype) in [np.float32, np.float64] else np.float32
+                    buffer = out if out is not None and out.dtype == random_dtype else np.empty(shape, dtype=random_dtype)
+                    rng.random(dtype=random_dtype, out=buffer)
+                    buffer *= (fmax - fmin)
+                    buffer += fmin
+
+            buffer = np.asarray(buffer) # To handle scalars, since the above functions return a float if shape is ().
+            if out is None:
+                return buffer.astype(dtype, copy=False)
+            if out is not buffer:
+                np.copyto(out, buffer, casting="unsafe")
+            return out
+
+
+        buffers = OrderedDict()
+        for name, (dtype, shape, is_shape_tensor) in metadata.items():
+            buffers[name] = generate_buffer(name, dtype, shape, is_shape_tensor)
         return buffers
 
 
+    def __getitem__(self, index):
+        """
+        Randomly generates input data.
+
+        May update the DataLoader's `input_metadata` attribute.
+
+        Args:
+            index (int):
+                    Since this class behaves like an iterable, it takes an index parameter.
+                    Generated data is guaranteed to be the same for the same index.
+
+        Returns:
+            OrderedDict[str, numpy.ndarray]: A mapping of input names to input numpy buffers.
+        """
+        if index >= self.iterations:
+            raise IndexError()
+
+
+        def get_buffer(name, dtype, shape):
+            if not self.reuse_buffers:
+                return None
+
+            buffer = self._reused_buffers.get(name)
+            if buffer is None or buffer.dtype != np.dtype(dtype) or buffer.shape != shape:
+                buffer = np.empty(shape, dtype=dtype)
+                self._reused_buffers[name] = buffer
+            return buffer
+
+
+        return self._generate(index, self._get_input_metadata(), get_buffer)
+
+
+    def stacked(self):
+        """
+        Randomly generates input data for all iterations at once.
+
+        This requires `bit_generator` to be set. Data for each iteration is generated directly into
+        a single array per input, so this is faster than iterating over the data loader.
+
+        May update the DataLoader's `input_metadata` attribute.
+
+        Returns:
+            OrderedDict[str, numpy.ndarray]:
+                    A mapping of input names to arrays whose first dimension is the iteration.
+                    For each iteration ``index``, ``stacked()[name][index]`` is identical to ``self[index][name]``.
+        """
+        if self.bit_generator is None:
+            G_LOGGER.critical("Stacked data can only be generated when a bit generator is used to generate data. "
+                              "Please set `bit_generator`, for example, to: 'PCG64'")
+
+        metadata = self._get_input_metadata()
+        stacked = OrderedDict()
+        for name, (dtype, shape, is_shape_tensor) in metadata.items():
+            stacked[name] = np.empty((self.iterations, ) + ((len(shape), ) if is_shape_tensor else tuple(shape)), dtype=dtype)
+
+        for index in range(self.iterations):
+            self._generate(index, metadata, get_buffer=lambda name, dtype, shape: stacked[name][index, ...])
+        return stacked
+
+
+# The state of a DataLoaderCache which is shared with the copies returned by `share()`.
+class _SharedCacheState(object):
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        self.tmpdir = None # Owns the default store directory.
+        self.memory_bytes = 0
+        # Guards loading data from the data loader, and modifying the cache or the store.
+        self.lock = threading.Lock()
+
+
 # Caches data loaded by a DataLoader for use across multiple runners.
+#
+# Iterations that do not fit in the memory limit are spilled to an on-disk store, which contains one `.npy` file per buffer,
+# and are accessed through read-only memory maps. When the cache is pickled, e.g. to be sent to a subprocess,
+# all the buffers are spilled first, so only their paths are sent.
+#
+# Copies returned by `share()` share the cached data, the on-disk store, and a lock, which guards loading data from
+# the data loader, so that they can be used concurrently by runners with different input metadata.
 class DataLoaderCache(object):
-    def __init__(self, data_loader, save_inputs_path=None):
+    def __init__(self, data_loader, save_inputs_path=None, memory_limit_mb=None, store_dir=None):
+        """
+        Args:
+            data_loader (Generator -> OrderedDict[str, numpy.ndarray]):
+                    The data loader whose data to cache.
+            save_inputs_path (str):
+                    Path at which to save the inputs when they are first loaded.
+            memory_limit_mb (float):
+                    The maximum amount of input data, in MiB, to keep in memory. Iterations beyond the limit
+                    are spilled to the on-disk store. Defaults to None, which keeps all iterations in memory.
+            store_dir (str):
+                    The directory in which to store spilled buffers. This must outlive the cache and any copies of it.
+                    Defaults to a temporary directory which is created when first needed, and removed along with this cache.
+                    Copies of the cache, for example in subprocesses, do not remove it.
+        """
         self.data_loader = data_loader
-        self.cache = [] # List[OrderedDict[str, numpy.ndarray]]
+        self.cache = [] # List[OrderedDict[str, Union[numpy.ndarray, str]]]: Buffers, or the paths of spilled buffers.
         self.save_inputs_path = save_inputs_path
+        self.memory_limit_mb = memory_limit_mb
+        self._shared = _SharedCacheState(store_dir)
+
+
+    @property
+    def store_dir(self):
+        return self._shared.store_dir
+
+
+    def __getstate__(self):
+        # Subprocesses open the on-disk store instead of receiving the data over a queue.
+        with self._shared.lock:
+            self._spill(range(len(self.cache)))
+        state = self.__dict__.copy()
+        state["_shared"] = self._shared.store_dir
+        return state
+
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._shared = _SharedCacheState(state["_shared"])
+
+
+    def share(self):
+        """
+        Returns a copy of this cache which shares its data, but has its own input metadata.
+        The cache and its copies can then be used concurrently from multiple threads.
+        Data is still only loaded from the data loader once, by whichever cache first calls ``set_input_metadata()``.
+
+        Returns:
+            DataLoaderCache: The copy.
+        """
+        # Pickling would spill the entire cache, so the copy is made directly.
+        # The copy holds the same shared state, and hence the same store, which lives as long as any of the copies.
+        shared = object.__new__(DataLoaderCache)
+        shared.__dict__.update(self.__dict__)
+        return shared
+
+
+    def _make_store_dir(self):
+        if self._shared.store_dir is None:
+            self._shared.tmpdir = tempfile.TemporaryDirectory(prefix="polygraphy_inputs_")
+            self._shared.store_dir = self._shared.tmpdir.name
+
+
+    # Must be called with the lock held.
+    def _spill(self, iterations):
+        if not iterations:
+            return
+
+        self._make_store_dir()
+
+        for iteration in iterations:
+            feed_dict = self.cache[iteration]
+            for index, (name, buffer) in enumerate(feed_dict.items()):
+                # Arrays of Python objects cannot be memory-mapped, so they are never spilled.
+                if isinstance(buffer, str) or buffer.dtype.kind == "O":
+                    continue
+
+                path = os.path.join(self.store_dir, "{:}_{:}.npy".format(iteration, index))
+                np.save(path, buffer, allow_pickle=False)
+                feed_dict[name] = path
+                self._shared.memory_bytes -= buffer.nbytes
+
+
+    # Adds a feed_dict to the cache, spilling it if it does not fit in the memory limit.
+    # Returns whether the feed_dict was spilled.
+    def _add(self, feed_dict, copy=False):
+        feed_dict = OrderedDict(feed_dict)
+        nbytes = sum(np.asarray(buffer).nbytes for buffer in feed_dict.values())
+        spill = self.memory_limit_mb is not None and self._shared.memory_bytes + nbytes > self.memory_limit_mb * (1 << 20)
+        if copy and not spill:
+            feed_dict = OrderedDict((name, np.copy(buffer)) for name, buffer in feed_dict.items())
+
+        self.cache.append(feed_dict)
+        self._shared.memory_bytes += nbytes
+        if spill:
+            self._spill([len(self.cache) - 1])
+        return spill
+
+
+    def _load(self, iteration):
+        # Returns the cached feed_dict for the specified iteration, with spilled buffers memory-mapped.
+        return OrderedDict((name, np.load(buffer, mmap_mode="r", allow_pickle=False).view(np.ndarray) if isinstance(buffer, str) else buffer)
+                           for name, buffer in self.cache[iteration].items())
 
 
     @func.constantmethod
@@ -250,9 +498,10 @@ class DataLoaderCache(object):
         if iteration >= len(self.cache):
             raise IndexError()
 
+        cached_feed_dict = self._load(iteration)
+
         # Attempts to match existing input buffers to the requested input_metadata
         def coerce_cached_input(index, name, dtype, shape):
-            cached_feed_dict = self.cache[iteration]
             cached_name = util.find_in_dict(name, cached_feed_dict, index)
             assert cached_name is not None
 
@@ -299,7 +548,11 @@ class DataLoaderCache(object):
                                 "supports random access.".format(name))
                 try:
                     if data_loader_feed_dict is None:
-                        data_loader_feed_dict = self.data_loader[iteration]
+                        with self._shared.lock:
+                            # The data loader may be shared with caches that use different input metadata.
+                            with contextlib.suppress(AttributeError):
+                                self.data_loader.input_metadata = self.input_metadata
+                            data_loader_feed_dict = self.data_loader[iteration]
                     buffer = data_loader_feed_dict[name]
                 except:
                     G_LOGGER.critical("Could not reload inputs from data loader. Are the runners running the same model? "
@@ -319,15 +572,29 @@ class DataLoaderCache(object):
                     match the specified input_metadata when data already in the cache does not exactly match.
         """
         self.input_metadata = input_metadata
-        with contextlib.suppress(AttributeError):
-            self.data_loader.input_metadata = input_metadata
+        with self._shared.lock:
+            with contextlib.suppress(AttributeError):
+                self.data_loader.input_metadata = input_metadata
 
-        if not self.cache:
-            G_LOGGER.verbose("Loading inputs from data loader")
-            self.cache = list(self.data_loader)
             if not self.cache:
-                G_LOGGER.warning("Data loader did not yield any input data.")
-
-            # Only save inputs the first time the cache is generated
-            if self.save_inputs_path is not None:
-                save_json(self.cache, self.save_inputs_path, "inference input data")
+                G_LOGGER.verbose("Loading inputs from data loader")
+                if self.memory_limit_mb is None and isinstance(self.data_loader, DataLoader) and self.data_loader.bit_generator is not None:
+                    # Generating all iterations at once is faster, and the cached feed_dicts must not share buffers
+                    # in case the data loader reuses them.
+                    stacked = self.data_loader.stacked()
+                    for index in range(self.data_loader.iterations):
+                        self._add(OrderedDict((name, buffer[index, ...]) for name, buffer in stacked.items()))
+                else:
+                    # The data loader may overwrite its buffers for subsequent iterations.
+                    copy = isinstance(self.data_loader, DataLoader) and self.data_loader.reuse_buffers
+                    num_spilled = sum(self._add(feed_dict, copy=copy) for feed_dict in self.data_loader)
+                    if num_spilled:
+                        G_LOGGER.verbose("Input data exceeds the memory limit of {:} MiB. Spilled {:}/{:} iteration(s) to: {:}".format(
+                                            self.memory_limit_mb, num_spilled, len(self.cache), self.store_dir))
+
+                if not self.cache:
+                    G_LOGGER.warning("Data loader did not yield any input data.")
+
+                # Only save inputs the first time the cache is generated
+                if self.save_inputs_path is not None:
+                    save_json([self._load(iteration) for iteration in range(len(self.cache))], self.save_inputs_path, "inference input data")
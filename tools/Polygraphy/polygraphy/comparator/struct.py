@@ -14,18 +14,68 @@
 # limitations under the License.
 #
 
+import contextlib
+import os
 import tempfile
+import threading
+import weakref
 from collections import OrderedDict
 
 from polygraphy import mod, util, config
 from polygraphy.common.interface import TypedDict, TypedList
-from polygraphy.json import (Decoder, Encoder, add_json_methods, load_json,
-                             save_json)
+from polygraphy.json import Decoder, Encoder, add_json_methods
 from polygraphy.logger import G_LOGGER
 
 np = mod.lazy_import("numpy")
 
 
+class SwappedArrayCache(object):
+    """
+    A least-recently-used cache of memory-mapped arrays that were swapped to disk.
+    """
+    def __init__(self):
+        self.arrays = OrderedDict()
+        self.lock = threading.Lock()
+
+
+    def get(self, path):
+        """
+        Get a read-only, memory-mapped view of an array saved in a ``.npy`` file.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            np.ndarray: The array.
+        """
+        with self.lock:
+            if path in self.arrays:
+                self.arrays.move_to_end(path)
+                return self.arrays[path]
+
+            # Return a plain array so that the result is treated like any other array, e.g. when encoded as JSON.
+            arr = np.load(path, mmap_mode="r", allow_pickle=False).view(np.ndarray)
+            if config.ARRAY_SWAP_CACHE_SIZE > 0:
+                self.arrays[path] = arr
+                while len(self.arrays) > config.ARRAY_SWAP_CACHE_SIZE:
+                    self.arrays.popitem(last=False)
+            return arr
+
+
+    def remove(self, path):
+        with self.lock:
+            self.arrays.pop(path, None)
+
+
+SWAPPED_ARRAY_CACHE = SwappedArrayCache()
+
+
+def remove_swapped_file(path):
+    SWAPPED_ARRAY_CACHE.remove(path)
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(path)
+
+
 class LazyNumpyArray(object):
     """
     Represents a lazily loaded NumPy array.
@@ -33,25 +83,37 @@ class LazyNumpyArray(object):
     to save memory.
     """
 
-    def __init__(self, arr):
+    def __init__(self, arr=None, path=None):
         """
         Args:
             arr (np.ndarray): The NumPy array.
+            path (str):
+                    The path of a ``.npy`` file containing the array, which is used instead of ``arr``.
+                    The file is owned by this object, and is removed along with it.
         """
         self.arr = None
         self.tmpfile = None
-        if config.ARRAY_SWAP_THRESHOLD_MB >= 0 and arr.nbytes > (config.ARRAY_SWAP_THRESHOLD_MB << 20):
-            self.tmpfile = tempfile.NamedTemporaryFile(mode="w+", suffix=".json")
+        self.path = path
+        if path is not None:
+            weakref.finalize(self, remove_swapped_file, path)
+        # Arrays of Python objects cannot be memory-mapped, so they are never swapped.
+        elif config.ARRAY_SWAP_THRESHOLD_MB >= 0 and arr.nbytes > (config.ARRAY_SWAP_THRESHOLD_MB << 20) and arr.dtype.kind != "O":
+            self.tmpfile = tempfile.NamedTemporaryFile(mode="w+b", suffix=".npy")
+            self.path = self.tmpfile.name
             G_LOGGER.extra_verbose("Evicting large array ({:.3f} MiB) from memory and saving to {:}".format(
-                                        arr.nbytes / (1024.0 ** 2), self.tmpfile.name))
-            save_json(arr, self.tmpfile)
+                                        arr.nbytes / (1024.0 ** 2), self.path))
+            np.save(self.tmpfile, arr, allow_pickle=False)
+            self.tmpfile.flush()
+            # The temporary file is deleted along with this object, so the memory map must not outlive it.
+            weakref.finalize(self, SWAPPED_ARRAY_CACHE.remove, self.path)
         else:
             self.arr = arr
 
 
     def numpy(self):
         """
-        Get the NumPy array, deserializing from the disk if it was stored earlier.
+        Get the NumPy array. If the array was swapped to the disk, this returns a read-only,
+        memory-mapped view of it, so that only the data which is accessed is read from the disk.
 
         Returns:
             np.ndarray: The NumPy array
@@ -59,8 +121,8 @@ class LazyNumpyArray(object):
         if self.arr is not None:
             return self.arr
 
-        assert self.tmpfile is not None, "Path and NumPy array cannot both be None!"
-        return load_json(self.tmpfile)
+        assert self.path is not None, "Path and NumPy array cannot both be None!"
+        return SWAPPED_ARRAY_CACHE.get(self.path)
 
 
 @Encoder.register(LazyNumpyArray)
@@ -303,7 +365,18 @@ class AccuracyResult(TypedDict(lambda: tuple, lambda: list)):
 
         runner0_output = run_results["runner0"][iteration][output_name]
         runner1_output = run_results["runner1"][iteration][output_name]
+
+    Iterations may also be counted without keeping their dictionaries, like ``Comparator.run_and_compare``
+    does by default (see ``add_counts()``). Such iterations are included in ``stats()`` and ``percentage()``,
+    but not in the lists of dictionaries.
     """
+    def __init__(self, dct=None):
+        super().__init__(dct)
+        # Maps runner pairs to the number of iterations that matched, and the total number of iterations,
+        # which were counted without keeping their dictionaries.
+        self.counts = OrderedDict()
+
+
     def __bool__(self):
         """
         Whether all outputs matched for every iteration.
@@ -316,7 +389,21 @@ class AccuracyResult(TypedDict(lambda: tuple, lambda: list)):
         Returns:
             bool
         """
-        return all([bool(match) for outs in self.values() for out in outs for match in out.values()])
+        return all([bool(match) for outs in self.values() for out in outs for match in out.values()]) and \
+                all([matched == total for matched, total in self.counts.values()])
+
+
+    def add_counts(self, runner_pair, matched, total):
+        """
+        Counts iterations for the given pair of runners without keeping their dictionaries.
+
+        Args:
+            runner_pair (Tuple[str, str]): A pair of runner names.
+            matched (int): The number of iterations that matched.
+            total (int): The total number of iterations.
+        """
+        prev_matched, prev_total = self.counts.get(runner_pair, (0, 0))
+        self.counts[runner_pair] = (prev_matched + matched, prev_total + total)
 
 
     def _get_runner_pair(self, runner_pair):
@@ -360,4 +447,130 @@ class AccuracyResult(TypedDict(lambda: tuple, lambda: list)):
         outs = self[runner_pair]
         matched = sum([all([match for match in out.values()]) for out in outs])
         total = len(outs)
+        counted_matched, counted_total = self.counts.get(runner_pair, (0, 0))
+        matched += counted_matched
+        total += counted_total
         return matched, total - matched, total
+
+
+@mod.export()
+class BenchmarkResult(object):
+    """
+    The result of benchmarking a runner with ``BaseRunner.benchmark()``.
+    Includes the latency of each inference, and the total time required to run all of them,
+    from which the throughput is computed.
+    """
+    def __init__(self, latencies_ns, total_time_ns, threads=None, runner_name=None):
+        """
+        Args:
+            latencies_ns (Sequence[int]): The latency of each inference, in nanoseconds.
+            total_time_ns (int): The wall-clock time required to run all the inferences, in nanoseconds.
+            threads (int): The number of threads which ran inference concurrently. Defaults to 1.
+            runner_name (str): The name of the runner that was benchmarked.
+        """
+        self.latencies_ns = np.array(latencies_ns, dtype=np.int64)
+        self.total_time_ns = int(total_time_ns)
+        self.threads = util.default(threads, 1)
+        self.runner_name = util.default(runner_name, "")
+
+
+    @property
+    def iterations(self):
+        """int: The number of inferences that were run."""
+        return self.latencies_ns.size
+
+
+    @property
+    def throughput(self):
+        """float: The number of inferences per second, across all threads."""
+        if not self.total_time_ns:
+            return 0.0
+        return self.iterations / (self.total_time_ns * 1e-9)
+
+
+    def latency(self, percentile=None):
+        """
+        Returns a percentile of the latencies of the inferences.
+
+        Args:
+            percentile (float):
+                    The percentile, between 0 and 100. For example, 50 returns the median latency,
+                    while 100 returns the maximum. Defaults to None, which returns the mean latency.
+
+        Returns:
+            float: The latency, in milliseconds, or 0.0 if no inferences were run.
+        """
+        if not self.iterations:
+            return 0.0
+        if percentile is None:
+            return float(np.mean(self.latencies_ns)) * 1e-6
+        return float(np.percentile(self.latencies_ns, percentile)) * 1e-6
+
+
+    def summary(self):
+        """
+        Returns summary statistics of the benchmark.
+
+        Returns:
+            OrderedDict[str, float]:
+                    The number of iterations and threads, the throughput in inferences per second,
+                    and the mean, median (p50), p90, p99 and maximum latencies in milliseconds.
+        """
+        return OrderedDict([
+            ("iterations", self.iterations),
+            ("threads", self.threads),
+            ("throughput", self.throughput),
+            ("mean_ms", self.latency()),
+            ("p50_ms", self.latency(50)),
+            ("p90_ms", self.latency(90)),
+            ("p99_ms", self.latency(99)),
+            ("max_ms", self.latency(100)),
+        ])
+
+
+    def __str__(self):
+        summary = self.summary()
+        return ("{:} iteration(s) | {:} thread(s) | Throughput: {:.4g} inferences/s | "
+                "Latency (ms): mean={:.4g}, p50={:.4g}, p90={:.4g}, p99={:.4g}, max={:.4g}".format(*summary.values()))
+
+
+    def __eq__(self, other):
+        return (self.runner_name == other.runner_name and self.threads == other.threads and
+                self.total_time_ns == other.total_time_ns and np.array_equal(self.latencies_ns, other.latencies_ns))
+
+
+@Encoder.register(BenchmarkResult)
+def encode(result):
+    return {
+        "runner_name": result.runner_name,
+        "threads": result.threads,
+        "total_time_ns": result.total_time_ns,
+        "latencies_ns": result.latencies_ns,
+        # Only included to make the JSON easier to read.
+        "summary": result.summary(),
+    }
+
+
+@Decoder.register(BenchmarkResult)
+def decode(dct):
+    return BenchmarkResult(dct["latencies_ns"], dct["total_time_ns"], threads=dct["threads"], runner_name=dct["runner_name"])
+
+
+@mod.export()
+@add_json_methods("benchmark results")
+class BenchmarkResults(TypedDict(lambda: str, lambda: BenchmarkResult)):
+    """
+    An ordered dictionary mapping runner names to the results of ``Comparator.benchmark()``.
+    Like ``RunResults``, this can be saved to and loaded from JSON files.
+    """
+    pass
+
+
+@Encoder.register(BenchmarkResults)
+def encode(results):
+    return {"lst": list(results.items())}
+
+
+@Decoder.register(BenchmarkResults)
+def decode(dct):
+    return BenchmarkResults(OrderedDict(map(tuple, dct["lst"])))
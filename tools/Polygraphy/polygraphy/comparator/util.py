@@ -1,6 +1,11 @@
 import functools
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
 
 from polygraphy import mod, util, config
+from polygraphy.comparator.struct import IterationResult, LazyNumpyArray
 from polygraphy.logger import G_LOGGER
 
 np = mod.lazy_import("numpy")
@@ -67,7 +72,17 @@ def str_histogram(output, hist_range=None):
         except ValueError as err:
             G_LOGGER.verbose("Could not generate histogram. Note: Error was: {:}".format(err))
             return ""
+        return str_histogram_counts(hist, bin_edges)
+    except Exception as err:
+        G_LOGGER.verbose("Could not generate histogram.\nNote: Error was: {:}".format(err))
+        if config.INTERNAL_CORRECTNESS_CHECKS:
+            raise
+        return ""
+
 
+# Formats a histogram, given the counts and bin edges returned by np.histogram
+def str_histogram_counts(hist, bin_edges):
+    try:
         max_num_elems = compute_max(hist)
         if not max_num_elems: # Empty tensor
             return
@@ -118,3 +133,566 @@ def log_output_stats(output, info_hist=False, runner_name=None, hist_range=None)
     with G_LOGGER.indent():
         # Show histogram on failures.
         G_LOGGER.log(lambda: str_histogram(output, hist_range), severity=G_LOGGER.INFO if info_hist else G_LOGGER.VERBOSE)
+
+
+##
+## Fused error statistics
+##
+
+# The number of elements processed at a time by compute_error_stats().
+STATS_CHUNK_SIZE = 1 << 17
+# The number of bins used to narrow down the location of a median on each pass.
+# This is a multiple of NUM_HIST_BINS, so that histograms can be computed from the first one.
+MEDIAN_SEARCH_BINS = 1000
+# The maximum number of passes used to narrow down a median before collecting the remaining candidates.
+MEDIAN_SEARCH_MAX_PASSES = 8
+# The number of bins in histograms, which is the same as the default for np.histogram.
+NUM_HIST_BINS = 10
+
+
+class ArrayStats(object):
+    """
+    Statistics about an array, as computed by ``compute_error_stats()``.
+    """
+    def __init__(self, shape):
+        self.shape = shape
+        self.mean = 0
+        self.stddev = 0
+        self.variance = 0
+        self.median = 0
+        self.min = 0
+        self.argmin = 0
+        self.max = 0
+        self.argmax = 0
+        self.histogram = None # Tuple[np.ndarray, np.ndarray]: The counts and bin edges of the histogram, if it could be computed.
+
+
+class ErrorStats(object):
+    """
+    Statistics about two outputs and the differences between them, as computed by ``compute_error_stats()``.
+    """
+    def __init__(self, out0, out1, absdiff, reldiff):
+        self.out0 = out0
+        self.out1 = out1
+        self.absdiff = absdiff
+        self.reldiff = reldiff
+        self.num_mismatches = 0
+        self.max_elemwiseabs = 0
+        self.max_elemwiserel = 0
+        self.num_passes = 0
+
+
+# Buffers that are reused for every chunk, so that no chunk-sized temporaries need to be allocated.
+class StatsWorkspace(object):
+    def __init__(self, chunk_size):
+        self.float32 = np.empty((chunk_size, ), dtype=np.float32)
+        self.float64 = np.empty((chunk_size, ), dtype=np.float64)
+        self.bins = np.empty((chunk_size, ), dtype=np.intp)
+        self.mask = np.empty((chunk_size, ), dtype=np.bool_)
+        self.tmp_mask = np.empty((chunk_size, ), dtype=np.bool_)
+
+
+    # Maps values to equal-width bins between lo and hi. Values outside the range are clipped to the first or last bin.
+    # Since the mapping is monotonic, each bin holds a contiguous range of values.
+    def bin(self, values, lo, hi, num_bins):
+        # Monotonicity does not depend on precision, so there is no need to use more than the values have.
+        work = (self.float32 if values.dtype in [np.float16, np.float32] else self.float64)[:values.size]
+        np.subtract(values, lo, out=work, dtype=work.dtype)
+        np.multiply(work, num_bins / (hi - lo), out=work)
+        np.maximum(work, 0, out=work)
+        np.minimum(work, num_bins - 1, out=work)
+        bins = self.bins[:values.size]
+        np.copyto(bins, work, casting="unsafe")
+        return bins
+
+
+# Accumulates statistics over consecutive chunks of a flattened array.
+class StatsAccumulator(object):
+    def __init__(self, shape, dtype, workspace, max_candidates):
+        self.stats = ArrayStats(shape)
+        self.dtype = dtype
+        self.workspace = workspace
+        self.max_candidates = max_candidates
+        self.is_bool = np.issubdtype(dtype, np.bool_)
+        self.is_float = np.issubdtype(dtype, np.floating)
+
+        self.count = 0
+        self.total = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        self.argmin = 0
+        self.argmax = 0
+        self.has_nan = False
+        self.num_neg_inf = 0
+        self.num_pos_inf = 0
+        self.finite_min = None
+        self.finite_max = None
+
+        self.hist_range = None
+        self.hist = None
+
+        # The median is found by repeatedly computing a histogram of the elements that may be the median,
+        # and narrowing the search down to the bins which contain the middle elements, until there are few enough
+        # candidates left to collect them and select the middle elements directly.
+        self.median_values = {} # Dict[int, scalar]: Maps ranks of the middle elements to their values, once known.
+        self.search_ranks = []
+        self.search_range = None
+        self.search_levels = [] # List[Tuple[float, float, int, int]]: The range and selected bins of each previous histogram.
+        self.num_below = 0 # The number of elements known to be smaller than any candidate.
+        self.collecting = False
+        self.search_hist = None
+        self.selected_min = None
+        self.selected_max = None
+        self.candidates = []
+
+
+    def update(self, chunk, offset):
+        # Like np.amin/np.amax, argmin/argmax return the first NaN if there is one, so NaNs propagate.
+        argmin, argmax = np.argmin(chunk), np.argmax(chunk)
+        chunk_min, chunk_max = chunk[argmin], chunk[argmax]
+        chunk_has_nan = self.is_float and np.isnan(chunk_max)
+
+        if self.min is None or (not self.has_nan and (chunk_has_nan or chunk_min < self.min)):
+            self.min, self.argmin = chunk_min, offset + argmin
+        if self.max is None or (not self.has_nan and (chunk_has_nan or chunk_max > self.max)):
+            self.max, self.argmax = chunk_max, offset + argmax
+        self.has_nan |= chunk_has_nan
+
+        # Merge the chunk's sum of squared deviations using the parallel variance algorithm of Chan et al.
+        chunk_total = np.sum(chunk, dtype=np.float64)
+        chunk_mean = chunk_total / chunk.size
+        work = self.workspace.float64[:chunk.size]
+        np.subtract(chunk, chunk_mean, out=work, dtype=np.float64)
+        np.square(work, out=work)
+        chunk_m2 = np.sum(work)
+        if self.count:
+            delta = chunk_mean - self.total / self.count
+            chunk_m2 += delta * delta * self.count * chunk.size / (self.count + chunk.size)
+        self.m2 += chunk_m2
+        self.total += chunk_total
+        self.count += chunk.size
+
+        if chunk_has_nan or self.is_bool:
+            return
+
+        if self.is_float and not (np.isfinite(chunk_min) and np.isfinite(chunk_max)):
+            self.num_neg_inf += np.count_nonzero(chunk == -np.inf)
+            self.num_pos_inf += np.count_nonzero(chunk == np.inf)
+            finite = chunk[np.isfinite(chunk)]
+            if not finite.size:
+                return
+            chunk_min, chunk_max = np.amin(finite), np.amax(finite)
+
+        if self.finite_min is None or chunk_min < self.finite_min:
+            self.finite_min = chunk_min
+        if self.finite_max is None or chunk_max > self.finite_max:
+            self.finite_max = chunk_max
+
+
+    def finalize(self):
+        stats = self.stats
+        if not self.count:
+            return
+
+        stats.mean = self.total / self.count
+        stats.variance = self.m2 / self.count
+        stats.stddev = np.sqrt(stats.variance)
+        stats.min, stats.max = self.min, self.max
+        stats.argmin = np.unravel_index(self.argmin, stats.shape)
+        stats.argmax = np.unravel_index(self.argmax, stats.shape)
+
+
+    @property
+    def searching(self):
+        return bool(self.search_ranks)
+
+
+    # Sets up the median search and the histogram to compute on the next pass. Returns whether another pass is needed.
+    def begin_search(self, hist_range):
+        if not self.count:
+            return False
+
+        # Like str_histogram(), skip histograms that np.histogram would not be able to compute.
+        if not self.is_bool and np.all(np.isfinite(hist_range)):
+            lo, hi = float(hist_range[0]), float(hist_range[1])
+            if lo == hi:
+                lo, hi = lo - 0.5, hi + 0.5
+            self.hist_range = (lo, hi)
+            self.hist = np.zeros((NUM_HIST_BINS, ), dtype=np.int64)
+
+        # np.median averages the middle two elements, which are the same one for odd sizes.
+        ranks = sorted(set([(self.count - 1) // 2, self.count // 2]))
+        if self.has_nan:
+            self.median_values = {rank: np.nan for rank in ranks}
+        elif self.is_bool:
+            num_false = self.count - int(self.total)
+            self.median_values = {rank: np.bool_(rank >= num_false) for rank in ranks}
+        else:
+            for rank in ranks:
+                if rank < self.num_neg_inf:
+                    self.median_values[rank] = self.dtype.type(-np.inf)
+                elif rank >= self.count - self.num_pos_inf:
+                    self.median_values[rank] = self.dtype.type(np.inf)
+                elif self.finite_min == self.finite_max:
+                    self.median_values[rank] = self.finite_min
+                else:
+                    self.search_ranks.append(rank)
+
+        if self.searching:
+            # If possible, use the same range as the histogram, so it can be computed from the first search histogram.
+            self.search_range = self.hist_range if self.hist_range is not None else (float(self.finite_min), float(self.finite_max))
+            self.num_below = self.num_neg_inf
+            self.collecting = self.count - self.num_neg_inf - self.num_pos_inf <= self.max_candidates
+            self._reset_search_pass()
+        else:
+            self._set_median()
+        return self.searching or self.hist is not None
+
+
+    def _reset_search_pass(self):
+        self.search_hist = np.zeros((MEDIAN_SEARCH_BINS, ), dtype=np.int64)
+        self.selected_min = None
+        self.selected_max = None
+        self.candidates = []
+
+
+    def _set_median(self):
+        self.stats.median = np.mean(np.array([self.median_values[rank] for rank in sorted(self.median_values)]))
+
+
+    # Whether the histogram can be computed from the search histogram on this pass.
+    @property
+    def hist_from_search(self):
+        return self.searching and not self.collecting and not self.search_levels and self.search_range == self.hist_range
+
+
+    # Returns the elements of the chunk that are still candidates for the median.
+    def _candidates(self, chunk):
+        has_inf = self.num_neg_inf or self.num_pos_inf
+        if not has_inf and not self.search_levels:
+            return chunk
+
+        # Since binning is monotonic, the candidates lie within the current search range, give or take rounding errors.
+        # Select the elements near it with cheap comparisons first, and only check the bins from previous passes for those.
+        lo, hi = self.search_range
+        margin = 0
+        if self.search_levels:
+            margin = (self.search_levels[-1][1] - self.search_levels[-1][0]) / MEDIAN_SEARCH_BINS
+
+        mask = self.workspace.mask[:chunk.size]
+        tmp_mask = self.workspace.tmp_mask[:chunk.size]
+        np.greater_equal(chunk, lo - margin, out=mask)
+        np.less_equal(chunk, hi + margin, out=tmp_mask)
+        np.logical_and(mask, tmp_mask, out=mask)
+        candidates = chunk[mask]
+
+        for level_lo, level_hi, first_bin, last_bin in self.search_levels:
+            bins = self.workspace.bin(candidates, level_lo, level_hi, MEDIAN_SEARCH_BINS)
+            candidates = candidates[(bins >= first_bin) & (bins <= last_bin)]
+        return candidates
+
+
+    def search(self, chunk):
+        if self.hist is not None and not self.hist_from_search:
+            self.hist += np.bincount(self.workspace.bin(chunk, *self.hist_range, NUM_HIST_BINS), minlength=NUM_HIST_BINS)
+
+        if not self.searching:
+            return
+
+        candidates = self._candidates(chunk)
+        if self.collecting:
+            # The chunk may be a view of a buffer that is reused for the next chunk.
+            self.candidates.append(candidates.copy() if candidates is chunk else candidates)
+            return
+
+        self.search_hist += np.bincount(self.workspace.bin(candidates, *self.search_range, MEDIAN_SEARCH_BINS),
+                                        minlength=MEDIAN_SEARCH_BINS)
+        if self.search_levels and candidates.size:
+            sel_min, sel_max = np.amin(candidates), np.amax(candidates)
+            if self.selected_min is None or sel_min < self.selected_min:
+                self.selected_min = sel_min
+            if self.selected_max is None or sel_max > self.selected_max:
+                self.selected_max = sel_max
+
+
+    # Finishes a pass over the data. Returns whether another pass is needed.
+    def end_search(self):
+        if self.hist is not None:
+            if self.hist_from_search:
+                self.hist = self.search_hist.reshape(NUM_HIST_BINS, -1).sum(axis=1)
+            self.stats.histogram = (self.hist, np.linspace(self.hist_range[0], self.hist_range[1], NUM_HIST_BINS + 1))
+            self.hist = None
+
+        if not self.searching:
+            return False
+
+        if self.collecting:
+            candidates = np.concatenate(self.candidates)
+            kth = [rank - self.num_below for rank in self.search_ranks]
+            candidates.partition(kth)
+            for rank, index in zip(self.search_ranks, kth):
+                self.median_values[rank] = candidates[index]
+            self.search_ranks = []
+        elif self.selected_min is not None and self.selected_min == self.selected_max:
+            # All of the remaining candidates are the same.
+            for rank in self.search_ranks:
+                self.median_values[rank] = self.selected_min
+            self.search_ranks = []
+
+        if not self.searching:
+            self.candidates = []
+            self._set_median()
+            return False
+
+        # Narrow the search down to the bins containing the middle elements.
+        cumulative = np.cumsum(self.search_hist)
+        first_bin = np.searchsorted(cumulative, self.search_ranks[0] - self.num_below, side="right")
+        last_bin = np.searchsorted(cumulative, self.search_ranks[-1] - self.num_below, side="right")
+        num_before = cumulative[first_bin - 1] if first_bin else 0
+        self.num_below += num_before
+        self.search_levels.append(self.search_range + (first_bin, last_bin))
+
+        # Since binning is monotonic, the candidates are roughly within the range of the selected bins.
+        # Any that are not will be clipped to the first or last bin on the next pass.
+        lo, hi = self.search_range
+        width = (hi - lo) / MEDIAN_SEARCH_BINS
+        self.search_range = (lo + first_bin * width, lo + (last_bin + 1) * width)
+        self.collecting = (cumulative[last_bin] - num_before <= self.max_candidates
+                           or len(self.search_levels) >= MEDIAN_SEARCH_MAX_PASSES
+                           or not self.search_range[0] < self.search_range[1])
+        self._reset_search_pass()
+        return True
+
+
+def compute_error_stats(out0, out1, atol=None, rtol=None, chunk_size=None):
+    """
+    Computes statistics about two outputs of the same shape and the absolute and relative
+    differences between them, i.e. ``abs(out0 - out1)`` and ``abs(out0 - out1) / abs(out1)``.
+
+    Unlike computing each statistic separately, the outputs are processed in chunks, so that temporary
+    buffers are bounded by the chunk size rather than the size of the outputs, and are reused for every chunk.
+    The mean, standard deviation, minimum, maximum and mismatch counts are computed in a single pass.
+    Histograms and exact medians require a second pass, and usually a third to collect the elements
+    around each median. Values which are spread very unevenly may require a few more passes.
+
+    Args:
+        out0 (np.ndarray): The first output.
+        out1 (np.ndarray): The second output. Must have the same shape as the first.
+        atol (float):
+                The absolute tolerance used to count mismatched elements.
+                If this or `rtol` is not provided, mismatched elements are not counted.
+        rtol (float):
+                The relative tolerance used to count mismatched elements.
+        chunk_size (int):
+                The number of elements to process at a time.
+                Defaults to comparator.util.STATS_CHUNK_SIZE.
+
+    Returns:
+        ErrorStats: The statistics. Histograms of the outputs use a shared range, like the one used by basic_compare_func.
+    """
+    chunk_size = util.default(chunk_size, STATS_CHUNK_SIZE)
+    if out0.shape != out1.shape:
+        G_LOGGER.critical("Cannot compute error statistics for outputs of different shapes: {:} and {:}".format(out0.shape, out1.shape))
+
+    flat0 = out0.reshape(-1)
+    flat1 = out1.reshape(-1)
+    chunk_size = max(min(chunk_size, flat0.size), 1)
+    is_bool = np.issubdtype(out0.dtype, np.bool_) and np.issubdtype(out1.dtype, np.bool_)
+
+    # Determine the dtypes of the differences using empty arrays, so the buffers for them can be allocated up front.
+    absdiff = np.logical_xor(flat0[:0], flat1[:0]) if is_bool else np.abs(flat0[:0] - flat1[:0])
+    absout1 = np.abs(flat1[:0])
+    reldiff = absdiff / absout1
+    absdiff_buffer, absout1_buffer, reldiff_buffer = [np.empty((chunk_size, ), dtype=arr.dtype) for arr in [absdiff, absout1, reldiff]]
+
+    def compute_diffs(chunk0, chunk1):
+        absdiff = absdiff_buffer[:chunk0.size]
+        if is_bool:
+            np.logical_xor(chunk0, chunk1, out=absdiff)
+        else:
+            np.subtract(chunk0, chunk1, out=absdiff)
+            np.abs(absdiff, out=absdiff)
+        absout1 = np.abs(chunk1, out=absout1_buffer[:chunk0.size])
+        return absdiff, np.divide(absdiff, absout1, out=reldiff_buffer[:chunk0.size])
+
+
+    workspace = StatsWorkspace(chunk_size)
+    accumulators = [StatsAccumulator(out0.shape, dtype, workspace, chunk_size)
+                        for dtype in [out0.dtype, out1.dtype, absdiff.dtype, reldiff.dtype]]
+    error_stats = ErrorStats(*[acc.stats for acc in accumulators])
+    count_mismatches = atol is not None and rtol is not None
+
+    # Calls func(offset, chunks) for each chunk, where chunks holds chunks of out0, out1, absdiff, and reldiff, in that order.
+    def run_pass(func, with_diffs=True):
+        for offset in range(0, flat0.size, chunk_size):
+            chunks = [flat0[offset:offset + chunk_size], flat1[offset:offset + chunk_size]]
+            if with_diffs:
+                chunks.extend(compute_diffs(*chunks))
+            func(offset, chunks)
+        error_stats.num_passes += 1
+
+
+    def update(offset, chunks):
+        for acc, chunk in zip(accumulators, chunks):
+            acc.update(chunk, offset)
+
+        if count_mismatches:
+            absdiff, reldiff = chunks[2:]
+            mismatches = workspace.mask[:absdiff.size]
+            np.greater(absdiff, atol, out=mismatches)
+            np.greater(reldiff, rtol, out=workspace.tmp_mask[:absdiff.size])
+            np.logical_and(mismatches, workspace.tmp_mask[:absdiff.size], out=mismatches)
+
+            num_mismatches = np.count_nonzero(mismatches)
+            if num_mismatches:
+                error_stats.num_mismatches += num_mismatches
+                error_stats.max_elemwiseabs = max(error_stats.max_elemwiseabs, np.amax(absdiff[mismatches]))
+                error_stats.max_elemwiserel = max(error_stats.max_elemwiserel, np.amax(reldiff[mismatches]))
+
+
+    def search(offset, chunks):
+        for acc, chunk in zip(accumulators, chunks):
+            if acc.hist is not None or acc.searching:
+                acc.search(chunk)
+
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        run_pass(update)
+        for acc in accumulators:
+            acc.finalize()
+
+        out_hist_range = (min(error_stats.out0.min, error_stats.out1.min), max(error_stats.out0.max, error_stats.out1.max))
+        active = [acc.begin_search(hist_range) for acc, hist_range in
+                    zip(accumulators, [out_hist_range, out_hist_range] + [(acc.stats.min, acc.stats.max) for acc in accumulators[2:]])]
+        while any(active):
+            run_pass(search, with_diffs=any(active[2:]))
+            active = [acc.end_search() if is_active else False for acc, is_active in zip(accumulators, active)]
+
+    return error_stats
+
+
+def str_array_stats(stats, runner_name=None):
+    ret = ""
+    if runner_name:
+        ret += "{:} | Stats: ".format(runner_name)
+    ret += "mean={:.5g}, std-dev={:.5g}, var={:.5g}, median={:.5g}, min={:.5g} at {:}, max={:.5g} at {:}\n".format(
+        stats.mean, stats.stddev, stats.variance, stats.median, stats.min, stats.argmin, stats.max, stats.argmax)
+    return ret
+
+
+# Like log_output_stats, but for statistics computed by compute_error_stats()
+def log_array_stats(stats, info_hist=False, runner_name=None):
+    G_LOGGER.info(str_array_stats(stats, runner_name))
+    with G_LOGGER.indent():
+        G_LOGGER.log(lambda: str_histogram_counts(*stats.histogram) if stats.histogram is not None else "",
+                     severity=G_LOGGER.INFO if info_hist else G_LOGGER.VERBOSE)
+
+
+##
+## Concurrent comparisons
+##
+
+def submit_with_logs(executor, func, *args, **kwargs):
+    """
+    Submits a function to an executor, buffering the messages it logs.
+    Use `result_with_logs()` to emit the messages and retrieve the result,
+    so that messages are logged in the order in which results are retrieved.
+    """
+    def run():
+        with G_LOGGER.capture() as messages:
+            try:
+                return messages, func(*args, **kwargs), None
+            except Exception as err:
+                return messages, None, err
+
+    return executor.submit(run)
+
+
+def result_with_logs(future):
+    """
+    Waits for a future returned by `submit_with_logs()`, emits the messages logged by the function,
+    and returns its result, or re-raises the exception it raised.
+    """
+    messages, result, err = future.result()
+    G_LOGGER.replay(messages)
+    if err is not None:
+        raise err
+    return result
+
+
+##
+## Subprocess transport
+##
+
+# The minimum size, in bytes, of outputs which export_iteration_results() writes to files by default.
+# Smaller outputs are cheaper to pickle.
+SHARED_ARRAY_MIN_BYTES = 1 << 20
+
+
+def export_iteration_results(iteration_results, directory, min_bytes=None):
+    """
+    Prepares iteration results to be sent from a subprocess without pickling their outputs.
+    Outputs are written to ``.npy`` files in the specified directory, so that only their paths
+    need to be sent. Use `import_iteration_results()` to reconstruct the iteration results.
+
+    Args:
+        iteration_results (List[IterationResult]): The iteration results.
+        directory (str): The directory in which to write the outputs. This must outlive the subprocess.
+        min_bytes (int):
+                The minimum size of outputs to write to files. Smaller outputs, as well as arrays of Python objects,
+                are sent as-is. Defaults to SHARED_ARRAY_MIN_BYTES.
+
+    Returns:
+        List[Tuple[str, float, OrderedDict[str, Union[np.ndarray, str]]]]:
+                The runner name, runtime, and outputs or output paths of each iteration.
+    """
+    min_bytes = util.default(min_bytes, SHARED_ARRAY_MIN_BYTES)
+
+    exported = []
+    for iteration, iter_result in enumerate(iteration_results):
+        outputs = OrderedDict()
+        for index, (name, arr) in enumerate(iter_result.items()):
+            if arr.nbytes >= min_bytes and arr.dtype.kind != "O":
+                path = os.path.join(directory, "{:}_{:}_{:}.npy".format(os.getpid(), iteration, index))
+                np.save(path, arr, allow_pickle=False)
+                arr = path
+            outputs[name] = arr
+        exported.append((iter_result.runner_name, iter_result.runtime, outputs))
+    return exported
+
+
+def import_iteration_results(exported):
+    """
+    Reconstructs iteration results prepared by `export_iteration_results()`.
+    Outputs that were written to files are memory-mapped instead of being copied into memory.
+
+    Unless the outputs are large enough to be swapped to the disk (see ``POLYGRAPHY_ARRAY_SWAP_THRESHOLD_MB``),
+    they are mapped copy-on-write, so that they are writable like any other output, and their files are removed right away.
+    Otherwise, like other swapped arrays, they are read-only, and each file is moved out of the directory it was
+    written to, and is owned by the returned iteration results.
+
+    Args:
+        exported (List[Tuple[str, float, OrderedDict[str, Union[np.ndarray, str]]]]):
+                The output of `export_iteration_results()`.
+
+    Returns:
+        List[IterationResult]: The iteration results.
+    """
+    def adopt(path):
+        arr = np.load(path, mmap_mode="c", allow_pickle=False).view(np.ndarray)
+        if config.ARRAY_SWAP_THRESHOLD_MB < 0 or arr.nbytes <= (config.ARRAY_SWAP_THRESHOLD_MB << 20):
+            # The mapping keeps the data alive after the file is removed. Changes to the array never reach the file.
+            os.remove(path)
+            return LazyNumpyArray(arr)
+
+        fd, new_path = tempfile.mkstemp(suffix=".npy")
+        os.close(fd)
+        shutil.move(path, new_path)
+        return LazyNumpyArray(path=new_path)
+
+    iteration_results = []
+    for runner_name, runtime, outputs in exported:
+        outputs = OrderedDict((name, adopt(arr) if isinstance(arr, str) else arr) for name, arr in outputs.items())
+        iteration_results.append(IterationResult(outputs=outputs, runtime=runtime, runner_name=runner_name))
+    return iteration_results
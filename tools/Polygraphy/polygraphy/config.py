@@ -35,3 +35,10 @@ A negative value disables swapping and a value of 0 causes all arrays to be save
 Disabled by default.
 This can be configured by setting the 'POLYGRAPHY_ARRAY_SWAP_THRESHOLD_MB' environment variable.
 """
+
+ARRAY_SWAP_CACHE_SIZE = int(os.environ.get("POLYGRAPHY_ARRAY_SWAP_CACHE_SIZE", "8"))
+"""
+The number of recently used arrays that were swapped to disk for which Polygraphy keeps the memory maps open,
+so that repeated accesses do not need to re-open them.
+This can be configured by setting the 'POLYGRAPHY_ARRAY_SWAP_CACHE_SIZE' environment variable.
+"""
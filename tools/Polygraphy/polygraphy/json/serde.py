@@ -14,9 +14,13 @@
 # limitations under the License.
 #
 
+import contextlib
 import functools
 import io
 import json
+import os
+import threading
+import uuid
 from collections import OrderedDict
 
 from polygraphy import config, constants, mod
@@ -161,6 +165,144 @@ class Decoder(BaseCustomImpl):
         return dct
 
 
+ARRAY_DATA_SUFFIX = ".bin"
+"""
+The suffix of the binary file, next to a saved JSON file, that holds the data of any NumPy arrays in the JSON file.
+"""
+
+
+class ArrayDataWriter(object):
+    """
+    Writes the data of NumPy arrays to a binary file, so that the JSON file
+    which references them only needs to store their metadata.
+
+    Arrays are written to a temporary file in the same directory, which only replaces
+    the binary file once ``commit()`` is called. Hence, an existing binary file, which
+    may still be memory-mapped by an ``ArrayDataReader``, is never written to.
+    """
+    def __init__(self, path, alignment=64):
+        """
+        Args:
+            path (str): The path of the binary file. The file is only created once an array is written.
+            alignment (int): The alignment, in bytes, of each array in the file.
+        """
+        self.path = path
+        self.alignment = alignment
+        self.file = None
+
+
+    def commit(self):
+        """
+        Replaces the binary file with the arrays written so far.
+        If no arrays were written, any existing binary file is removed, since it would be stale.
+        """
+        if self.file is not None:
+            self.file.close()
+            os.replace(self.file.name, self.path)
+            self.file = None
+        elif os.path.exists(self.path):
+            os.remove(self.path)
+
+
+    def close(self):
+        """
+        Discards the arrays written since the last call to ``commit()``.
+        """
+        if self.file is not None:
+            self.file.close()
+            os.remove(self.file.name)
+            self.file = None
+
+
+    def write(self, array):
+        """
+        Writes an array to the binary file.
+
+        Args:
+            array (np.ndarray): The array to write.
+
+        Returns:
+            Dict[str, object]: The metadata required to read the array back from the binary file.
+        """
+        if not array.flags["C_CONTIGUOUS"]:
+            array = np.ascontiguousarray(array)
+
+        offset = 0
+        if array.nbytes:
+            if self.file is None:
+                # Not using `tempfile`, which restricts permissions to the owner, unlike `open()`, which respects the umask.
+                self.file = open("{:}.{:}.tmp".format(self.path, uuid.uuid4().hex), "xb")
+
+            offset = self.file.tell()
+            if offset % self.alignment:
+                offset += self.alignment - offset % self.alignment
+                self.file.seek(offset)
+            self.file.write(array.reshape(-1).view(np.uint8))
+
+        return {
+            "file": os.path.basename(self.path),
+            "offset": offset,
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+        }
+
+
+class ArrayDataReader(object):
+    """
+    Reads NumPy arrays written by an ``ArrayDataWriter``.
+    Arrays are memory-mapped rather than read, so only the data which is actually accessed is loaded from the disk.
+    """
+    def __init__(self, dir_path):
+        """
+        Args:
+            dir_path (str): The directory containing the JSON file, relative to which binary files are located.
+        """
+        self.dir_path = dir_path
+        self.mmaps = {}
+
+
+    def read(self, dct):
+        """
+        Reads an array from a binary file.
+
+        Args:
+            dct (Dict[str, object]): The metadata of the array, as returned by ``ArrayDataWriter.write()``.
+
+        Returns:
+            np.ndarray: The array.
+        """
+        dtype = np.dtype(dct["dtype"])
+        shape = tuple(dct["shape"])
+        if not util.volume(shape):
+            return np.empty(shape, dtype=dtype)
+
+        path = os.path.join(self.dir_path, dct["file"])
+        if path not in self.mmaps:
+            # Copy-on-write, so that arrays can be modified without modifying the file.
+            self.mmaps[path] = np.memmap(path, dtype=np.uint8, mode="c")
+
+        mmap = self.mmaps[path]
+        if dct["offset"] + util.volume(shape) * dtype.itemsize > mmap.size:
+            G_LOGGER.critical("Array data file: {:} is truncated. Note: Expected an array of shape: {:} "
+                              "and data type: {:} at offset: {:}".format(path, shape, dtype, dct["offset"]))
+        return np.ndarray(shape, dtype=dtype, buffer=mmap, offset=dct["offset"])
+
+
+# The array writer/reader used by save_json()/load_json() for the current thread, if any.
+ARRAY_DATA = threading.local()
+
+@contextlib.contextmanager
+def use_array_data(writer=None, reader=None):
+    old_writer, old_reader = getattr(ARRAY_DATA, "writer", None), getattr(ARRAY_DATA, "reader", None)
+    ARRAY_DATA.writer = writer
+    ARRAY_DATA.reader = reader
+    try:
+        yield
+    finally:
+        ARRAY_DATA.writer = old_writer
+        ARRAY_DATA.reader = old_reader
+
+
 NUMPY_REGISTRATION_SUCCESS = False
 def try_register_numpy_json(func):
     """
@@ -178,6 +320,11 @@ def try_register_numpy_json(func):
             # imported before we need to encode/decode NumPy arrays.
             @Encoder.register(np.ndarray)
             def encode(array):
+                # Arrays of arbitrary Python objects cannot be stored as raw data.
+                writer = getattr(ARRAY_DATA, "writer", None)
+                if writer is not None and array.dtype.kind not in ["O", "V"]:
+                    return writer.write(array)
+
                 outfile = io.BytesIO()
                 np.savez(outfile, array)
                 outfile.seek(0)
@@ -188,6 +335,13 @@ def try_register_numpy_json(func):
 
             @Decoder.register(np.ndarray)
             def decode(dct):
+                if "array" not in dct:
+                    reader = getattr(ARRAY_DATA, "reader", None)
+                    if reader is None:
+                        G_LOGGER.critical("Cannot decode an array whose data is stored in a separate file. "
+                                          "Please use `load_json()` to load the JSON file instead.")
+                    return reader.read(dct)
+
                 infile = io.BytesIO(dct["array"].encode('latin-1'))
                 # We always encode arrays separately.
                 return list(np.load(infile, allow_pickle=False).values())[0]
@@ -239,13 +393,30 @@ def save_json(obj, dest, description=None):
     """
     Encode an object as JSON and save it to a file.
 
+    When saving to a path, the data of any NumPy arrays is written to a separate binary file,
+    whose path is the provided path with ``ARRAY_DATA_SUFFIX`` appended, and the JSON file only
+    stores the metadata of each array. Both files are required to load the object.
+    The binary file is replaced rather than overwritten, so it is safe to save to the path that
+    an object was loaded from, even though its arrays are memory-mapped from the old binary file.
+
     NOTE: For Polygraphy objects, you should use the ``save()`` method instead.
 
     Args:
         obj (object): The object to save.
         src (Union[str, file-like]): The path or file-like object to save to.
     """
-    util.save_file(to_json(obj), dest, mode="w", description=description)
+    if not isinstance(dest, str):
+        util.save_file(to_json(obj), dest, mode="w", description=description)
+        return
+
+    writer = ArrayDataWriter(dest + ARRAY_DATA_SUFFIX)
+    try:
+        with use_array_data(writer=writer):
+            contents = to_json(obj)
+        writer.commit()
+    finally:
+        writer.close()
+    util.save_file(contents, dest, mode="w", description=description)
 
 
 @mod.export_deprecated_alias("pickle_load", remove_in="0.31.0", use_instead="load_json")
@@ -255,6 +426,9 @@ def load_json(src, description=None):
     """
     Loads a file and decodes the JSON contents.
 
+    The data of any NumPy arrays stored in a separate binary file (see ``save_json()``)
+    is memory-mapped, so that only the data which is actually accessed is read from the disk.
+
     NOTE: For Polygraphy objects, you should use the ``load()`` method instead.
 
     Args:
@@ -263,8 +437,14 @@ def load_json(src, description=None):
     Returns:
         object: The object, or `None` if nothing could be read.
     """
+    reader = None
+    if isinstance(src, str):
+        reader = ArrayDataReader(os.path.dirname(src))
+
     try:
-        return from_json(util.load_file(src, mode="r", description=description))
+        contents = util.load_file(src, mode="r", description=description)
+        with use_array_data(reader=reader):
+            return from_json(contents)
     except UnicodeDecodeError:
         # This is a pickle file from Polygraphy 0.26.1 or older.
         mod.warn_deprecated("pickle", use_instead="JSON", remove_in="0.31.0")
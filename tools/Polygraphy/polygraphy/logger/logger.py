@@ -17,6 +17,7 @@ import enum
 import inspect
 import os
 import sys
+import threading
 import time
 import traceback
 
@@ -64,6 +65,26 @@ class LoggerVerbosity(object):
         self.logger.severity = self.old_severity
 
 
+# Context manager to buffer messages logged by the current thread
+class LoggerCapture(object):
+    def __init__(self, logger):
+        self.logger = logger
+        self.messages = []
+
+    def __enter__(self):
+        state = self.logger._thread_state
+        self.old_state = (getattr(state, "messages", None), getattr(state, "logging_indent", None))
+        state.messages = self.messages
+        state.logging_indent = 0
+        return self.messages
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        state = self.logger._thread_state
+        state.messages, state.logging_indent = self.old_state
+        if state.messages is None:
+            del state.messages, state.logging_indent
+
+
 class LogMode(enum.IntEnum):
     """
     Specifies how messages should be logged.
@@ -139,7 +160,8 @@ class Logger(object):
         self._severity = severity
         self._log_path = None
         self._log_file = None
-        self.logging_indent = 0
+        self._logging_indent = 0
+        self._thread_state = threading.local()
         self.root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir,  os.pardir))
         self.once_logged = set()
         self.colors = colors
@@ -164,6 +186,21 @@ class Logger(object):
         self._log_file = open(self._log_path, "w")
 
 
+    @property
+    def logging_indent(self):
+        # Threads that are capturing messages track their own indentation, relative to that of the
+        # thread which eventually replays the messages.
+        return getattr(self._thread_state, "logging_indent", self._logging_indent)
+
+
+    @logging_indent.setter
+    def logging_indent(self, value):
+        if hasattr(self._thread_state, "logging_indent"):
+            self._thread_state.logging_indent = value
+        else:
+            self._logging_indent = value
+
+
     @property
     def severity(self):
         return self._severity
@@ -231,56 +268,39 @@ class Logger(object):
         """
         from polygraphy import constants, config
 
-        def process_message(message, stack_depth):
-            def get_prefix():
-                def get_line_info():
-                    adjusted_stack_depth = stack_depth
-                    adjusted_stack_depth += 2
+        def get_prefix():
+            def get_line_info():
+                adjusted_stack_depth = stack_depth
+                adjusted_stack_depth += 1
+                module = inspect.getmodule(sys._getframe(adjusted_stack_depth))
+                # Handle logging from the top-level of a module.
+                if not module:
+                    adjusted_stack_depth -= 1
                     module = inspect.getmodule(sys._getframe(adjusted_stack_depth))
-                    # Handle logging from the top-level of a module.
-                    if not module:
-                        adjusted_stack_depth -= 1
-                        module = inspect.getmodule(sys._getframe(adjusted_stack_depth))
-                    filename = module.__file__
-                    filename = os.path.relpath(filename, self.root_dir)
-                    # If the file is not located in polygraphy, use its basename instead.
-                    if os.pardir in filename:
-                        filename = os.path.basename(filename)
-                    return "[{:}:{:}] ".format(filename, sys._getframe(adjusted_stack_depth).f_lineno)
-
-                prefix = ""
-                if self.letter:
-                    prefix += Logger.SEVERITY_LETTER_MAPPING[severity] + " "
-                if self.timestamp:
-                    prefix += "({:}) ".format(time.strftime("%X"))
-                if self.line_info:
-                    prefix += get_line_info()
-                return prefix
-
-
-            def apply_indentation(prefix, message):
-                message_lines = str(message).splitlines()
-                tab = constants.TAB * self.logging_indent
-                newline_tab = "\n" + tab + " " * len(prefix)
-                return tab + newline_tab.join([line for line in message_lines])
-
-
-            def apply_color(message):
-                if self.colors and has_colors():
-                    import colored
-                    color = Logger.SEVERITY_COLOR_MAPPING[severity]
-                    return colored.stylize(message, [colored.fg(color)]) if color else message
-                return message
-
-
-            prefix = get_prefix()
-            message = apply_indentation(prefix, message)
-            return apply_color("{:}{:}".format(prefix, message))
-
+                filename = module.__file__
+                filename = os.path.relpath(filename, self.root_dir)
+                # If the file is not located in polygraphy, use its basename instead.
+                if os.pardir in filename:
+                    filename = os.path.basename(filename)
+                return "[{:}:{:}] ".format(filename, sys._getframe(adjusted_stack_depth).f_lineno)
+
+            prefix = ""
+            if self.letter:
+                prefix += Logger.SEVERITY_LETTER_MAPPING[severity] + " "
+            if self.timestamp:
+                prefix += "({:}) ".format(time.strftime("%X"))
+            if self.line_info:
+                prefix += get_line_info()
+            return prefix
+
+
+        # Messages logged with LogMode.ONCE are deduplicated when they are emitted, so that
+        # captured messages are deduplicated in the order in which they are replayed.
+        capturing = getattr(self._thread_state, "messages", None) is not None
 
         def should_log(message):
             should = severity >= self._severity
-            if should and mode == LogMode.ONCE:
+            if should and mode == LogMode.ONCE and not capturing:
                 message_hash = hash(message)
                 should &= message_hash not in self.once_logged
                 self.once_logged.add(message_hash)
@@ -290,6 +310,8 @@ class Logger(object):
         if not should_log(message):
             return
 
+        once_hash = hash(message) if mode == LogMode.ONCE and capturing else None
+
         if callable(message):
             try:
                 message = message()
@@ -307,8 +329,40 @@ class Logger(object):
             import warnings
             warnings.warn(message)
 
+        self._emit((get_prefix(), message, severity, self.logging_indent, once_hash))
+
+
+    def _emit(self, record):
+        messages = getattr(self._thread_state, "messages", None)
+        if messages is not None:
+            messages.append(record)
+            return
+
+        prefix, message, severity, indent, once_hash = record
+        if once_hash is not None:
+            if once_hash in self.once_logged:
+                return
+            self.once_logged.add(once_hash)
+
+        def apply_indentation(prefix, message):
+            from polygraphy import constants
+
+            message_lines = str(message).splitlines()
+            tab = constants.TAB * indent
+            newline_tab = "\n" + tab + " " * len(prefix)
+            return tab + newline_tab.join([line for line in message_lines])
+
+
+        def apply_color(message):
+            if self.colors and has_colors():
+                import colored
+                color = Logger.SEVERITY_COLOR_MAPPING[severity]
+                return colored.stylize(message, [colored.fg(color)]) if color else message
+            return message
+
+
+        message = apply_color("{:}{:}".format(prefix, apply_indentation(prefix, message)))
         file = sys.stdout if severity < Logger.WARNING else sys.stderr
-        message = process_message(message, stack_depth=stack_depth)
 
         if self._log_file is not None:
             self._log_file.write(message + "\n")
@@ -317,6 +371,31 @@ class Logger(object):
         print(message, file=file)
 
 
+    def capture(self):
+        """
+        Returns a context manager that buffers the messages logged by the current thread
+        instead of emitting them. This makes it possible to log from multiple threads
+        while still emitting the messages in a deterministic order.
+
+        The context manager returns a list, which will contain the buffered messages.
+        Messages are indented relative to the indentation in effect when they are replayed.
+        Use ``replay()`` to emit them.
+        """
+        return LoggerCapture(self)
+
+
+    def replay(self, messages):
+        """
+        Emits messages that were buffered by ``capture()``, as though they had been
+        logged by the current thread.
+
+        Args:
+            messages (List): The messages returned by ``capture()``.
+        """
+        for prefix, message, severity, indent, once_hash in messages:
+            self._emit((prefix, message, severity, self.logging_indent + indent, once_hash))
+
+
     def backtrace(self, depth=0, limit=None, severity=ERROR):
         limit = limit if limit is not None else (3 - self.severity // 10) * 2 # Info provides 1 stack frame
         limit = max(limit, 0)
@@ -85,8 +85,14 @@ def lazy_import(name, log=True, version=None):
     if "polygraphy" not in name:
         _all_external_lazy_imports.add(name)
 
+    # The module, once it has been imported successfully.
+    imported_mod = None
 
     def import_mod():
+        nonlocal imported_mod
+        if imported_mod is not None:
+            return imported_mod
+
         from polygraphy import config
         from polygraphy.logger import G_LOGGER, LogMode
 
@@ -140,6 +146,7 @@ def lazy_import(name, log=True, version=None):
         if log:
             G_LOGGER.module_info(mod)
 
+        imported_mod = mod
         return mod
 
     class LazyModule(object):
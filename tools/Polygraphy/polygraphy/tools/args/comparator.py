@@ -35,12 +35,34 @@ class ComparatorRunArgs(BaseArgs):
             comparator_args.add_argument("--warm-up", metavar="NUM", help="Number of warm-up runs before timing inference", type=int, default=None)
             comparator_args.add_argument("--use-subprocess", help="Run runners in isolated subprocesses. Cannot be used with a debugger",
                                          action="store_true", default=None)
+            comparator_args.add_argument("--input-memory-limit", metavar="MIB", help="The maximum amount of input data, in MiB, to keep in memory. "
+                                         "Iterations beyond the limit are spilled to a temporary directory and memory-mapped when used. "
+                                         "With --use-subprocess, subprocesses always load input data from the disk. "
+                                         "Defaults to keeping all input data in memory", type=float, default=None)
+            comparator_args.add_argument("--concurrent-runners", help="Run runners which do not share any resources, like the CPU or GPU, "
+                                         "concurrently. The results are the same as when running them sequentially",
+                                         action="store_true", default=None, dest="concurrent")
+            comparator_args.add_argument("--benchmark", help="After running inference, benchmark each runner with the first input, "
+                                         "and report the throughput and the mean, median, p90, p99 and maximum latencies",
+                                         action="store_true", default=None)
+            comparator_args.add_argument("--benchmark-warm-up", metavar="NUM", help="Number of untimed inferences to run "
+                                         "before benchmarking each runner. Defaults to 1", type=int, default=None)
+            comparator_args.add_argument("--benchmark-iterations", metavar="NUM", help="Number of inferences to time for each runner. "
+                                         "Defaults to 100", type=int, default=None)
+            comparator_args.add_argument("--benchmark-duration", metavar="SECONDS", help="Benchmark each runner for at least this "
+                                         "many seconds, instead of for a fixed number of iterations", type=float, default=None)
+            comparator_args.add_argument("--benchmark-threads", metavar="NUM", help="Number of threads from which to run inference "
+                                         "concurrently while benchmarking. Defaults to 1", type=int, default=None)
         if self._write:
             comparator_args.add_argument("--save-inputs", "--save-input-data", help="[EXPERIMENTAL] Path to save inference inputs. "
-                                         "The inputs (List[Dict[str, numpy.ndarray]]) will be encoded as JSON and saved",
+                                         "The inputs (List[Dict[str, numpy.ndarray]]) will be encoded as JSON and saved, "
+                                         "with the array data stored in a binary file next to it, with a '.bin' suffix",
                                          default=None, dest="save_inputs")
             comparator_args.add_argument("--save-outputs", "--save-results", help="Path to save results from runners. "
-                                         "The results (RunResults) will be encoded as JSON and saved", default=None, dest="save_results")
+                                         "The results (RunResults) will be encoded as JSON and saved, with the array data stored "
+                                         "in a binary file next to it, with a '.bin' suffix", default=None, dest="save_results")
+            comparator_args.add_argument("--save-benchmark", help="Path to save benchmark results (BenchmarkResults) from --benchmark, "
+                                         "encoded as JSON", default=None)
 
     def register(self, maker):
         from polygraphy.tools.args.data_loader import DataLoaderArgs
@@ -56,8 +78,16 @@ class ComparatorRunArgs(BaseArgs):
     def parse(self, args):
         self.warm_up = args_util.get(args, "warm_up")
         self.use_subprocess = args_util.get(args, "use_subprocess")
+        self.input_memory_limit = args_util.get(args, "input_memory_limit")
+        self.concurrent = args_util.get(args, "concurrent")
         self.save_inputs = args_util.get(args, "save_inputs")
         self.save_results = args_util.get(args, "save_results")
+        self.benchmark = args_util.get(args, "benchmark")
+        self.benchmark_warm_up = args_util.get(args, "benchmark_warm_up")
+        self.benchmark_iterations = args_util.get(args, "benchmark_iterations")
+        self.benchmark_duration = args_util.get(args, "benchmark_duration")
+        self.benchmark_threads = args_util.get(args, "benchmark_threads")
+        self.save_benchmark = args_util.get(args, "save_benchmark")
 
 
     def add_to_script(self, script):
@@ -68,7 +98,9 @@ class ComparatorRunArgs(BaseArgs):
         comparator_run = make_invocable("Comparator.run", script.get_runners(), warm_up=self.warm_up,
                                     data_loader=self.data_loader_args.add_to_script(script),
                                     use_subprocess=self.use_subprocess,
-                                    save_inputs_path=self.save_inputs)
+                                    save_inputs_path=self.save_inputs,
+                                    input_memory_limit_mb=self.input_memory_limit,
+                                    concurrent=self.concurrent)
         script.append_suffix(safe("\n# Runner Execution\n{results} = {:}", comparator_run, results=RESULTS_VAR_NAME))
 
         if self.save_results:
@@ -76,6 +108,20 @@ class ComparatorRunArgs(BaseArgs):
             script.add_import(imports=["util"], frm="polygraphy")
             script.append_suffix(safe("\n# Save results\n{results}.save({:})", self.save_results, results=RESULTS_VAR_NAME))
 
+        if self.benchmark or self.save_benchmark:
+            BENCHMARK_RESULTS_VAR_NAME = inline(safe("benchmark_results"))
+            comparator_benchmark = make_invocable("Comparator.benchmark", script.get_runners(),
+                                                  data_loader=self.data_loader_args.add_to_script(script),
+                                                  warm_up=self.benchmark_warm_up, iterations=self.benchmark_iterations,
+                                                  duration=self.benchmark_duration, threads=self.benchmark_threads)
+            script.append_suffix(safe("\n# Benchmarking\n{benchmark_results} = {:}", comparator_benchmark,
+                                      benchmark_results=BENCHMARK_RESULTS_VAR_NAME))
+
+            if self.save_benchmark:
+                G_LOGGER.verbose("Will save benchmark results to: {:}".format(self.save_benchmark))
+                script.append_suffix(safe("\n# Save benchmark results\n{benchmark_results}.save({:})", self.save_benchmark,
+                                          benchmark_results=BENCHMARK_RESULTS_VAR_NAME))
+
         return RESULTS_VAR_NAME
 
 
@@ -112,6 +158,12 @@ class ComparatorCompareArgs(BaseArgs):
                                      "the value is used for any outputs not explicitly specified. For example: "
                                      "--check-error-stat max out0:mean out1:median",
                                      nargs="+", default=None)
+        comparator_args.add_argument("--fused-error-stats", help="Compute error statistics in chunks, in a few passes over the outputs, "
+                                     "instead of materializing the differences between them. This bounds memory usage and is faster for large outputs",
+                                     action="store_true", default=None)
+        comparator_args.add_argument("--compare-workers", metavar="NUM", help="Number of threads to use to compare outputs. "
+                                     "Iterations and outputs are compared concurrently, but results are still reported in order. "
+                                     "Defaults to 1", type=int, default=None)
 
         if self._load:
             comparator_args.add_argument("--load-outputs", "--load-results", help="Path(s) to load results from runners prior to comparing. "
@@ -127,6 +179,8 @@ class ComparatorCompareArgs(BaseArgs):
         self.fail_fast = args_util.get(args, "fail_fast")
         self.top_k = args_util.parse_dict_with_default(args_util.get(args, "top_k"))
         self.check_error_stat = args_util.parse_dict_with_default(args_util.get(args, "check_error_stat"))
+        self.fused_error_stats = args_util.get(args, "fused_error_stats")
+        self.compare_workers = args_util.get(args, "compare_workers")
         if self.check_error_stat:
             VALID_CHECK_ERROR_STATS = ["max", "mean", "median", "elemwise"]
             for stat in self.check_error_stat.values():
@@ -161,7 +215,8 @@ class ComparatorCompareArgs(BaseArgs):
 
             compare_func_str = make_invocable_if_nondefault("CompareFunc.basic_compare_func", rtol=self.rtol, atol=self.atol,
                                                            check_shapes=False if self.no_shape_check else None,
-                                                           fail_fast=self.fail_fast, check_error_stat=self.check_error_stat)
+                                                           fail_fast=self.fail_fast, check_error_stat=self.check_error_stat,
+                                                           fused_stats=self.fused_error_stats)
             compare_func = None
             if compare_func_str:
                 script.add_import(imports=["CompareFunc"], frm="polygraphy.comparator")
@@ -169,7 +224,7 @@ class ComparatorCompareArgs(BaseArgs):
                 script.append_suffix(safe("{:} = {:}", compare_func, compare_func_str))
 
             compare_accuracy = make_invocable("Comparator.compare_accuracy", results_name, compare_func=compare_func,
-                                             fail_fast=self.fail_fast)
+                                             fail_fast=self.fail_fast, workers=self.compare_workers)
             script.append_suffix(safe("{success} &= bool({:})\n", compare_accuracy, success=SUCCESS_VAR_NAME))
         if self.validate:
             script.append_suffix(safe("# Validation\n{success} &= Comparator.validate({results}, check_inf=True, check_nan=True)\n",
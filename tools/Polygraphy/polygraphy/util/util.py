@@ -376,6 +376,7 @@ def try_send_on_queue(queue, obj):
         queue.put(None)
 
 
+@mod.export()
 def receive_on_queue(queue, timeout=None):
     G_LOGGER.extra_verbose("Waiting for data to become available on queue")
     obj = queue.get(block=True, timeout=timeout)
@@ -26,3 +26,34 @@ def test_infer_raises_if_runner_inactive():
 
     with pytest.raises(PolygraphyException, match="Must be activated"):
         runner.infer(feed_dict)
+
+
+class TestBenchmark(object):
+    @pytest.mark.parametrize("threads", [1, 2])
+    def test_iterations(self, threads):
+        feed_dict = {"x": np.ones((1, 1, 2, 2), dtype=np.float32)}
+        with OnnxrtRunner(SessionFromOnnx(ONNX_MODELS["identity"].loader)) as runner:
+            result = runner.benchmark(feed_dict, warm_up=2, iterations=50, threads=threads)
+
+        assert result.iterations == 50
+        assert result.threads == threads
+        assert result.runner_name == runner.name
+        assert np.all(result.latencies_ns > 0)
+        assert result.latency(50) <= result.latency(99) <= result.latency(100)
+        assert result.throughput > 0
+
+
+    def test_duration(self):
+        feed_dict = {"x": np.ones((1, 1, 2, 2), dtype=np.float32)}
+        with OnnxrtRunner(SessionFromOnnx(ONNX_MODELS["identity"].loader)) as runner:
+            result = runner.benchmark(feed_dict, duration=0.1)
+        assert result.iterations > 0
+        assert result.total_time_ns >= 0.1e9
+
+
+    def test_threads_require_concurrent_inference_support(self):
+        feed_dict = {"x": np.ones((1, 1, 2, 2), dtype=np.float32)}
+        with OnnxrtRunner(SessionFromOnnx(ONNX_MODELS["identity"].loader)) as runner:
+            runner.SUPPORTS_CONCURRENT_INFERENCE = False
+            with pytest.raises(PolygraphyException, match="Does not support running inference from multiple threads"):
+                runner.benchmark(feed_dict, threads=2)
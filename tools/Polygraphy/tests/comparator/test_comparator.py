@@ -14,23 +14,55 @@
 # limitations under the License.
 #
 import subprocess as sp
+import time
+import weakref
+from collections import OrderedDict
 
 import numpy as np
 import pytest
 import tensorrt as trt
+from polygraphy.backend.base import BaseRunner
 from polygraphy.backend.onnx import BytesFromOnnx, OnnxFromTfGraph
 from polygraphy.backend.onnxrt import OnnxrtRunner, SessionFromOnnx
 from polygraphy.backend.tf import SessionFromGraph, TfRunner
 from polygraphy.backend.trt import (EngineFromNetwork, NetworkFromOnnxBytes,
                                     TrtRunner)
+from polygraphy.common import TensorMetadata
 from polygraphy.exception import PolygraphyException
 from polygraphy.comparator import (Comparator, CompareFunc, DataLoader,
                                    IterationResult, PostprocessFunc,
                                    RunResults)
-from polygraphy import mod
+from polygraphy import config, mod
+from polygraphy.comparator import util as comp_util
 from tests.models.meta import ONNX_MODELS, TF_MODELS
 
 
+# Records when it ran inference, and optionally fails during inference.
+class RecordingRunner(BaseRunner):
+    def __init__(self, name, resources, delay=0.2, fail=False):
+        super().__init__(name=name)
+        self.resources = resources
+        self.delay = delay
+        self.fail = fail
+        self.start = None
+        self.end = None
+
+
+    def get_input_metadata_impl(self):
+        return TensorMetadata().add("x", dtype=np.float32, shape=(2, 2))
+
+
+    def infer_impl(self, feed_dict):
+        if self.start is None:
+            self.start = time.time()
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("Inference failed")
+        self.inference_time = self.delay
+        self.end = time.time()
+        return OrderedDict(y=feed_dict["x"] * 2)
+
+
 class TestComparator(object):
     def test_warmup_runs(self):
         onnx_loader = ONNX_MODELS["identity"].loader
@@ -96,6 +128,32 @@ class TestComparator(object):
                     assert output.shape == (1, 1, 2, 1)
 
 
+    @pytest.mark.parametrize("input_memory_limit_mb", [None, 0])
+    def test_subprocess_inputs_from_disk(self, input_memory_limit_mb):
+        onnx_loader = ONNX_MODELS["identity"].loader
+        runners = [OnnxrtRunner(SessionFromOnnx(onnx_loader), name="onnxrt0"), OnnxrtRunner(SessionFromOnnx(onnx_loader), name="onnxrt1")]
+        run_results = Comparator.run(runners, data_loader=DataLoader(iterations=3), use_subprocess=True,
+                                     input_memory_limit_mb=input_memory_limit_mb)
+        assert bool(Comparator.compare_accuracy(run_results))
+        assert len(run_results["onnxrt0"]) == 3
+
+
+    @pytest.mark.parametrize("swap_threshold_mb", [-1, 0])
+    def test_subprocess_outputs_from_disk(self, swap_threshold_mb, monkeypatch):
+        monkeypatch.setattr(comp_util, "SHARED_ARRAY_MIN_BYTES", 0)
+        # Swapped outputs could previously not be sent over the queue.
+        monkeypatch.setattr(config, "ARRAY_SWAP_THRESHOLD_MB", swap_threshold_mb)
+
+        runners = [OnnxrtRunner(SessionFromOnnx(ONNX_MODELS["identity"].loader))]
+        run_results = Comparator.run(runners, data_loader=DataLoader(iterations=2), use_subprocess=True)
+        expected = Comparator.run(runners, data_loader=DataLoader(iterations=2))
+        for iter_result, expected_iter_result in zip(list(run_results.values())[0], list(expected.values())[0]):
+            # Outputs are only read-only when they would be swapped to the disk anyway.
+            assert (iter_result.dct["y"].path is not None) == (swap_threshold_mb >= 0)
+            assert iter_result["y"].flags["WRITEABLE"] == (swap_threshold_mb < 0)
+            assert np.array_equal(iter_result["y"], expected_iter_result["y"])
+
+
     def test_errors_do_not_hang(self):
         # Should error because interface is not implemented correctly.
         class FakeRunner(object):
@@ -142,6 +200,143 @@ class TestComparator(object):
         assert not Comparator.validate(run_results, check_inf=True)
 
 
+    def test_run_and_compare(self):
+        onnx_loader = ONNX_MODELS["identity"].loader
+        runners = [OnnxrtRunner(SessionFromOnnx(onnx_loader), name="onnx_runner{:}".format(index)) for index in range(3)]
+
+        accuracy_result = Comparator.run_and_compare(runners, data_loader=DataLoader(iterations=3), warm_up=1)
+        expected = Comparator.compare_accuracy(Comparator.run(runners, data_loader=DataLoader(iterations=3)))
+        assert bool(accuracy_result)
+        assert list(accuracy_result.keys()) == list(expected.keys())
+        for runner_pair in expected.keys():
+            assert accuracy_result.stats(runner_pair) == expected.stats(runner_pair)
+
+
+    def test_run_and_compare_fail_fast(self):
+        onnx_loader = ONNX_MODELS["identity"].loader
+        runners = [OnnxrtRunner(SessionFromOnnx(onnx_loader)), OnnxrtRunner(SessionFromOnnx(onnx_loader))]
+
+        accuracy_result = Comparator.run_and_compare(runners, data_loader=DataLoader(iterations=3), fail_fast=True,
+                                                     compare_func=lambda result0, result1: {"y": False})
+        assert accuracy_result.stats() == (0, 1, 1)
+
+
+    def test_run_and_compare_does_not_retain_outputs(self):
+        onnx_loader = ONNX_MODELS["identity"].loader
+        runners = [OnnxrtRunner(SessionFromOnnx(onnx_loader)), OnnxrtRunner(SessionFromOnnx(onnx_loader))]
+
+        result_refs = []
+        def postprocess_func(iter_result):
+            # Results from previous iterations should have been released by now.
+            assert all(ref() is None for ref in result_refs[:-1])
+            result_refs.append(weakref.ref(iter_result))
+            return iter_result
+
+        accuracy_result = Comparator.run_and_compare(runners, data_loader=DataLoader(iterations=4), postprocess_func=postprocess_func)
+        assert accuracy_result.stats() == (4, 0, 4)
+        assert len(result_refs) == 8
+        # Only the number of matching iterations is kept.
+        assert accuracy_result[(runners[0].name, runners[1].name)] == []
+
+
+    @pytest.mark.parametrize("keep_match_dicts", [False, True])
+    def test_run_and_compare_keep_match_dicts(self, keep_match_dicts):
+        onnx_loader = ONNX_MODELS["identity"].loader
+        runners = [OnnxrtRunner(SessionFromOnnx(onnx_loader)), OnnxrtRunner(SessionFromOnnx(onnx_loader))]
+
+        matches = iter([True, False, True])
+        accuracy_result = Comparator.run_and_compare(runners, data_loader=DataLoader(iterations=3), keep_match_dicts=keep_match_dicts,
+                                                     compare_func=lambda result0, result1: {"y": next(matches)})
+        assert accuracy_result.stats() == (2, 1, 3)
+        assert accuracy_result.percentage() == 2.0 / 3.0
+        assert not accuracy_result
+        assert len(accuracy_result[(runners[0].name, runners[1].name)]) == (3 if keep_match_dicts else 0)
+
+
+    @pytest.mark.parametrize("fail_fast", [False, True])
+    def test_compare_accuracy_workers(self, fail_fast, capsys):
+        np.random.seed(0)
+        run_results = RunResults()
+        for runner_index in range(3):
+            run_results["runner{:}".format(runner_index)] = [
+                IterationResult(outputs={"output{:}".format(index): np.random.standard_normal((32, 32)).astype(np.float32) * (runner_index == 1)
+                                         for index in range(4)}) for _ in range(3)
+            ]
+
+        comparisons = [(0, 1), (1, 2), (0, 0)]
+        expected = Comparator.compare_accuracy(run_results, fail_fast=fail_fast, comparisons=comparisons)
+        expected_log = capsys.readouterr()
+
+        accuracy_result = Comparator.compare_accuracy(run_results, fail_fast=fail_fast, comparisons=comparisons, workers=4)
+        assert capsys.readouterr() == expected_log
+        assert list(accuracy_result.keys()) == list(expected.keys())
+        for runner_pair in expected.keys():
+            assert accuracy_result.stats(runner_pair) == expected.stats(runner_pair)
+            for iter_match_dict, expected_match_dict in zip(accuracy_result[runner_pair], expected[runner_pair]):
+                assert list(iter_match_dict.keys()) == list(expected_match_dict.keys())
+                assert [bool(match) for match in iter_match_dict.values()] == [bool(match) for match in expected_match_dict.values()]
+
+
+    def test_compare_accuracy_workers_propagates_errors(self):
+        run_results = RunResults()
+        run_results["runner0"] = [IterationResult(outputs={"x": np.ones((1, ))})]
+        run_results["runner1"] = [IterationResult(outputs={"x": np.ones((1, ))})]
+
+        compare_func = CompareFunc.basic_compare_func(find_output_func=lambda name, index, iter_result: None)
+        with pytest.raises(PolygraphyException, match="All outputs were skipped"):
+            Comparator.compare_accuracy(run_results, compare_func=compare_func, workers=2)
+
+
+    @pytest.mark.parametrize("use_subprocess", [False, True])
+    def test_concurrent_matches_sequential(self, use_subprocess):
+        def make_runners():
+            runners = [OnnxrtRunner(SessionFromOnnx(ONNX_MODELS["identity"].loader), name="onnxrt{:}".format(index)) for index in range(3)]
+            for index, runner in enumerate(runners):
+                runner.resources = {"resource{:}".format(index)}
+            return runners
+
+        expected = Comparator.run(make_runners(), data_loader=DataLoader(iterations=3))
+        run_results = Comparator.run(make_runners(), data_loader=DataLoader(iterations=3), use_subprocess=use_subprocess, concurrent=True)
+
+        assert list(run_results.keys()) == list(expected.keys())
+        for (_, results), (_, expected_results) in zip(run_results, expected):
+            assert len(results) == len(expected_results)
+            for iter_result, expected_iter_result in zip(results, expected_results):
+                assert iter_result.runner_name == expected_iter_result.runner_name
+                assert all(np.array_equal(iter_result[name], expected_iter_result[name]) for name in expected_iter_result.keys())
+
+
+    def test_concurrent_respects_resources(self):
+        runners = [RecordingRunner("runner0", {"gpu"}), RecordingRunner("runner1", {"cpu"}), RecordingRunner("runner2", {"gpu", "cpu"})]
+        run_results = Comparator.run(runners, concurrent=True)
+        assert list(run_results.keys()) == ["runner0", "runner1", "runner2"]
+
+        # The first two runners do not share any resources.
+        assert runners[1].start < runners[0].end and runners[0].start < runners[1].end
+        assert runners[2].start >= max(runners[0].end, runners[1].end)
+
+
+    def test_concurrent_runners_without_resources_are_sequential(self):
+        runners = [RecordingRunner("runner0", {"gpu"}), RecordingRunner("runner1", None)]
+        Comparator.run(runners, concurrent=True)
+        assert runners[1].start >= runners[0].end
+
+
+    def test_concurrent_propagates_errors(self):
+        runners = [RecordingRunner("runner0", {"gpu"}), RecordingRunner("runner1", {"cpu"}, fail=True), RecordingRunner("runner2", {"cpu"})]
+        with pytest.raises(RuntimeError, match="Inference failed"):
+            Comparator.run(runners, concurrent=True)
+        # Runners which depend on a failed runner are not run.
+        assert runners[2].start is None
+
+
+    def test_benchmark(self):
+        runners = [OnnxrtRunner(SessionFromOnnx(ONNX_MODELS["identity"].loader), name="onnxrt{:}".format(index)) for index in range(2)]
+        benchmark_results = Comparator.benchmark(runners, iterations=10)
+        assert list(benchmark_results.keys()) == ["onnxrt0", "onnxrt1"]
+        assert all(result.iterations == 10 for result in benchmark_results.values())
+
+
     def test_dim_param_trt_onnxrt(self):
         load_onnx_bytes = ONNX_MODELS["dim_param"].loader
         build_onnxrt_session = SessionFromOnnx(load_onnx_bytes)
@@ -13,6 +13,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import pytest
 from polygraphy import util
@@ -208,3 +212,64 @@ class TestBasicCompareFunc(object):
 
         with pytest.raises(PolygraphyException, match="Invalid choice"):
             CompareFunc.basic_compare_func(check_error_stat="invalid-stat")(res0, res1)
+
+
+    def test_does_not_retain_iteration_results(self):
+        compare_func = CompareFunc.basic_compare_func()
+        res0 = IterationResult(outputs={"output": np.ones((4, 4), dtype=np.float32)})
+        res1 = IterationResult(outputs={"output": np.ones((4, 4), dtype=np.float32)})
+        assert compare_func(res0, res1)["output"]
+
+        refs = [weakref.ref(res0), weakref.ref(res1)]
+        del res0, res1
+        assert all(ref() is None for ref in refs)
+
+        # The outputs of the first iteration should not affect later iterations.
+        res0 = IterationResult(outputs={"output_renamed": np.ones((4, 4), dtype=np.float32)})
+        res1 = IterationResult(outputs={"output": np.ones((4, 4), dtype=np.float32)})
+        assert compare_func(res0, res1)["output_renamed"]
+
+
+    @pytest.mark.parametrize("check_error_stat", ["max", "mean", "median", "elemwise"])
+    def test_fused_stats(self, check_error_stat):
+        np.random.seed(0)
+        out0 = np.random.standard_normal((64, 64)).astype(np.float32)
+        res0 = IterationResult(outputs={"output": out0})
+        res1 = IterationResult(outputs={"output": out0 + np.random.uniform(0, 1e-3, size=out0.shape).astype(np.float32)})
+
+        for atol in [1e-5, 1e-2]:
+            default = CompareFunc.basic_compare_func(check_error_stat=check_error_stat, atol=atol, rtol=0)(res0, res1)["output"]
+            fused = CompareFunc.basic_compare_func(check_error_stat=check_error_stat, atol=atol, rtol=0, fused_stats=True)(res0, res1)["output"]
+
+            assert bool(default) == bool(fused)
+            for stat in ["max_absdiff", "max_reldiff", "median_absdiff", "median_reldiff"]:
+                assert getattr(default, stat) == getattr(fused, stat)
+            for stat in ["mean_absdiff", "mean_reldiff"]:
+                assert np.isclose(getattr(default, stat), getattr(fused, stat))
+
+
+    def test_fused_stats_bool(self):
+        iter_result0 = IterationResult(outputs={"output": np.zeros((4, 4), dtype=np.bool_)})
+        iter_result1 = IterationResult(outputs={"output": np.ones((4, 4), dtype=np.bool_)})
+        assert not CompareFunc.basic_compare_func(fused_stats=True)(iter_result0, iter_result1)["output"]
+        assert CompareFunc.basic_compare_func(fused_stats=True)(iter_result0, iter_result0)["output"]
+
+
+    @pytest.mark.parametrize("fail_fast", [False, True])
+    def test_executor(self, fail_fast, capsys):
+        np.random.seed(0)
+        outputs = OrderedDict(("output{:}".format(index), np.random.standard_normal((16, 16)).astype(np.float32)) for index in range(8))
+        iter_result0 = IterationResult(outputs=outputs)
+        iter_result1 = IterationResult(outputs=OrderedDict((name, out + (index % 3 == 2)) for index, (name, out) in enumerate(outputs.items())))
+
+        compare_func = CompareFunc.basic_compare_func(fail_fast=fail_fast)
+        expected = compare_func(iter_result0, iter_result1)
+        expected_log = capsys.readouterr()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            acc = compare_func(iter_result0, iter_result1, executor=executor)
+
+        assert capsys.readouterr() == expected_log
+        assert list(acc.keys()) == list(expected.keys())
+        assert [bool(match) for match in acc.values()] == [bool(match) for match in expected.values()]
+        assert [match.max_absdiff for match in acc.values()] == [match.max_absdiff for match in expected.values()]
@@ -13,12 +13,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import os
+import pickle
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 from polygraphy.common import TensorMetadata
 from polygraphy.comparator import DataLoader
 from polygraphy.comparator.data_loader import DataLoaderCache
+from polygraphy.exception import PolygraphyException
 from tests.models.meta import ONNX_MODELS
 import pytest
 
@@ -148,6 +152,46 @@ class TestDataLoader(object):
         assert feed_dict["X"].shape == (3, ) # Treat as a normal tensor
 
 
+    @pytest.mark.parametrize("dtype", [np.int32, np.bool_, np.float16, np.float32, np.float64])
+    @pytest.mark.parametrize("reuse_buffers", [False, True])
+    def test_bit_generator(self, dtype, reuse_buffers):
+        input_meta = meta(dtype).add("Z", dtype=dtype, shape=())
+        data_loader = DataLoader(input_metadata=input_meta, iterations=3, val_range=(-2, 2),
+                                 bit_generator="PCG64", reuse_buffers=reuse_buffers)
+        stacked = data_loader.stacked()
+        other_data_loader = DataLoader(input_metadata=input_meta, iterations=3, val_range=(-2, 2), bit_generator="pcg64")
+
+        for index in range(3):
+            feed_dict = data_loader[index]
+            # Data must only depend on the seed and index
+            assert all(np.array_equal(buffer, other_data_loader[index][name]) for name, buffer in feed_dict.items())
+            for name, buffer in feed_dict.items():
+                assert buffer.dtype == dtype
+                assert buffer.shape == input_meta[name].shape
+                assert np.all((buffer >= -2) & (buffer <= 2))
+                assert np.array_equal(stacked[name][index], buffer)
+
+        assert not np.array_equal(np.copy(data_loader[0]["X"]), data_loader[1]["X"]) or dtype == np.bool_
+        assert not np.array_equal(data_loader[0]["X"], DataLoader(input_metadata=input_meta, seed=2, bit_generator="PCG64")[0]["X"])
+
+
+    def test_reuse_buffers(self):
+        data_loader = DataLoader(input_metadata=meta(np.float32), iterations=2, bit_generator="PCG64", reuse_buffers=True)
+        feed_dict0 = data_loader[0]
+        feed_dict1 = data_loader[1]
+        assert all(feed_dict0[name] is feed_dict1[name] for name in feed_dict0.keys())
+
+
+    def test_reuse_buffers_requires_bit_generator(self):
+        with pytest.raises(PolygraphyException, match="bit generator"):
+            DataLoader(reuse_buffers=True)
+
+
+    def test_invalid_bit_generator(self):
+        with pytest.raises(PolygraphyException, match="Unknown bit generator"):
+            DataLoader(bit_generator="fake")
+
+
 class TestDataLoaderCache(object):
     def test_can_cast_dtype(self):
         # Ensure that the data loader can only be used once
@@ -188,3 +232,92 @@ class TestDataLoaderCache(object):
         assert np.all(feed_dict["X"] == 0)
         # Cache can reuse Y, even though it's after X, so we'll get ones from the cache
         assert np.all(feed_dict["Y"] == 1)
+
+
+    def test_does_not_alias_reused_buffers(self):
+        data_loader = DataLoader(iterations=3, bit_generator="PCG64", reuse_buffers=True)
+        cache = DataLoaderCache(data_loader)
+        cache.set_input_metadata(meta(np.float32))
+
+        other_data_loader = DataLoader(input_metadata=meta(np.float32), iterations=3, bit_generator="PCG64")
+        for index in range(3):
+            assert all(np.array_equal(buffer, other_data_loader[index][name]) for name, buffer in cache[index].items())
+
+
+    @pytest.mark.parametrize("bit_generator", [None, "PCG64"])
+    def test_spills_to_disk_beyond_memory_limit(self, bit_generator):
+        data_loader = DataLoader(iterations=4, bit_generator=bit_generator)
+        # Each iteration of `meta` is 164 bytes, so only 2 iterations fit in memory.
+        cache = DataLoaderCache(data_loader, memory_limit_mb=400 / (1 << 20))
+        cache.set_input_metadata(meta(np.float32))
+
+        assert [isinstance(cache.cache[index]["X"], str) for index in range(4)] == [False, False, True, True]
+        assert os.path.exists(cache.cache[3]["X"])
+
+        for index in range(4):
+            feed_dict = cache[index]
+            assert all(np.array_equal(buffer, data_loader[index][name]) for name, buffer in feed_dict.items())
+            if index >= 2:
+                assert not feed_dict["X"].flags.writeable
+
+
+    def test_pickle_sends_only_paths(self):
+        data_loader = DataLoader(iterations=2)
+        cache = DataLoaderCache(data_loader)
+        cache.set_input_metadata(meta(np.float32))
+
+        loaded = pickle.loads(pickle.dumps(cache))
+        assert all(isinstance(buffer, str) for feed_dict in loaded.cache for buffer in feed_dict.values())
+        loaded.set_input_metadata(meta(np.float32))
+        for index in range(2):
+            assert all(np.array_equal(buffer, data_loader[index][name]) for name, buffer in loaded[index].items())
+
+
+    def test_share(self):
+        data_loader = DataLoader(iterations=2)
+        cache = DataLoaderCache(data_loader)
+        shared = cache.share()
+
+        # Data is loaded only once, but each cache has its own input metadata.
+        shared.set_input_metadata(meta(np.float32))
+        cache.set_input_metadata(meta(np.float64))
+        assert shared.cache is cache.cache
+        assert shared[0]["X"].dtype == np.float32
+        assert cache[0]["X"].dtype == np.float64
+        assert np.array_equal(cache[1]["X"], shared[1]["X"].astype(np.float64))
+
+
+    def test_share_does_not_spill(self):
+        cache = DataLoaderCache(DataLoader(iterations=2))
+        cache.set_input_metadata(meta(np.float32))
+        shared = cache.share()
+
+        assert shared._shared is cache._shared
+        assert shared.store_dir is None
+        assert not any(isinstance(buffer, str) for feed_dict in cache.cache for buffer in feed_dict.values())
+
+
+    # The store must live as long as any of the caches sharing it, regardless of which one created it.
+    def test_share_keeps_store_alive(self):
+        data_loader = DataLoader(iterations=2)
+        cache = DataLoaderCache(data_loader)
+        cache.set_input_metadata(meta(np.float32))
+
+        shared = cache.share()
+        pickle.dumps(shared)
+        del shared
+
+        assert os.path.isdir(cache.store_dir)
+        for index in range(2):
+            assert all(np.array_equal(buffer, data_loader[index][name]) for name, buffer in cache[index].items())
+
+
+    def test_share_concurrently(self):
+        cache = DataLoaderCache(DataLoader(iterations=4), memory_limit_mb=400 / (1 << 20))
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            caches = list(executor.map(lambda _: cache.share(), range(8)))
+            list(executor.map(lambda shared: shared.set_input_metadata(meta(np.float32)), caches))
+
+        assert all(shared.store_dir == cache.store_dir for shared in caches)
+        assert all(os.path.exists(path) for path in [cache.cache[index]["X"] for index in [2, 3]])
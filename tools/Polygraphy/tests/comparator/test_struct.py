@@ -3,9 +3,10 @@
 import numpy as np
 import pytest
 import contextlib
+import os
 from polygraphy import config
 from polygraphy.comparator import IterationResult, RunResults
-from polygraphy.comparator.struct import LazyNumpyArray
+from polygraphy.comparator.struct import SWAPPED_ARRAY_CACHE, BenchmarkResult, BenchmarkResults, LazyNumpyArray
 from polygraphy.exception import PolygraphyException
 
 
@@ -128,3 +129,73 @@ class TestLazyNumpyArray(object):
             assert lazy.tmpfile is not None
 
             assert np.array_equal(large_array, lazy.numpy())
+            # Swapped arrays are read-only, memory-mapped views.
+            assert type(lazy.numpy()) == np.ndarray
+            assert not lazy.numpy().flags["WRITEABLE"]
+
+
+    def test_swapped_array_cache(self):
+        with contextlib.ExitStack() as stack:
+            def reset_config():
+                config.ARRAY_SWAP_THRESHOLD_MB = -1
+                config.ARRAY_SWAP_CACHE_SIZE = 8
+            stack.callback(reset_config)
+
+            config.ARRAY_SWAP_THRESHOLD_MB = 0
+            config.ARRAY_SWAP_CACHE_SIZE = 1
+
+            lazy0 = LazyNumpyArray(np.zeros((4, 4), dtype=np.float32))
+            lazy1 = LazyNumpyArray(np.ones((4, 4), dtype=np.float32))
+            arr0 = lazy0.numpy()
+            assert lazy0.numpy() is arr0
+
+            # Accessing another array should evict the first one from the cache.
+            assert np.all(lazy1.numpy() == 1)
+            assert list(SWAPPED_ARRAY_CACHE.arrays) == [lazy1.tmpfile.name]
+            assert lazy0.numpy() is not arr0
+            assert np.all(lazy0.numpy() == 0)
+
+            # Arrays should be removed from the cache once they are no longer used.
+            path = lazy0.tmpfile.name
+            del lazy0
+            assert path not in SWAPPED_ARRAY_CACHE.arrays
+
+
+    def test_from_path(self, tmp_path):
+        path = os.path.join(str(tmp_path), "array.npy")
+        np.save(path, np.ones((4, 4), dtype=np.float32))
+
+        lazy = LazyNumpyArray(path=path)
+        assert lazy.arr is None
+        assert np.all(lazy.numpy() == 1)
+        assert path in SWAPPED_ARRAY_CACHE.arrays
+
+        # The file is owned by the LazyNumpyArray.
+        del lazy
+        assert path not in SWAPPED_ARRAY_CACHE.arrays
+        assert not os.path.exists(path)
+
+
+class TestBenchmarkResult(object):
+    def test_stats(self):
+        result = BenchmarkResult([1000000, 2000000, 3000000, 4000000], total_time_ns=8000000, threads=2)
+        assert result.iterations == 4
+        assert result.throughput == 500.0
+        assert result.latency() == 2.5
+        assert result.latency(50) == 2.5
+        assert result.latency(100) == 4.0
+        assert list(result.summary().keys()) == ["iterations", "threads", "throughput", "mean_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms"]
+
+
+    def test_empty(self):
+        result = BenchmarkResult([], total_time_ns=0)
+        assert result.throughput == 0.0
+        assert result.latency(99) == 0.0
+
+
+    def test_serialize(self, tmp_path):
+        results = BenchmarkResults()
+        results["runner0"] = BenchmarkResult([1000, 2000], total_time_ns=3000, runner_name="runner0")
+        path = os.path.join(str(tmp_path), "benchmark.json")
+        results.save(path)
+        assert BenchmarkResults.load(path)["runner0"] == results["runner0"]
@@ -0,0 +1,179 @@
+#
+# Copyright (c) 2021, NVIDIA CORPORATION. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import os
+import pickle
+
+import numpy as np
+import pytest
+from polygraphy import config
+from polygraphy.comparator import IterationResult
+from polygraphy.comparator import util as comp_util
+
+
+def check_stats(stats, arr):
+    with np.testing.suppress_warnings() as sup:
+        sup.filter(RuntimeWarning)
+        # The statistics are accumulated in 64-bit floating point.
+        arr64 = arr.astype(np.float64)
+        assert np.isclose(stats.mean, comp_util.compute_mean(arr64), rtol=1e-5, equal_nan=True)
+        assert np.isclose(stats.stddev, comp_util.compute_stddev(arr64), rtol=1e-5, equal_nan=True)
+        assert np.isclose(stats.variance, comp_util.compute_variance(arr64), rtol=1e-5, equal_nan=True)
+        # Medians and extrema should be exact.
+        assert np.array_equal(stats.median, comp_util.compute_median(arr), equal_nan=True)
+        assert np.array_equal(stats.min, comp_util.compute_min(arr), equal_nan=True)
+        assert np.array_equal(stats.max, comp_util.compute_max(arr), equal_nan=True)
+        assert stats.argmin == comp_util.compute_argmin(arr)
+        assert stats.argmax == comp_util.compute_argmax(arr)
+
+
+def check_error_stats(out0, out1, chunk_size, atol=1e-3, rtol=1e-3):
+    error_stats = comp_util.compute_error_stats(out0, out1, atol=atol, rtol=rtol, chunk_size=chunk_size)
+
+    with np.testing.suppress_warnings() as sup:
+        sup.filter(RuntimeWarning)
+        if out0.dtype == np.bool_:
+            absdiff = np.logical_xor(out0, out1)
+        else:
+            absdiff = np.abs(out0 - out1)
+        reldiff = absdiff / np.abs(out1)
+
+    for stats, arr in zip([error_stats.out0, error_stats.out1, error_stats.absdiff, error_stats.reldiff],
+                          [out0, out1, absdiff, reldiff]):
+        check_stats(stats, arr)
+
+    mismatches = (absdiff > atol) & (reldiff > rtol)
+    assert error_stats.num_mismatches == np.count_nonzero(mismatches)
+    assert error_stats.max_elemwiseabs == comp_util.compute_max(absdiff[mismatches])
+    return error_stats
+
+
+class TestComputeErrorStats(object):
+    @pytest.mark.parametrize("dtype", [np.float32, np.float64, np.int32, np.float16])
+    @pytest.mark.parametrize("shape", [(1, ), (33, 61), (4, 3, 2, 25)])
+    @pytest.mark.parametrize("chunk_size", [7, 64, None])
+    def test_matches_numpy(self, dtype, shape, chunk_size):
+        np.random.seed(0)
+        out0 = (np.random.standard_normal(shape) * 10).astype(dtype)
+        out1 = (out0 + np.random.standard_normal(shape)).astype(dtype)
+        check_error_stats(out0, out1, chunk_size)
+
+
+    def test_non_finite(self):
+        np.random.seed(0)
+        out0 = np.random.random_sample((1000, )).astype(np.float32)
+        out0[[5, 100, 101, 102]] = np.inf
+        out0[9] = -np.inf
+        out1 = out0.copy()
+        out1[3] = 0
+        check_error_stats(out0, out1, chunk_size=64)
+
+        out0[500] = np.nan
+        error_stats = check_error_stats(out0, out1, chunk_size=64)
+        assert np.isnan(error_stats.out0.median)
+        # Histograms cannot be computed for non-finite ranges
+        assert error_stats.out0.histogram is None
+
+
+    def test_bool(self):
+        np.random.seed(0)
+        out0 = np.random.random_sample((50, 20)) > 0.5
+        out1 = np.random.random_sample((50, 20)) > 0.3
+        check_error_stats(out0, out1, chunk_size=64)
+        check_error_stats(out0, out0, chunk_size=64)
+
+
+    @pytest.mark.parametrize("shape", [(0, 3), tuple()])
+    def test_empty_and_scalar(self, shape):
+        check_error_stats(np.ones(shape, dtype=np.float32), np.zeros(shape, dtype=np.float32), chunk_size=4)
+
+
+    def test_repeated_values(self):
+        # Most of the values are the same, so narrowing down the median takes several passes.
+        np.random.seed(0)
+        out0 = np.zeros((10000, ), dtype=np.float32)
+        out0[::7] = np.random.random_sample(out0[::7].shape)
+        out1 = out0.copy()
+        out1[::3] += 1e-30
+        check_error_stats(out0, out1, chunk_size=100)
+
+
+    def test_num_passes(self):
+        np.random.seed(0)
+        out0 = np.random.uniform(1, 2, size=(1 << 16, )).astype(np.float32)
+        out1 = out0 + np.random.uniform(0, 0.1, size=out0.shape).astype(np.float32)
+        # One pass for everything but the medians and histograms, one to narrow down the medians and compute histograms,
+        # and one to collect the elements near the medians.
+        assert check_error_stats(out0, out1, chunk_size=1 << 12).num_passes == 3
+
+
+    def test_histogram(self):
+        np.random.seed(0)
+        out0 = np.random.standard_normal((1000, )).astype(np.float32)
+        out1 = out0 + 1
+        error_stats = comp_util.compute_error_stats(out0, out1, chunk_size=64)
+
+        hist_range = (min(out0.min(), out1.min()), max(out0.max(), out1.max()))
+        for stats, arr in [(error_stats.out0, out0), (error_stats.out1, out1)]:
+            hist, bin_edges = np.histogram(arr, range=hist_range)
+            # Elements on the edges of bins may be rounded differently.
+            assert np.sum(stats.histogram[0]) == np.sum(hist)
+            assert np.sum(np.abs(stats.histogram[0] - hist)) <= 2
+            assert np.allclose(stats.histogram[1], bin_edges)
+        assert "Histogram" in comp_util.str_histogram_counts(*error_stats.out0.histogram)
+
+
+
+class TestIterationResultsTransport(object):
+    def test_round_trip(self, tmp_path):
+        large = np.arange(64, dtype=np.float32).reshape(8, 8)
+        small = np.ones((2, ), dtype=np.int64)
+        objects = np.array(["a", None], dtype=object)
+        iteration_results = [IterationResult(outputs={"large": large, "small": small, "objects": objects}, runtime=0.5, runner_name="runner")]
+
+        exported = comp_util.export_iteration_results(iteration_results, str(tmp_path), min_bytes=large.nbytes)
+        # Only the large output should be sent as a path.
+        outputs = pickle.loads(pickle.dumps(exported))[0][2]
+        assert isinstance(outputs["large"], str)
+        assert isinstance(outputs["small"], np.ndarray)
+        assert isinstance(outputs["objects"], np.ndarray)
+
+        imported = comp_util.import_iteration_results(pickle.loads(pickle.dumps(exported)))
+        assert imported == iteration_results
+        # Files are removed right away, and the outputs remain writable.
+        assert not os.listdir(str(tmp_path))
+        assert imported[0].dct["large"].path is None
+        imported[0]["large"][:] = 0
+        assert np.all(imported[0]["large"] == 0)
+
+
+    # Outputs that would be swapped to the disk are read-only, like other swapped arrays.
+    def test_round_trip_swapped(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config, "ARRAY_SWAP_THRESHOLD_MB", 0)
+        large = np.arange(64, dtype=np.float32).reshape(8, 8)
+        iteration_results = [IterationResult(outputs={"large": large}, runtime=0.5, runner_name="runner")]
+
+        exported = comp_util.export_iteration_results(iteration_results, str(tmp_path), min_bytes=large.nbytes)
+        imported = comp_util.import_iteration_results(pickle.loads(pickle.dumps(exported)))
+        assert imported == iteration_results
+        # Files are moved out of the directory and memory-mapped.
+        assert not os.listdir(str(tmp_path))
+        assert not imported[0]["large"].flags["WRITEABLE"]
+
+        # Files are removed along with the results.
+        path = imported[0].dct["large"].path
+        assert os.path.exists(path)
+        del imported
+        assert not os.path.exists(path)
@@ -15,8 +15,9 @@
 #
 
 import tempfile
+import threading
 
-from polygraphy.logger.logger import Logger
+from polygraphy.logger.logger import Logger, LogMode
 
 
 # We don't use the global logger here because we would have to reset the state each time.
@@ -30,3 +31,34 @@ class TestLogger(object):
 
             log_file.seek(0)
             assert log_file.read() == "[I] Hello\n"
+
+
+    def test_capture_replay(self):
+        logger = Logger(colors=False)
+        with tempfile.NamedTemporaryFile("w+") as log_file:
+            logger.log_file = log_file.name
+
+            def work(results):
+                with logger.capture() as messages:
+                    logger.info("Worker")
+                    with logger.indent():
+                        logger.warning("Once", mode=LogMode.ONCE)
+                results.append(messages)
+
+            results = []
+            threads = [threading.Thread(target=work, args=(results, )) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            logger.info("Main")
+            log_file.seek(0)
+            assert log_file.read() == "[I] Main\n"
+
+            with logger.indent():
+                for messages in results:
+                    logger.replay(messages)
+
+            log_file.seek(0)
+            assert log_file.read() == "[I] Main\n[I]     Worker\n[W]         Once\n[I]     Worker\n"
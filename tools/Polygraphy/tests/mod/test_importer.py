@@ -15,6 +15,7 @@
 #
 
 import copy
+import importlib
 import sys
 import tempfile
 from textwrap import dedent
@@ -79,6 +80,19 @@ class TestImporter(object):
             assert sys.path == orig_sys_path
 
 
+    def test_lazy_import_caches_module(self, monkeypatch):
+        imported = []
+        import_module = importlib.import_module
+        def record_import(name):
+            imported.append(name)
+            return import_module(name)
+        monkeypatch.setattr(importlib, "import_module", record_import)
+
+        lazy_json = mod.lazy_import("json")
+        assert lazy_json.loads(lazy_json.dumps([1])) == [1]
+        assert imported == ["json"]
+
+
     @pytest.mark.parametrize("ver, pref, expected", [
         ("0.0.0", "==0.0.0", True),
         ("0.0.0", "== 0.0.1", False),
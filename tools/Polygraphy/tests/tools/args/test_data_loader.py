@@ -36,6 +36,7 @@ ARG_CASES = [
     (["--val-range", "))):[0.0,2.3]"], ["val_range"], [{")))": (0.0, 2.3)}]),
     (["--val-range", "'\"':[0.0,2.3]"], ["val_range"], [{"'\"'": (0.0, 2.3)}]),
     (["--iterations=12"], ["iterations"], [12]),
+    (["--bit-generator=PCG64"], ["bit_generator"], ["PCG64"]),
 ]
 
 class TestDataLoaderArgs(object):
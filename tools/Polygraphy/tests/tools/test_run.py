@@ -23,6 +23,7 @@ import tempfile
 import pytest
 import tensorrt as trt
 from polygraphy import mod
+from polygraphy.comparator import BenchmarkResults
 from polygraphy.json import load_json
 from tests.helper import check_file_non_empty, get_file_size
 from tests.models.meta import ONNX_MODELS, TF_MODELS
@@ -293,6 +294,14 @@ class TestOther(object):
     def test_subprocess_sanity(self):
         run_polygraphy_run([ONNX_MODELS["identity"].path, "--onnxrt", "--use-subprocess"])
 
+    def test_input_memory_limit(self):
+        run_polygraphy_run([ONNX_MODELS["identity"].path, "--onnxrt", "--onnxrt", "--iterations=3", "--input-memory-limit=0"])
+        run_polygraphy_run([ONNX_MODELS["identity"].path, "--onnxrt", "--onnxrt", "--use-subprocess", "--input-memory-limit=0"])
+
+    @pytest.mark.parametrize("use_subprocess", [[], ["--use-subprocess"]])
+    def test_concurrent_runners(self, use_subprocess):
+        run_polygraphy_run([ONNX_MODELS["identity"].path, "--onnxrt", "--onnxrt", "--iterations=2", "--concurrent-runners"] + use_subprocess)
+
 
     def test_custom_tolerance(self):
         run_polygraphy_run([ONNX_MODELS["identity"].path, "--onnxrt", "--onnxrt", "--iterations=0", "--atol=1.0", "--rtol=1.0"])
@@ -318,6 +327,23 @@ class TestOther(object):
         run_polygraphy_run([ONNX_MODELS["identity"].path, "--onnxrt", "--onnxrt", "--check-error-stat", check_error_stat])
 
 
+    @pytest.mark.parametrize("check_error_stat", ["elemwise", "median"])
+    def test_fused_error_stats(self, check_error_stat):
+        run_polygraphy_run([ONNX_MODELS["identity"].path, "--onnxrt", "--onnxrt", "--fused-error-stats", "--check-error-stat", check_error_stat])
+
+
+    def test_compare_workers(self):
+        run_polygraphy_run([ONNX_MODELS["identity"].path, "--onnxrt", "--onnxrt", "--iterations=4", "--compare-workers=4"])
+
+
+    def test_benchmark(self, tmp_path):
+        path = os.path.join(tmp_path, "benchmark.json")
+        run_polygraphy_run([ONNX_MODELS["identity"].path, "--onnxrt", "--benchmark", "--benchmark-iterations=20",
+                            "--benchmark-threads=2", "--save-benchmark", path])
+        results = BenchmarkResults.load(path)
+        assert [result.iterations for result in results.values()] == [20]
+
+
     def test_save_load_outputs(self, tmp_path):
         OUTFILE0 = os.path.join(tmp_path, "outputs0.json")
         OUTFILE1 = os.path.join(tmp_path, "outputs1.json")
@@ -13,6 +13,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import json
+import os
 import tempfile
 
 import numpy as np
@@ -22,7 +24,7 @@ from polygraphy import constants
 from polygraphy.backend.trt import Algorithm, TacticReplayData
 from polygraphy.comparator import IterationResult, RunResults
 from polygraphy.exception import PolygraphyException
-from polygraphy.json import Decoder, Encoder, from_json, load_json, to_json
+from polygraphy.json import Decoder, Encoder, from_json, load_json, save_json, to_json
 
 
 class Dummy(object):
@@ -123,3 +125,114 @@ class TestImplementations(object):
 def test_load_json_errors_if_file_nonexistent():
     with pytest.raises(FileNotFoundError, match="No such file"):
         load_json("polygraphy-nonexistent-path")
+
+
+class TestArrayData(object):
+    @pytest.mark.parametrize("array", [
+        np.arange(24, dtype=np.float32).reshape(2, 3, 4),
+        np.arange(24, dtype=np.int64).reshape(4, 6).T, # Non-contiguous
+        np.array([True, False, True]),
+        np.arange(5, dtype=">f8"), # Non-native byte order
+        np.zeros((0, 3), dtype=np.float16),
+        np.array(3.5, dtype=np.float32),
+    ])
+    def test_save_load_path(self, tmp_path, array):
+        path = os.path.join(tmp_path, "array.json")
+        save_json(array, path)
+
+        decoded = load_json(path)
+        assert decoded.dtype == array.dtype
+        assert decoded.shape == array.shape
+        assert np.array_equal(decoded, array)
+
+
+    def test_save_load_run_results(self, tmp_path):
+        path = os.path.join(tmp_path, "results.json")
+        results = RunResults([("runner0", [IterationResult(outputs={"out0": np.random.random_sample((64, 64)), "out1": np.ones((64, ), dtype=np.float32)},
+                                                           runner_name="runner0") for _ in range(3)])])
+        results.save(path)
+
+        # The JSON file should only contain metadata, and offsets should be aligned.
+        assert os.path.exists(path + ".bin")
+        assert os.path.getsize(path) < os.path.getsize(path + ".bin")
+        with open(path) as f:
+            assert all(offset % 64 == 0 for offset in json_offsets(f.read()))
+
+        decoded = RunResults.load(path)
+        assert decoded == results
+
+        # Loaded arrays are memory-mapped, but can still be modified without modifying the file.
+        out = decoded["runner0"][0]["out1"]
+        out[:] = 5
+        assert RunResults.load(path) == results
+
+
+    def test_save_to_loaded_path(self, tmp_path):
+        path = os.path.join(tmp_path, "results.json")
+        results = RunResults([("runner0", [IterationResult(outputs={"out0": np.arange(4096, dtype=np.float32)},
+                                                           runner_name="runner0")])])
+        results.save(path)
+
+        # The arrays of the loaded results are memory-mapped from the binary file that is being replaced.
+        decoded = RunResults.load(path)
+        decoded.save(path)
+        assert decoded == results
+        assert RunResults.load(path) == results
+
+        decoded["runner0"][0]["out1"] = np.ones(4, dtype=np.float32)
+        decoded.save(path)
+        assert RunResults.load(path) == decoded
+        assert sorted(os.listdir(tmp_path)) == ["results.json", "results.json.bin"]
+
+
+    def test_save_without_arrays_removes_array_data(self, tmp_path):
+        path = os.path.join(tmp_path, "array.json")
+        save_json(np.ones(4), path)
+        save_json(np.ones(0), path)
+        assert not os.path.exists(path + ".bin")
+        assert np.array_equal(load_json(path), np.ones(0))
+
+
+    def test_failed_save_keeps_array_data(self, tmp_path):
+        path = os.path.join(tmp_path, "array.json")
+        save_json([np.ones(4)], path)
+        with pytest.raises(TypeError):
+            save_json([np.zeros(4), object()], path)
+        assert np.array_equal(load_json(path), [np.ones(4)])
+        assert sorted(os.listdir(tmp_path)) == ["array.json", "array.json.bin"]
+
+
+    def test_file_like_embeds_arrays(self):
+        with tempfile.NamedTemporaryFile("w+") as f:
+            save_json(np.ones(4), f)
+            assert not os.path.exists(f.name + ".bin")
+            assert np.array_equal(load_json(f), np.ones(4))
+
+
+    def test_from_json_cannot_decode_array_data(self, tmp_path):
+        path = os.path.join(tmp_path, "array.json")
+        save_json(np.ones(4), path)
+        with open(path) as f:
+            with pytest.raises(PolygraphyException, match="stored in a separate file"):
+                from_json(f.read())
+
+
+    def test_truncated_array_data(self, tmp_path):
+        path = os.path.join(tmp_path, "array.json")
+        save_json(np.ones(4), path)
+        with open(path + ".bin", "r+b") as f:
+            f.truncate(8)
+        with pytest.raises(PolygraphyException, match="truncated"):
+            load_json(path)
+
+
+def json_offsets(src):
+    offsets = []
+    def hook(pairs):
+        dct = dict(pairs)
+        if "offset" in dct:
+            offsets.append(dct["offset"])
+        return dct
+
+    json.loads(src, object_pairs_hook=hook)
+    return offsets
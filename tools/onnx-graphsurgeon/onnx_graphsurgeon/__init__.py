@@ -3,6 +3,7 @@ from onnx_graphsurgeon.importers.onnx_importer import import_onnx
 from onnx_graphsurgeon.ir.graph import Graph
 from onnx_graphsurgeon.ir.node import Node
 from onnx_graphsurgeon.ir.tensor import Constant, Tensor, Variable
+from onnx_graphsurgeon.patterns.pattern import Match, Pattern
 from onnx_graphsurgeon.util.exception import OnnxGraphSurgeonException
 
 __version__ = "0.3.9"
@@ -14,27 +14,174 @@
 # limitations under the License.
 #
 
+import os
+import uuid
+
 import numpy as np
 import onnx
+import onnx.external_data_helper
 import onnx.numpy_helper
 from onnx_graphsurgeon.exporters.base_exporter import BaseExporter
+from onnx_graphsurgeon.importers.onnx_importer import has_numpy_equivalent
 from onnx_graphsurgeon.ir.graph import Graph
 from onnx_graphsurgeon.ir.node import Node
 from onnx_graphsurgeon.ir.tensor import Constant, LazyValues, Tensor, Variable
 from onnx_graphsurgeon.logger.logger import G_LOGGER
+from onnx_graphsurgeon.util import misc
 
 
 def dtype_to_onnx(dtype: np.dtype) -> int:
     return onnx.mapping.NP_TYPE_TO_TENSOR_TYPE[np.dtype(dtype)]
 
 
+class ExternalDataWriter(object):
+    def __init__(self, path: str, size_threshold: int=1024, alignment: int=4096):
+        """
+        Writes the values of large constants to an external data file as they are exported,
+        so that the exported model only holds references to them.
+
+        Args:
+            path (str):
+                    The path of the external data file. The file is referenced by its name only,
+                    so the model must be saved to the same directory.
+                    Constants whose external data has not been loaded keep referencing their original
+                    files only if those are in this directory too. Otherwise, their data is copied.
+            size_threshold (int):
+                    The minimum size, in bytes, of constants to write to the external data file.
+                    Smaller constants are embedded in the model. Defaults to 1024.
+            alignment (int):
+                    The alignment, in bytes, of the offset of each constant in the external data file.
+                    The default, 4096, allows each constant to be memory-mapped individually.
+        """
+        self.path = path
+        self.location = os.path.basename(path)
+        self.directory = os.path.dirname(os.path.abspath(path))
+        self.size_threshold = size_threshold
+        self.alignment = alignment
+        self.file = None
+
+
+    def __enter__(self):
+        # Write to a new file which replaces any existing one only once it is complete, since
+        # the existing file may be the one that the values being written are memory-mapped from.
+        self.file = open("{:}.{:}.tmp".format(self.path, uuid.uuid4().hex), "xb")
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.file.close()
+        if exc_type is None:
+            os.replace(self.file.name, self.path)
+        else:
+            os.remove(self.file.name)
+
+
+    def can_reference(self, values: LazyValues) -> bool:
+        """
+        Whether the unloaded external data of the provided values can still be referenced from a model
+        saved alongside this external data file.
+
+        Args:
+            values (LazyValues): The values to check.
+
+        Returns:
+            bool
+        """
+        if values.base_dir is None or os.path.abspath(values.base_dir) != self.directory:
+            return False
+        location = onnx.external_data_helper.ExternalDataInfo(values.tensor).location
+        return os.path.abspath(os.path.join(values.base_dir, location)) != os.path.abspath(self.path)
+
+
+    def _get_buffer(self, tensor: Constant):
+        # Returns the little-endian bytes of the tensor's values and their ONNX data type, avoiding copies where possible,
+        # or None if the values cannot be stored externally.
+        values = tensor._values
+        if isinstance(values, LazyValues):
+            onnx_tensor = values.tensor
+            if values.dtype is None or (values.is_external() and self.can_reference(values)):
+                return None
+
+            # Types which NumPy cannot represent, like BFLOAT16, would be converted to a wider type when loaded,
+            # so their original bytes are written instead.
+            if not has_numpy_equivalent(onnx_tensor.data_type):
+                if values.is_external():
+                    onnx_tensor = onnx.TensorProto()
+                    onnx_tensor.CopyFrom(values.tensor)
+                    onnx.external_data_helper.load_external_data_for_tensor(onnx_tensor, misc.default_value(values.base_dir, ""))
+                if not onnx_tensor.HasField("raw_data") or len(onnx_tensor.raw_data) < self.size_threshold:
+                    return None
+                return memoryview(onnx_tensor.raw_data), onnx_tensor.data_type
+
+            nbytes = int(np.prod(values.shape)) * np.dtype(values.dtype).itemsize
+            if nbytes < self.size_threshold:
+                return None
+            if onnx_tensor.HasField("raw_data"):
+                return memoryview(onnx_tensor.raw_data), onnx_tensor.data_type
+            values = values.load()
+
+        if values.dtype.kind in ["O", "S", "U"] or values.nbytes < self.size_threshold:
+            return None
+        return np.ascontiguousarray(values, dtype=values.dtype.newbyteorder("<")).reshape(-1).view(np.uint8), dtype_to_onnx(values.dtype)
+
+
+    def write(self, tensor: Constant) -> onnx.TensorProto:
+        """
+        Writes the values of the provided constant to the external data file, if it is large enough.
+
+        Args:
+            tensor (Constant): The constant to write.
+
+        Returns:
+            onnx.TensorProto:
+                    A tensor referencing the external data file, or None if the constant
+                    should be embedded in the model instead.
+        """
+        buffer = self._get_buffer(tensor)
+        if buffer is None:
+            return None
+        buffer, data_type = buffer
+
+        offset = self.file.tell()
+        if offset % self.alignment:
+            offset += self.alignment - offset % self.alignment
+            self.file.seek(offset)
+        self.file.write(buffer)
+
+        onnx_tensor = onnx.TensorProto()
+        onnx_tensor.name = tensor.name
+        onnx_tensor.data_type = data_type
+        onnx_tensor.dims.extend(tensor.shape)
+        onnx_tensor.data_location = onnx.TensorProto.EXTERNAL
+        for key, value in [("location", self.location), ("offset", offset), ("length", buffer.nbytes)]:
+            entry = onnx_tensor.external_data.add()
+            entry.key = key
+            entry.value = str(value)
+        return onnx_tensor
+
+
 class OnnxExporter(BaseExporter):
     @staticmethod
-    def export_tensor_proto(tensor: Constant) -> onnx.TensorProto:
+    def export_tensor_proto(tensor: Constant, external_data: ExternalDataWriter=None) -> onnx.TensorProto:
+        if external_data is not None:
+            onnx_tensor = external_data.write(tensor)
+            if onnx_tensor is not None:
+                return onnx_tensor
+
         # Do *not* load LazyValues into an intermediate numpy array - instead, use
-        # the original onnx.TensorProto directly.
+        # the original onnx.TensorProto directly. For values stored in external data files
+        # which have not been loaded, this exports a reference to the original file.
         if isinstance(tensor._values, LazyValues):
-            onnx_tensor = tensor._values.tensor
+            values = tensor._values
+            onnx_tensor = values.tensor
+            # The reference is relative to the directory of the original model, so when the model is
+            # to be saved elsewhere, the data is embedded instead.
+            if external_data is not None and values.is_external() and not external_data.can_reference(values):
+                onnx_tensor = onnx.TensorProto()
+                onnx_tensor.CopyFrom(values.tensor)
+                onnx.external_data_helper.load_external_data_for_tensor(onnx_tensor, misc.default_value(values.base_dir, ""))
+                onnx_tensor.data_location = onnx.TensorProto.DEFAULT
+                del onnx_tensor.external_data[:]
         else:
             onnx_tensor = onnx.numpy_helper.from_array(tensor.values)
             if tensor.data_location is not None:
@@ -56,21 +203,21 @@ class OnnxExporter(BaseExporter):
 
 
     @staticmethod
-    def export_node(node: Node, do_type_check: bool) -> onnx.NodeProto:
+    def export_node(node: Node, do_type_check: bool, external_data: ExternalDataWriter=None) -> onnx.NodeProto:
         # Cannot pass in attrs directly as make_node will change the order
         onnx_node = onnx.helper.make_node(node.op, inputs=[t.name for t in node.inputs], outputs=[t.name for t in node.outputs], name=node.name)
         # Convert Tensors and Graphs to TensorProtos and GraphProtos respectively
         for key, val in node.attrs.items():
             if isinstance(val, Tensor):
-                val = OnnxExporter.export_tensor_proto(val)
+                val = OnnxExporter.export_tensor_proto(val, external_data)
             elif isinstance(val, Graph):
-                val = OnnxExporter.export_graph(val, do_type_check)
+                val = OnnxExporter.export_graph(val, do_type_check, external_data)
             onnx_node.attribute.extend([onnx.helper.make_attribute(key, val)])
         return onnx_node
 
 
     @staticmethod
-    def export_graph(graph: Graph, do_type_check=True) -> onnx.GraphProto:
+    def export_graph(graph: Graph, do_type_check=True, external_data: ExternalDataWriter=None) -> onnx.GraphProto:
         """
         Export an onnx-graphsurgeon Graph to an ONNX GraphProto.
 
@@ -78,12 +225,15 @@ class OnnxExporter(BaseExporter):
             graph (Graph): The graph to export.
 
             do_type_check (bool): Whether to check that input and output tensors have data types defined, and fail if not.
+            external_data (ExternalDataWriter):
+                    If provided, large constants are written to this external data file
+                    instead of being embedded in the graph.
         """
-        nodes = [OnnxExporter.export_node(node, do_type_check) for node in graph.nodes]
+        nodes = [OnnxExporter.export_node(node, do_type_check, external_data) for node in graph.nodes]
         inputs = [OnnxExporter.export_value_info_proto(inp, do_type_check) for inp in graph.inputs]
         outputs = [OnnxExporter.export_value_info_proto(out, do_type_check) for out in graph.outputs]
         tensor_map = graph.tensors()
-        initializer = [OnnxExporter.export_tensor_proto(tensor) for tensor in tensor_map.values() if isinstance(tensor, Constant)]
+        initializer = [OnnxExporter.export_tensor_proto(tensor, external_data) for tensor in tensor_map.values() if isinstance(tensor, Constant)]
 
         # Remove inputs and outputs to export ValueInfoProtos
         for tensor in graph.inputs + graph.outputs:
@@ -98,7 +248,8 @@ class OnnxExporter(BaseExporter):
         return onnx.helper.make_graph(nodes=nodes, name=graph.name, inputs=inputs, outputs=outputs, initializer=initializer, doc_string=graph.doc_string, value_info=value_info)
 
 
-def export_onnx(graph: Graph, do_type_check=True, **kwargs) -> "onnx.ModelProto":
+def export_onnx(graph: Graph, do_type_check=True, external_data_path: str=None, external_data_size_threshold: int=1024,
+                external_data_alignment: int=4096, **kwargs) -> "onnx.ModelProto":
     """
     Exports an onnx-graphsurgeon Graph to an ONNX model.
 
@@ -106,12 +257,33 @@ def export_onnx(graph: Graph, do_type_check=True, **kwargs) -> "onnx.ModelProto"
         graph (Graph): The graph to export
 
         do_type_check (bool): Whether to check that input and output tensors have data types defined, and fail if not.
+        external_data_path (str):
+                The path of a file to which the values of large constants should be written directly
+                while exporting, so that the returned model only holds references to them. This avoids
+                ever embedding them in the model, which is limited to 2 GB. The file is referenced by
+                its name only, so the model must be saved to the same directory.
+                Constants imported from a path whose values were never loaded keep referencing their
+                original external data files if those are in the same directory as this file.
+                Otherwise, their data is copied to this file or, if smaller than the threshold, embedded.
+                Defaults to None, in which case all values are embedded in the model, except for such
+                constants, which are exported as references to their original files. Because those
+                references are relative to the directory of the original model, the exported model must
+                then be saved to that same directory. To save it elsewhere, provide `external_data_path`.
+        external_data_size_threshold (int):
+                The minimum size, in bytes, of constants to write to `external_data_path`. Defaults to 1024.
+        external_data_alignment (int):
+                The alignment, in bytes, of each constant in `external_data_path`. Defaults to 4096, so that
+                each constant can be memory-mapped individually.
         kwargs: Additional arguments to onnx.helper.make_model
 
     Returns:
         onnx.ModelProto: A corresponding ONNX model.
     """
-    onnx_graph = OnnxExporter.export_graph(graph, do_type_check=do_type_check)
+    if external_data_path is not None:
+        with ExternalDataWriter(external_data_path, size_threshold=external_data_size_threshold, alignment=external_data_alignment) as external_data:
+            onnx_graph = OnnxExporter.export_graph(graph, do_type_check=do_type_check, external_data=external_data)
+    else:
+        onnx_graph = OnnxExporter.export_graph(graph, do_type_check=do_type_check)
 
     if graph.import_domains is None:
         kwargs["opset_imports"] = [onnx.helper.make_opsetid("", graph.opset)]
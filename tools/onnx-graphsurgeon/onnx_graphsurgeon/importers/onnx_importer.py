@@ -15,6 +15,7 @@
 #
 
 import copy
+import os
 from collections import OrderedDict
 from typing import List, Union
 
@@ -69,6 +70,11 @@ def get_onnx_tensor_dtype(onnx_tensor: Union[onnx.ValueInfoProto, onnx.TensorPro
         return onnx.mapping.TENSOR_TYPE_TO_NP_TYPE[onnx_type]
     return None
 
+def has_numpy_equivalent(onnx_type: int) -> bool:
+    # Types which NumPy cannot represent, like BFLOAT16, map to a wider NumPy type, which does not map back to them.
+    np_type = onnx.mapping.TENSOR_TYPE_TO_NP_TYPE.get(onnx_type)
+    return np_type is not None and onnx.mapping.NP_TYPE_TO_TENSOR_TYPE.get(np.dtype(np_type)) == onnx_type
+
 class OnnxImporter(BaseImporter):
     @staticmethod
     def get_opset(model: onnx.ModelProto):
@@ -89,16 +95,16 @@ class OnnxImporter(BaseImporter):
 
 
     @staticmethod
-    def import_tensor(onnx_tensor: Union[onnx.ValueInfoProto, onnx.TensorProto]) -> Tensor:
+    def import_tensor(onnx_tensor: Union[onnx.ValueInfoProto, onnx.TensorProto], base_dir: str=None) -> Tensor:
         if isinstance(onnx_tensor, onnx.TensorProto):
             data_location = int(onnx_tensor.data_location) if onnx_tensor.HasField("data_location") else None
-            return Constant(name=onnx_tensor.name, values=LazyValues(onnx_tensor), data_location=data_location)
+            return Constant(name=onnx_tensor.name, values=LazyValues(onnx_tensor, base_dir=base_dir), data_location=data_location)
         else:
             return Variable(name=onnx_tensor.name, dtype=get_onnx_tensor_dtype(onnx_tensor), shape=get_onnx_tensor_shape(onnx_tensor))
 
 
     @staticmethod
-    def import_node(onnx_node: onnx.NodeProto, tensor_map: "OrderedDict[str, Tensor]", subgraph_tensor_map: "OrderedDict[str, Tensor]") -> Node:
+    def import_node(onnx_node: onnx.NodeProto, tensor_map: "OrderedDict[str, Tensor]", subgraph_tensor_map: "OrderedDict[str, Tensor]", base_dir: str=None) -> Node:
         def attrs_to_dict(attrs):
             attr_dict = OrderedDict()
             for attr in attrs:
@@ -107,9 +113,9 @@ class OnnxImporter(BaseImporter):
                     if attr_str == "STRING":
                         processed = processed.decode()
                     elif attr_str == "TENSOR":
-                        processed = OnnxImporter.import_tensor(processed)
+                        processed = OnnxImporter.import_tensor(processed, base_dir=base_dir)
                     elif attr_str == "GRAPH":
-                        processed = OnnxImporter.import_graph(processed, misc.combine_dicts(tensor_map, subgraph_tensor_map))
+                        processed = OnnxImporter.import_graph(processed, misc.combine_dicts(tensor_map, subgraph_tensor_map), base_dir=base_dir)
                     elif attr_str == "FLOATS" or attr_str == "INTS":
                         processed = list(processed)
                     elif attr_str == "STRINGS":
@@ -164,7 +170,7 @@ class OnnxImporter(BaseImporter):
 
 
     @staticmethod
-    def import_graph(onnx_graph: onnx.GraphProto, tensor_map: "OrderedDict[str, Tensor]"=None, opset=None, import_domains: onnx.OperatorSetIdProto=None) -> Graph:
+    def import_graph(onnx_graph: onnx.GraphProto, tensor_map: "OrderedDict[str, Tensor]"=None, opset=None, import_domains: onnx.OperatorSetIdProto=None, base_dir: str=None) -> Graph:
         """
         Imports a Graph from an ONNX Graph.
 
@@ -173,6 +179,9 @@ class OnnxImporter(BaseImporter):
 
             tensor_map (OrderedDict[str, Tensor]): A mapping of tensor names to Tensors. This is generally only useful for subgraph import.
             opset (int): The ONNX opset to use for this graph.
+            base_dir (str):
+                    The directory containing any external data files referenced by initializers whose
+                    external data has not been loaded. Such initializers are memory-mapped when accessed.
         """
         tensor_map = copy.copy(misc.default_value(tensor_map, OrderedDict())) # Outer graph tensors, read-only
         subgraph_tensor_map = OrderedDict() # Tensors in this subgraph
@@ -184,7 +193,7 @@ class OnnxImporter(BaseImporter):
             # Prioritize the subgraph even if check_outer_graph is set
             if onnx_tensor.name in subgraph_tensor_map:
                 if overwrite:
-                    tensor = OnnxImporter.import_tensor(onnx_tensor)
+                    tensor = OnnxImporter.import_tensor(onnx_tensor, base_dir=base_dir)
                     if isinstance(subgraph_tensor_map[onnx_tensor.name], Variable):
                         subgraph_tensor_map[onnx_tensor.name].dtype = subgraph_tensor_map[onnx_tensor.name].dtype or tensor.dtype
                         subgraph_tensor_map[onnx_tensor.name].shape = subgraph_tensor_map[onnx_tensor.name].shape or tensor.shape
@@ -193,7 +202,7 @@ class OnnxImporter(BaseImporter):
             if check_outer_graph and onnx_tensor.name in tensor_map:
                 return tensor_map[onnx_tensor.name]
 
-            subgraph_tensor_map[onnx_tensor.name] = OnnxImporter.import_tensor(onnx_tensor)
+            subgraph_tensor_map[onnx_tensor.name] = OnnxImporter.import_tensor(onnx_tensor, base_dir=base_dir)
             return subgraph_tensor_map[onnx_tensor.name]
 
 
@@ -228,20 +237,29 @@ class OnnxImporter(BaseImporter):
         G_LOGGER.verbose("Importing nodes")
         nodes = [] # List[Node]
         for onnx_node in onnx_graph.node:
-            node = OnnxImporter.import_node(onnx_node, tensor_map, subgraph_tensor_map)
+            node = OnnxImporter.import_node(onnx_node, tensor_map, subgraph_tensor_map, base_dir=base_dir)
             nodes.append(node)
 
         return Graph(nodes=nodes, inputs=graph_inputs, outputs=graph_outputs, name=onnx_graph.name, doc_string=onnx_graph.doc_string, opset=opset, import_domains=import_domains)
 
 
-def import_onnx(onnx_model: "onnx.ModelProto") -> Graph:
+def import_onnx(onnx_model: Union["onnx.ModelProto", str]) -> Graph:
     """
     Import an onnx-graphsurgeon Graph from the provided ONNX model.
 
     Args:
-        onnx_model (onnx.ModelProto): The ONNX model.
+        onnx_model (Union[onnx.ModelProto, str]):
+                The ONNX model, or a path to it.
+                When a path is provided, external data is not loaded into memory. Instead, initializers stored
+                in external data files are memory-mapped when their values are first accessed. Initializers whose
+                values are never accessed are exported as references to the original external data files.
 
     Returns:
         Graph: A corresponding onnx-graphsurgeon Graph.
     """
-    return OnnxImporter.import_graph(onnx_model.graph, opset=OnnxImporter.get_opset(onnx_model), import_domains=OnnxImporter.get_import_domains(onnx_model))
+    base_dir = None
+    if not isinstance(onnx_model, onnx.ModelProto):
+        base_dir = os.path.dirname(os.path.abspath(onnx_model))
+        onnx_model = onnx.load(onnx_model, load_external_data=False)
+
+    return OnnxImporter.import_graph(onnx_model.graph, opset=OnnxImporter.get_opset(onnx_model), import_domains=OnnxImporter.get_import_domains(onnx_model), base_dir=base_dir)
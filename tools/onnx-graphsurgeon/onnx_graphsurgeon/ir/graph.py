@@ -15,12 +15,14 @@
 #
 
 import copy
+import os
+import time
 from collections import OrderedDict, defaultdict
 from typing import Sequence
 
 import numpy as np
 from onnx_graphsurgeon.ir.node import Node
-from onnx_graphsurgeon.ir.tensor import Constant, Tensor, Variable
+from onnx_graphsurgeon.ir.tensor import Constant, LazyValues, Tensor, Variable
 from onnx_graphsurgeon.logger import G_LOGGER
 from onnx_graphsurgeon.util import misc
 
@@ -96,6 +98,7 @@ class Graph(object):
             name (str): The name of the graph. Defaults to "onnx_graphsurgeon_graph".
             doc_string (str): A doc_string for the graph. Defaults to "".
         """
+        self._index = None
         self.nodes = misc.default_value(nodes, [])
         self.inputs = list(misc.default_value(inputs, []))
         self.outputs = list(misc.default_value(outputs, []))
@@ -129,11 +132,64 @@ class Graph(object):
 
     def __setattr__(self, name, value):
         # We don't want graph inputs/outputs to be SynchronizedLists
+        index = self.__dict__.get("_index")
         if name in ["inputs", "outputs"]:
             value = list(value)
+            if index is not None:
+                value = index._observe_io(value)
+        elif name == "nodes" and index is not None:
+            value = index._observe_nodes(value)
         return super().__setattr__(name, value)
 
 
+    def index(self):
+        """
+        Returns a persistent index of this graph, which provides constant-time lookups of tensors and nodes
+        by name, nodes by op, and the producers and consumers of tensors within this graph.
+
+        The index is created the first time this function is called. From then on, it is updated incrementally
+        as the graph is modified, so the cost of keeping it up to date is proportional to the size of the modifications.
+        This is useful for passes that repeatedly look up tensors or nodes while modifying the graph, where
+        calling `tensors()` each time would make the pass quadratic in the size of the graph.
+
+        While the graph is indexed, `nodes`, `inputs`, and `outputs` are lists that notify the index when they are modified.
+        Hence, modifications made through references to those lists obtained before the index was created are not tracked.
+        Use `drop_index()` to stop tracking modifications to the graph.
+
+        For example:
+        ::
+
+            index = graph.index()
+            for node in index.nodes_by_op("Gelu"):
+                ...
+            tensor = index.get_tensor("input")
+
+        Returns:
+            GraphIndex: The index of this graph.
+        """
+        if self._index is None:
+            from onnx_graphsurgeon.ir.graph_index import GraphIndex
+
+            self._index = GraphIndex(self)
+            # Reassign the lists so that they are tracked by the index.
+            self.nodes = self.nodes
+            self.inputs = self.inputs
+            self.outputs = self.outputs
+        return self._index
+
+
+    def drop_index(self):
+        """
+        Drops the index of this graph created by `index()`, if any, so that modifications to the graph are no longer tracked.
+        """
+        if self._index is not None:
+            self._index._detach()
+            self._index = None
+            self.nodes = list(self.nodes)
+            self.inputs = self.inputs
+            self.outputs = self.outputs
+
+
     def __eq__(self, other: "Graph"):
         nodes_match = len(self.nodes) == len(other.nodes) and all([node == other_node for node, other_node in zip(self.nodes, other.nodes)])
         inputs_match = len(self.inputs) == len(other.inputs) and all([inp == other_inp for inp, other_inp in zip(self.inputs, other.inputs)])
@@ -175,7 +231,14 @@ class Graph(object):
 
     # Returns tensors used by this graph which are not present in the graph.
     # These may come from an outer graph for example.
-    def _foreign_tensors(self):
+    #
+    # `cache` maps subgraph ids to their foreign tensors so that nested subgraphs are only ever
+    # traversed once per call, even when they are referenced multiple times.
+    def _foreign_tensors(self, cache=None):
+        cache = misc.default_value(cache, {})
+        if id(self) in cache:
+            return cache[id(self)]
+
         local_tensors = self._local_tensors()
         foreign_tensors = {}
 
@@ -187,7 +250,7 @@ class Graph(object):
 
             for attr in node.attrs.values():
                 if isinstance(attr, Graph):
-                    subgraph_foreign_tensors = attr._foreign_tensors()
+                    subgraph_foreign_tensors = attr._foreign_tensors(cache)
                     # Some of the foreign tensors from a subgraph may come from this graph.
                     subgraph_foreign_tensors = {
                         t.name: t
@@ -196,6 +259,7 @@ class Graph(object):
                     }
                     foreign_tensors.update(subgraph_foreign_tensors)
 
+        cache[id(self)] = foreign_tensors
         return foreign_tensors
 
 
@@ -227,21 +291,27 @@ class Graph(object):
         ignore_tensors = IgnoreDupAndForeign()
         used_tensors = list(filter(ignore_tensors, self.outputs))
         used_node_ids = set()
+        foreign_tensors_cache = {}
 
         index = 0
         while index < len(used_tensors):
             used_tensor = used_tensors[index]
             index += 1
             for node in used_tensor.inputs:
+                # Nodes with multiple outputs may be reached more than once, but only need to be visited once.
+                node_id = self._get_node_id(node)
+                if node_id in used_node_ids:
+                    continue
+
                 # Must cast to list here, otherwise node_used_tensors will be SynchronizedList!
                 node_used_tensors = list(node.inputs)
 
                 # If a node includes a subgraph, get any tensors that it uses from the outer graph.
                 for attr in node.attrs.values():
                     if isinstance(attr, Graph):
-                        node_used_tensors += list(attr._foreign_tensors().values())
+                        node_used_tensors += list(attr._foreign_tensors(foreign_tensors_cache).values())
 
-                used_node_ids.add(self._get_node_id(node))
+                used_node_ids.add(node_id)
                 used_tensors.extend(filter(ignore_tensors, node_used_tensors))
         return used_node_ids, used_tensors
 
@@ -289,9 +359,13 @@ class Graph(object):
 
             used_node_ids, used_tensors = self._get_used_node_ids()
 
+            # Tensors compare equal by name, so a set of names is equivalent to (but much faster than)
+            # checking membership in the list of used tensors.
+            used_tensor_names = set([tensor.name for tensor in used_tensors])
+
             inputs = []
             for inp in self.inputs:
-                if inp in used_tensors or not remove_unused_graph_inputs:
+                if inp.name in used_tensor_names or not remove_unused_graph_inputs:
                     inputs.append(inp)
                 else:
                     G_LOGGER.ultra_verbose("Removing unused input: {:}".format(inp))
@@ -342,47 +416,77 @@ class Graph(object):
 
         G_LOGGER.debug("Topologically sorting {:}".format(self.name))
 
-        # Keeps track of a node and it's level in the graph hierarchy.
-        # 0 corresponds to an input node, N corresponds to a node with N layers of inputs.
-        class HierarchyDescriptor(object):
-            def __init__(self, node=None, level=None):
-                self.node = node
-                self.level = level
-
-            def __lt__(self, other):
-                return self.level < other.level
-
-        hierarchy_levels = {} # Dict[int, HierarchyDescriptor]
-
         local_tensors = self._local_tensors()
 
-        def get_hierarchy_level(node):
-            # Return all local nodes that contribute to this node.
-            def get_input_nodes(node):
-                inputs = {}
+        with self.node_ids():
+            # Build the producer -> consumer adjacency once. Each edge is only recorded once,
+            # even if a consumer uses multiple outputs of the same producer.
+            # The level of a node is the level of its highest input + 1, with 0 corresponding to
+            # nodes that have no local inputs.
+            num_nodes = len(self.nodes)
+            consumers = [[] for _ in range(num_nodes)] # List[List[int]]
+            num_producers = [0] * num_nodes
+            for node in self.nodes:
+                node_id = self._get_node_id(node)
+                producer_ids = set()
                 for tensor in node.inputs:
                     if tensor.name in local_tensors:
                         for inp_node in tensor.inputs:
-                            inputs[self._get_node_id(inp_node)] = inp_node
-                return inputs.values()
-
-            if self._get_node_id(node) in hierarchy_levels:
-                return hierarchy_levels[self._get_node_id(node)].level
-
-            # The level of a node is the level of it's highest input + 1.
-            try:
-                max_input_level = max([get_hierarchy_level(input_node) for input_node in get_input_nodes(node)] + [-1])
-            except RecursionError:
-                G_LOGGER.critical("Cycle detected in graph! Are there tensors with duplicate names in the graph?")
+                            producer_ids.add(self._get_node_id(inp_node))
+
+                for producer_id in producer_ids:
+                    consumers[producer_id].append(node_id)
+                num_producers[node_id] = len(producer_ids)
+
+            # Kahn's algorithm - a node is ready once all of its producers have been assigned a level.
+            levels = [0] * num_nodes
+            remaining_producers = list(num_producers)
+            ready = [node_id for node_id in range(num_nodes) if remaining_producers[node_id] == 0]
+            index = 0
+            while index < len(ready):
+                node_id = ready[index]
+                index += 1
+                for consumer_id in consumers[node_id]:
+                    levels[consumer_id] = max(levels[consumer_id], levels[node_id] + 1)
+                    remaining_producers[consumer_id] -= 1
+                    if remaining_producers[consumer_id] == 0:
+                        ready.append(consumer_id)
+
+            if len(ready) != num_nodes:
+                G_LOGGER.critical("Cycle detected in graph! Are there tensors with duplicate names in the graph?\n"
+                                  "Note: Nodes in the cycle are: {:}".format(self._find_cycle(remaining_producers)))
+
+            # Sorting is stable, so nodes on the same level retain their relative order.
+            self.nodes = [self.nodes[node_id] for node_id in sorted(range(num_nodes), key=lambda node_id: levels[node_id])]
+        return self
 
-            return max_input_level + 1
 
-        with self.node_ids():
-            for node in self.nodes:
-                hierarchy_levels[self._get_node_id(node)] = HierarchyDescriptor(node, level=get_hierarchy_level(node))
+    # Must be called within `node_ids()`. Given the number of unresolved producers of each node
+    # after a topological sort, returns the names of the nodes in one of the cycles in the graph.
+    def _find_cycle(self, remaining_producers):
+        local_tensors = self._local_tensors()
 
-        self.nodes = [hd.node for hd in sorted(hierarchy_levels.values())]
-        return self
+        def get_unresolved_producer(node):
+            for tensor in node.inputs:
+                if tensor.name in local_tensors:
+                    for inp_node in tensor.inputs:
+                        if remaining_producers[self._get_node_id(inp_node)] > 0:
+                            return inp_node
+
+        # Every unresolved node has at least one unresolved producer, so walking backwards
+        # from any one of them must eventually revisit a node.
+        node = self.nodes[[node_id for node_id, count in enumerate(remaining_producers) if count > 0][0]]
+        path = []
+        path_indices = {}
+        while self._get_node_id(node) not in path_indices:
+            path_indices[self._get_node_id(node)] = len(path)
+            path.append(node)
+            node = get_unresolved_producer(node)
+
+        # Report the cycle in data-flow order, starting from the node that appears first in the graph.
+        cycle = list(reversed(path[path_indices[self._get_node_id(node)]:]))
+        start = min(range(len(cycle)), key=lambda index: self._get_node_id(cycle[index]))
+        return [cycle_node.name for cycle_node in cycle[start:] + cycle[:start]]
 
 
     def tensors(self, check_duplicates=False):
@@ -425,7 +529,7 @@ class Graph(object):
         return tensor_map
 
 
-    def fold_constants(self, fold_shapes=True, recurse_subgraphs=True, partitioning=None, error_ok=True):
+    def fold_constants(self, fold_shapes=True, recurse_subgraphs=True, partitioning=None, error_ok=True, subgraph_workers=None):
         """
         Folds constants in-place in the graph. The graph must be topologically sorted prior to
         calling this function (see `toposort()`).
@@ -433,8 +537,12 @@ class Graph(object):
         This function will not remove constants after folding them. In order to get rid of
         these hanging nodes, you can run the `cleanup()` function.
 
-        *Note: Due to how this function is implemented, the graph must be exportable to ONNX,
-        and evaluable in ONNX-Runtime. Additionally, ONNX-Runtime must be installed.*
+        Common shape and arithmetic operations (e.g. `Shape`, `Gather`, `Concat`, `Reshape`, `Cast`, `Add`)
+        are evaluated directly with NumPy. Any other foldable nodes are evaluated with ONNX-Runtime.
+
+        *Note: Due to how this function is implemented, in order to fold nodes that cannot be evaluated
+        with NumPy, the graph must be exportable to ONNX, and evaluable in ONNX-Runtime.
+        Additionally, ONNX-Runtime must be installed.*
 
         Args:
             fold_shapes (bool):
@@ -453,18 +561,28 @@ class Graph(object):
                     - "basic": Partition the graph. If inference fails in one partition, other partitions will
                             remain unaffected.
                     - "recursive": Parition the graph recursively. If inference fails in a partition, the partition
-                            will be further paritioned.
+                            will be bisected to find the failing nodes, so that only those nodes and the nodes
+                            that depend on them are excluded from folding.
 
                     Defaults to None.
             error_ok (bool):
                     Whether inference errors should be suppressed.
                     When this is enabled, any errors encountered during inference will be re-raised.
                     Defaults to True.
+            subgraph_workers (int):
+                    The maximum number of processes to use to fold the subgraphs of this graph's nodes,
+                    for example the branches of `If` nodes, when `recurse_subgraphs` is enabled.
+                    Each subgraph is folded in its own process, along with any subgraphs nested inside it.
+                    Starting a process takes about as long as folding a couple thousand nodes, so fewer workers
+                    are used when the subgraphs are smaller than that per worker, or when there are fewer CPU cores.
+                    If that leaves a single worker, subgraphs are folded serially instead.
+                    Since worker processes are spawned, scripts using this option should be guarded by
+                    ``if __name__ == "__main__":``.
+                    Defaults to None, in which case subgraphs are folded serially.
 
         Returns:
             self
         """
-        import onnxruntime as rt
         from onnx_graphsurgeon.exporters.onnx_exporter import export_onnx
 
         PARTITIONING_MODES = [None, "basic", "recursive"]
@@ -609,56 +727,346 @@ class Graph(object):
             graph_constants = update_foldable_outputs(graph_constants)
 
 
-        def partition_and_infer(subgraph):
-            def get_out_node_ids():
-                # Gets the final output nodes - producer nodes of graph output tensors without other outputs.
-                with subgraph.node_ids():
-                    out_node_ids = set()
-                    for out in subgraph.outputs:
-                        if not out.outputs and not isinstance(out, Constant):
-                            for n_inp in out.inputs:
-                                out_node_ids.add(n_inp.id)
-                return out_node_ids
-
-            # Compute each output node in a separate subgraph.
-            out_node_ids = get_out_node_ids()
-            constant_values = {}
+        # Pass 3: NumPy Evaluation
+        #
+        # Common shape and arithmetic operations are evaluated directly with NumPy, which is significantly
+        # faster than exporting the graph and building an ONNX-Runtime session. Only foldable nodes that
+        # cannot be evaluated here are left for ONNX-Runtime.
+        #
+        # Each function takes a node and the values of its inputs (None for omitted optional inputs),
+        # and returns the values of its outputs, or None if the node cannot be evaluated with NumPy,
+        # in which case the node is left for ONNX-Runtime.
+
+        def get_axes(node, inputs, index=1):
+            if len(inputs) > index and inputs[index] is not None:
+                return [int(axis) for axis in inputs[index]]
+            if "axes" in node.attrs:
+                return list(node.attrs["axes"])
+            return None
+
+
+        def fold_shape(node, inputs):
+            shape = inputs[0].shape
+            start = node.attrs.get("start", 0)
+            end = node.attrs.get("end", None)
+            return [np.array(shape[start:end], dtype=np.int64)]
+
+
+        def fold_gather(node, inputs):
+            data, indices = inputs
+            return [np.take(data, indices.astype(np.int64), axis=node.attrs.get("axis", 0))]
+
+
+        def fold_concat(node, inputs):
+            return [np.concatenate([inp for inp in inputs if inp is not None], axis=node.attrs["axis"])]
+
+
+        def fold_unsqueeze(node, inputs):
+            data = inputs[0]
+            out_rank = data.ndim + len(get_axes(node, inputs))
+            axes = sorted(axis + out_rank if axis < 0 else axis for axis in get_axes(node, inputs))
+            for axis in axes:
+                data = np.expand_dims(data, axis)
+            return [data]
+
+
+        def fold_squeeze(node, inputs):
+            data = inputs[0]
+            axes = get_axes(node, inputs)
+            return [np.squeeze(data, axis=tuple(axes) if axes is not None else None)]
+
+
+        def fold_reshape(node, inputs):
+            data, shape = inputs
+            shape = [int(dim) for dim in shape]
+            if not node.attrs.get("allowzero", 0):
+                shape = [data.shape[index] if dim == 0 else dim for index, dim in enumerate(shape)]
+            return [np.reshape(data, shape)]
+
+
+        def fold_cast(node, inputs):
+            import onnx
+
+            if hasattr(onnx.helper, "tensor_dtype_to_np_dtype"):
+                to_np_dtype, to_onnx_dtype = onnx.helper.tensor_dtype_to_np_dtype, onnx.helper.np_dtype_to_tensor_dtype
+            else: # ONNX < 1.13
+                to_np_dtype, to_onnx_dtype = onnx.mapping.TENSOR_TYPE_TO_NP_TYPE.__getitem__, onnx.mapping.NP_TYPE_TO_TENSOR_TYPE.__getitem__
+
+            to = node.attrs["to"]
+            try:
+                dtype = np.dtype(to_np_dtype(to))
+                # Types which NumPy cannot represent, like BFLOAT16, map to a wider NumPy type, which does not map back to them.
+                if to_onnx_dtype(dtype) != to:
+                    return None
+            except KeyError:
+                return None
+
+            if dtype == np.object_ or inputs[0].dtype == np.object_:
+                return None
+            return [inputs[0].astype(dtype)]
+
+
+        def fold_binary_op(np_func):
+            def fold_binary(node, inputs):
+                a, b = inputs
+                return [np_func(a, b).astype(a.dtype, copy=False)]
+            return fold_binary
 
-            for index in out_node_ids: # Have to use index since 'node' is not in part
-                part = subgraph.copy()
-                out_node = part.nodes[index]
-                part.outputs = out_node.outputs
-                part.name = "Folding: {:}".format([out.name for out in part.outputs])
-                part.cleanup(remove_unused_graph_inputs=True)
-                names = [out.name for out in part.outputs]
 
+        def divide(a, b):
+            # Integer division in ONNX truncates towards zero, whereas NumPy's floor division rounds towards -inf.
+            if np.issubdtype(a.dtype, np.integer):
+                return np.sign(a) * np.sign(b) * (np.abs(a) // np.abs(b))
+            return np.divide(a, b)
+
+
+        def fold_slice(node, inputs):
+            data = inputs[0]
+            if len(inputs) >= 3:
+                starts, ends = inputs[1], inputs[2]
+                axes = get_axes(node, inputs, index=3)
+                steps = inputs[4] if len(inputs) > 4 and inputs[4] is not None else None
+            else:
+                starts, ends = node.attrs["starts"], node.attrs["ends"]
+                axes = node.attrs.get("axes", None)
+                steps = None
+
+            axes = misc.default_value(axes, list(range(len(starts))))
+            steps = misc.default_value(steps, [1] * len(starts))
+
+            slices = [slice(None)] * data.ndim
+            for start, end, axis, step in zip(starts, ends, axes, steps):
+                if step == 0:
+                    return None
+                slices[int(axis)] = slice(int(start), int(end), int(step))
+            return [data[tuple(slices)]]
+
+
+        def fold_transpose(node, inputs):
+            return [np.transpose(inputs[0], axes=node.attrs.get("perm", None))]
+
+
+        def fold_range(node, inputs):
+            start, limit, delta = inputs
+            return [np.arange(start, limit, delta, dtype=start.dtype)]
+
+
+        def fold_constant_of_shape(node, inputs):
+            if "value" in node.attrs:
+                value = node.attrs["value"].values
+            else:
+                value = np.array([0], dtype=np.float32)
+            return [np.full([int(dim) for dim in inputs[0]], value.reshape(-1)[0], dtype=value.dtype)]
+
+
+        NUMPY_FOLD_FUNCS = {
+            "Shape": fold_shape,
+            "Gather": fold_gather,
+            "Concat": fold_concat,
+            "Unsqueeze": fold_unsqueeze,
+            "Squeeze": fold_squeeze,
+            "Reshape": fold_reshape,
+            "Cast": fold_cast,
+            "Add": fold_binary_op(np.add),
+            "Sub": fold_binary_op(np.subtract),
+            "Mul": fold_binary_op(np.multiply),
+            "Div": fold_binary_op(divide),
+            "Slice": fold_slice,
+            "Transpose": fold_transpose,
+            "Range": fold_range,
+            "ConstantOfShape": fold_constant_of_shape,
+        }
+
+
+        def is_numpy_foldable(node):
+            if node.op not in NUMPY_FOLD_FUNCS:
+                return False
+
+            # Since inputs are processed in topological order, the inputs of nodes we can evaluate
+            # will already have been converted to constants.
+            inputs_const = all(isinstance(inp, Constant) or inp.is_empty() for inp in node.inputs)
+            outputs_foldable = all(out.name in graph_constants and not isinstance(out, Constant) for out in node.outputs)
+            return node.outputs and inputs_const and outputs_foldable
+
+
+        numpy_folded_tensors = set()
+        for node in graph_clone.nodes:
+            if not is_numpy_foldable(node):
+                continue
+
+            try:
+                values = NUMPY_FOLD_FUNCS[node.op](node, [None if inp.is_empty() else inp.values for inp in node.inputs])
+            except Exception as err:
+                G_LOGGER.verbose("Could not evaluate node: {:} ({:}) with NumPy. Will fall back to ONNX-Runtime. "
+                                 "Note: Error was:\n{:}".format(node.name, node.op, err))
+                continue
+
+            if values is None:
+                G_LOGGER.verbose("Could not evaluate node: {:} ({:}) with NumPy. Will fall back to ONNX-Runtime.".format(node.name, node.op))
+                continue
+
+            # Make copies so that folded values never alias the values of other constants.
+            values = [np.array(value) for value in values]
+
+            for out, value in zip(list(node.outputs), values):
+                G_LOGGER.ultra_verbose("Folded tensor: {:} with NumPy to: {:}".format(out.name, value))
+                graph_constants[out.name] = out.to_constant(value)
+                graph_constants[out.name].inputs.clear()
+                numpy_folded_tensors.add(out.name)
+
+
+        def partition_and_infer(subgraph):
+            # Rather than copying the graph for each partition, partitions are evaluated by building lightweight
+            # graphs that share nodes with `subgraph`. Dependencies are always determined from the current
+            # state of `subgraph`, since tensors that have been computed are converted to constants.
+            start_time = time.perf_counter()
+            foreign_tensors_cache = {}
+
+            def get_input_tensors(node):
+                inputs = list(node.inputs)
+                for attr in node.attrs.values():
+                    if isinstance(attr, Graph):
+                        inputs += list(attr._foreign_tensors(foreign_tensors_cache).values())
+                return inputs
+
+            def get_producer_ids(node):
+                return set([subgraph._get_node_id(producer) for tensor in get_input_tensors(node) for producer in tensor.inputs])
+
+            # Returns the IDs of the specified node and all nodes it depends on, in topological order.
+            def get_partition(out_node_id):
+                partition = set([out_node_id])
+                stack = [out_node_id]
+                while stack:
+                    for producer_id in get_producer_ids(subgraph.nodes[stack.pop()]):
+                        if producer_id not in partition:
+                            partition.add(producer_id)
+                            stack.append(producer_id)
+                return sorted(partition)
+
+            # Returns the tensors produced by the specified nodes which are required by `needed_by` or are in `output_names`.
+            def get_partition_outputs(node_ids, needed_by, output_names):
+                needed_names = set(output_names)
+                needed_names.update([tensor.name for node_id in needed_by for tensor in get_input_tensors(subgraph.nodes[node_id])])
+
+                outputs = OrderedDict()
+                for node_id in node_ids:
+                    outputs.update({out.name: out for out in subgraph.nodes[node_id].outputs if out.name in needed_names})
+                return list(outputs.values())
+
+            def infer(node_ids, outputs):
+                if not outputs:
+                    return {}
+
+                part = Graph(nodes=[subgraph.nodes[node_id] for node_id in node_ids], outputs=outputs, opset=subgraph.opset,
+                             name="Folding: {:}".format([out.name for out in outputs]))
+                names = [out.name for out in outputs]
+                # Determining types is not trivial, and ONNX-RT does its own type inference.
+                sess = rt.InferenceSession(export_onnx(part, do_type_check=False).SerializeToString())
+                return {name: val for name, val in zip(names, sess.run(names, {}))}
+
+            def try_infer(node_ids, outputs):
                 try:
-                    # Determining types is not trivial, and ONNX-RT does its own type inference.
-                    sess = rt.InferenceSession(export_onnx(part, do_type_check=False).SerializeToString())
-                    values = sess.run(names, {})
+                    return infer(node_ids, outputs), None
                 except Exception as err:
-                    G_LOGGER.warning("Inference failed for subgraph: {:}. Note: Error was:\n{:}".format(part.name, err))
+                    return None, err
+
+            # Evaluates as much of a failed partition as possible. Each failing node is found by bisecting
+            # the (topologically sorted) partition for its longest prefix that can be evaluated.
+            # Returns the computed values as well as the IDs of nodes that could not be folded.
+            def bisect_and_infer(node_ids, output_names):
+                values = {}
+                unfolded_ids = set()
+                pending = list(node_ids)
+
+                while pending:
+                    pending_values, err = try_infer(pending, get_partition_outputs(pending, [], output_names))
+                    if err is None:
+                        values.update(pending_values)
+                        break
+
+                    # Invariant: A prefix of length `good` can be evaluated, while `pending` as a whole cannot.
+                    good, bad = 0, len(pending)
+                    good_values = {}
+                    while bad - good > 1:
+                        mid = (good + bad) // 2
+                        prefix, rest = pending[:mid], pending[mid:]
+                        prefix_values, _ = try_infer(prefix, get_partition_outputs(prefix, rest, output_names))
+                        if prefix_values is not None:
+                            good, good_values = mid, prefix_values
+                        else:
+                            bad = mid
+
+                    failed_id = pending[good]
+                    failed_node = subgraph.nodes[failed_id]
+                    G_LOGGER.warning("Inference failed for node: {:} ({:}). This node, and any nodes that depend on it, "
+                                     "will not be folded.".format(failed_node.name, failed_node.op))
+
+                    # Values computed for the prefix are converted to constants so they need not be recomputed.
+                    values.update(good_values)
+                    for tensor in get_partition_outputs(pending[:good], pending[good:], output_names):
+                        tensor.to_constant(good_values[tensor.name])
+                        tensor.inputs.clear()
+
+                    # Nodes that depend on the failed node cannot be folded either.
+                    unfolded_ids.add(failed_id)
+                    remaining = []
+                    for node_id in pending[good + 1:]:
+                        if get_producer_ids(subgraph.nodes[node_id]) & unfolded_ids:
+                            unfolded_ids.add(node_id)
+                        else:
+                            remaining.append(node_id)
+                    pending = remaining
+
+                return values, unfolded_ids
+
+
+            constant_values = {}
+            num_succeeded = 0
+            num_failed = 0
+            with subgraph.node_ids():
+                # Gets the final output nodes - producer nodes of graph output tensors without other outputs.
+                out_node_ids = set()
+                for out in subgraph.outputs:
+                    if not out.outputs and not isinstance(out, Constant):
+                        for n_inp in out.inputs:
+                            out_node_ids.add(subgraph._get_node_id(n_inp))
+
+                # Compute each output node in a separate partition.
+                for out_node_id in sorted(out_node_ids):
+                    partition = get_partition(out_node_id)
+                    partition_ids = set(partition)
+                    output_names = [out.name for out in subgraph.outputs
+                                        if out.inputs and subgraph._get_node_id(out.inputs[0]) in partition_ids
+                                            and out.name not in constant_values]
+                    G_LOGGER.verbose("Folding partition with {:} node(s) for: {:}".format(len(partition), output_names))
+
+                    values, err = try_infer(partition, get_partition_outputs(partition, [], output_names))
+                    if err is None:
+                        num_succeeded += 1
+                        constant_values.update(values)
+                        continue
+
+                    num_failed += 1
+                    G_LOGGER.warning("Inference failed for partition: {:}. Note: Error was:\n{:}".format(output_names, err))
                     if partitioning == "recursive":
                         G_LOGGER.verbose("Attempting to recursively partition subgraph")
-                        # Partition failed, peel off last node.
-                        # We only need to remove one node, so avoid doing an expensive call to cleanup()
-                        part.outputs = out_node.inputs
-                        del part.nodes[part.nodes.index(out_node)]
-                        out_node.outputs.clear()
-                        out_node.inputs.clear()
+                        values, unfolded_ids = bisect_and_infer(partition, output_names)
+
+                        # Only keep values that are needed: those that were requested, or that are used by nodes that could not be folded.
+                        needed_names = set(output_names)
+                        needed_names.update([tensor.name for node_id in unfolded_ids for tensor in get_input_tensors(subgraph.nodes[node_id])])
+                        constant_values.update({name: val for name, val in values.items() if name in needed_names})
                     else:
                         G_LOGGER.info("You may see better results if you set partitioning='recursive'")
                         if not error_ok:
                             raise err
 
-                    constant_values.update(partition_and_infer(part))
-                else:
-                    constant_values.update({name: val for name, val in zip(names, values)})
-
+            G_LOGGER.info("Folded {:} of {:} partition(s) successfully ({:} failed) in {:.3f} seconds".format(
+                            num_succeeded, num_succeeded + num_failed, num_failed, time.perf_counter() - start_time))
             return constant_values
 
 
-        # Next, evaluate the foldable variables with ONNX-Runtime
+        # Next, evaluate the remaining foldable variables with ONNX-Runtime
 
         # Only evaluate foldable values that have non-foldable outputs or are graph outputs.
         # Otherwise, if all the outputs are foldable, then we can just evaluate the outputs directly.
@@ -668,27 +1076,61 @@ class Graph(object):
             has_non_foldable_outputs = any(out.name not in graph_constants for out in tensor.outputs)
             return non_const and (is_graph_output or has_non_foldable_outputs)
 
+        # Similarly, we only need to keep values computed with NumPy if they are graph outputs, or are used by nodes
+        # that could not be evaluated with NumPy. The outputs of nodes evaluated with NumPy were converted to constants
+        # and hence are no longer attached to the node.
+        graph_output_names = set([out.name for out in graph_clone.outputs])
+
+        def should_store_numpy_folded(tensor):
+            is_graph_output = not tensor.outputs or tensor.name in graph_output_names
+            has_non_numpy_folded_outputs = any(node.outputs for node in tensor.outputs)
+            return is_graph_output or has_non_numpy_folded_outputs
+
+        # Using ._values avoids a deep copy of the values.
+        # This must happen before cleanup(), which detaches unused nodes from their input tensors.
+        constant_values = {name: tensor._values for name, tensor in graph_constants.items()
+                            if isinstance(tensor, Constant) and (name not in numpy_folded_tensors or should_store_numpy_folded(tensor))}
+
         graph_clone.outputs = [t for t in graph_constants.values() if should_eval_foldable(t)]
         G_LOGGER.debug("Folding tensors: {:}".format(graph_clone.outputs))
         graph_clone.cleanup(remove_unused_graph_inputs=True)
 
-        # Using ._values avoids a deep copy of the values.
-        constant_values = {name: tensor._values for name, tensor in graph_constants.items() if isinstance(tensor, Constant)}
+        # ONNX-Runtime cannot resolve references to external data files in models provided as bytes,
+        # so values that were imported lazily from external data must be loaded before they are exported.
+        def load_external_values(graph):
+            for tensor in graph.tensors().values():
+                if isinstance(tensor, Constant) and isinstance(tensor._values, LazyValues) and tensor._values.is_external():
+                    tensor.values = tensor._values.load()
+
+            for node in graph.nodes:
+                for attr in node.attrs.values():
+                    if isinstance(attr, Graph):
+                        load_external_values(attr)
+
         if graph_clone.outputs:
-            if partitioning:
-                constant_values.update(partition_and_infer(graph_clone))
+            try:
+                import onnxruntime as rt
+            except ImportError:
+                G_LOGGER.warning("ONNX-Runtime is not installed, so the following tensors, which could not be evaluated "
+                                 "with NumPy, will not be folded: {:}".format([t.name for t in graph_clone.outputs]))
+                if not error_ok:
+                    raise
             else:
-                names = [t.name for t in graph_clone.outputs]
-                try:
-                    sess = rt.InferenceSession(export_onnx(graph_clone, do_type_check=False).SerializeToString())
-                    values = sess.run(names, {})
-                    constant_values.update({name: val for name, val in zip(names, values)})
-                except Exception as err:
-                    G_LOGGER.warning("Inference failed. You may want to try enabling partitioning to see better results. "
-                                    "Note: Error was:\n{:}".format(err))
-                    G_LOGGER.verbose("Note: Graph was:\n{:}".format(graph_clone))
-                    if not error_ok:
-                        raise
+                load_external_values(graph_clone)
+                if partitioning:
+                    constant_values.update(partition_and_infer(graph_clone))
+                else:
+                    names = [t.name for t in graph_clone.outputs]
+                    try:
+                        sess = rt.InferenceSession(export_onnx(graph_clone, do_type_check=False).SerializeToString())
+                        values = sess.run(names, {})
+                        constant_values.update({name: val for name, val in zip(names, values)})
+                    except Exception as err:
+                        G_LOGGER.warning("Inference failed. You may want to try enabling partitioning to see better results. "
+                                        "Note: Error was:\n{:}".format(err))
+                        G_LOGGER.verbose("Note: Graph was:\n{:}".format(graph_clone))
+                        if not error_ok:
+                            raise
         elif not constant_values:
             G_LOGGER.info("Could not find any nodes in this graph ({:}) that can be folded. "
                           "This could mean that constant folding has already been run on this graph. "
@@ -706,10 +1148,41 @@ class Graph(object):
 
         # Folding subgraphs after the outer graph can lead to better folding.
         def fold_subgraphs():
-            for node in self.nodes:
-                for attr in node.attrs.values():
-                    if isinstance(attr, Graph):
-                        attr.fold_constants(fold_shapes=fold_shapes, partitioning=partitioning)
+            subgraphs = [attr for node in self.nodes for attr in node.attrs.values() if isinstance(attr, Graph)]
+
+            num_workers = 1
+            if subgraph_workers is not None and subgraph_workers > 1 and len(subgraphs) > 1:
+                num_nodes = sum(len(graph.nodes) for subgraph in subgraphs for graph in _iterate_graphs(subgraph))
+                num_workers = min(subgraph_workers, len(subgraphs), os.cpu_count() or 1,
+                                  num_nodes // _MIN_NODES_PER_SUBGRAPH_WORKER)
+
+            if num_workers <= 1:
+                for subgraph in subgraphs:
+                    subgraph.fold_constants(fold_shapes=fold_shapes, partitioning=partitioning)
+                return
+
+            import concurrent.futures
+            import multiprocessing
+            from onnx_graphsurgeon.exporters.onnx_exporter import OnnxExporter
+
+            # Subgraphs are independent of each other once the outer graph has been folded, so each one can
+            # be folded in a separate process. The exported subgraphs include the constants they use from outer graphs
+            # as initializers. Workers are spawned rather than forked since ONNX-Runtime is not fork-safe.
+            G_LOGGER.verbose("Folding {:} subgraph(s) of {:} with {:} worker(s)".format(len(subgraphs), self.name, num_workers))
+            with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+                futures = [executor.submit(_fold_exported_subgraph, OnnxExporter.export_graph(subgraph, do_type_check=False).SerializeToString(),
+                                           subgraph.opset, subgraph.import_domains, _get_external_data_dir(subgraph), fold_shapes, partitioning)
+                           for subgraph in subgraphs]
+
+                # Apply the results in the original order so that the outcome does not depend on scheduling.
+                for subgraph, future in zip(subgraphs, futures):
+                    for graph, graph_values in zip(_iterate_graphs(subgraph), future.result()):
+                        graph_tensors = graph.tensors()
+                        for name, values in graph_values.items():
+                            tensor = graph_tensors[name]
+                            if not isinstance(tensor, Constant):
+                                tensor.to_constant(values)
+                                tensor.inputs.clear()
 
         if recurse_subgraphs:
             fold_subgraphs()
@@ -839,3 +1312,39 @@ class Graph(object):
 
     def __repr__(self):
         return self.__str__()
+
+
+# Starting a worker process to fold subgraphs, which imports ONNX and ONNX-Runtime, takes about as long as folding
+# 2000 nodes with ONNX-Runtime. Fewer workers are used if they would have less work than that.
+_MIN_NODES_PER_SUBGRAPH_WORKER = 2000
+
+
+# Yields the graph and all the subgraphs nested inside it, in a deterministic order.
+def _iterate_graphs(graph):
+    yield graph
+    for node in graph.nodes:
+        for attr in node.attrs.values():
+            if isinstance(attr, Graph):
+                yield from _iterate_graphs(attr)
+
+
+# Returns the directory containing the external data of any constants which were imported lazily, if any.
+def _get_external_data_dir(graph):
+    for subgraph in _iterate_graphs(graph):
+        for tensor in subgraph.tensors().values():
+            if isinstance(tensor, Constant) and isinstance(tensor._values, LazyValues) and tensor._values.is_external():
+                return tensor._values.base_dir
+    return None
+
+
+# Folds a subgraph exported with OnnxExporter.export_graph() in a worker process.
+# Returns the values of the tensors that were folded in the subgraph and each of its nested subgraphs, in the
+# order of _iterate_graphs(), so that they can be applied to the original graph.
+def _fold_exported_subgraph(graph_bytes, opset, import_domains, base_dir, fold_shapes, partitioning):
+    import onnx
+    from onnx_graphsurgeon.importers.onnx_importer import OnnxImporter
+
+    graph = OnnxImporter.import_graph(onnx.GraphProto.FromString(graph_bytes), opset=opset, import_domains=import_domains, base_dir=base_dir)
+    variables = [[tensor for tensor in subgraph.tensors().values() if isinstance(tensor, Variable)] for subgraph in _iterate_graphs(graph)]
+    graph.fold_constants(fold_shapes=fold_shapes, partitioning=partitioning)
+    return [{tensor.name: tensor._values for tensor in tensors if isinstance(tensor, Constant)} for tensors in variables]
@@ -0,0 +1,297 @@
+#
+# Copyright (c) 2021, NVIDIA CORPORATION. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from collections import OrderedDict
+from typing import List
+
+from onnx_graphsurgeon.ir.node import Node
+from onnx_graphsurgeon.ir.tensor import Tensor
+from onnx_graphsurgeon.logger.logger import G_LOGGER
+from onnx_graphsurgeon.util import misc
+
+
+# Implementation notes:
+#
+# The index keeps a reference count for each tensor, which counts the number of times the tensor is used by
+# the nodes in the graph and by the graph inputs and outputs. A tensor is in the graph as long as its count is non-zero.
+#
+# Modifications are recorded, but only applied the next time the index is queried:
+#   - SynchronizedLists, nodes and tensors notify the index (see misc.GRAPH_OBSERVERS) of changes to their
+#       inputs, outputs, names and ops. Nodes in the graph are then marked dirty, and re-indexed when the index is next used.
+#   - The node, input and output lists of the graph are replaced with ObservedLists, so that the index
+#       knows exactly which nodes were added or removed. Assigning a new list to `graph.nodes` causes a full rebuild.
+#
+# Hence, the cost of keeping the index up to date is proportional to the size of the modifications to the graph.
+class GraphIndex(object):
+    def __init__(self, graph):
+        """
+        A persistent index of the nodes and tensors in a graph.
+        This should not be constructed directly - instead, use `Graph.index()`.
+
+        Args:
+            graph (Graph): The graph to index.
+        """
+        self.graph = graph
+        self._rebuild_needed = True
+        misc.GRAPH_OBSERVERS.add(self)
+
+
+    def _observe_nodes(self, nodes):
+        self._rebuild_needed = True
+        return misc.ObservedList(self._on_nodes_modified, nodes)
+
+
+    def _observe_io(self, tensors):
+        self._io_dirty = True
+        return misc.ObservedList(self._on_io_modified, tensors)
+
+
+    def _detach(self):
+        misc.GRAPH_OBSERVERS.discard(self)
+
+
+    def _reset(self):
+        self._nodes = {} # Dict[int, List[Node, int]]: Maps node ids to nodes and the number of times they appear in the graph.
+        self._node_entries = {} # Dict[int, Tuple[str, str, List[Tensor]]]: The name, op, and tensors of each indexed node.
+        self._nodes_by_name = {} # Dict[str, OrderedDict[int, Node]]
+        self._nodes_by_op = {} # Dict[str, OrderedDict[int, Node]]
+
+        self._tensors = {} # Dict[int, List[Tensor, int]]: Maps tensor ids to tensors and their reference counts.
+        self._tensor_names = {} # Dict[int, str]: The name of each tensor at the time it was indexed.
+        self._tensors_by_name = {} # Dict[str, OrderedDict[int, Tensor]]
+        self._io_tensors = []
+
+        self._dirty_nodes = OrderedDict()
+        self._dirty_tensors = OrderedDict()
+        self._io_dirty = True
+
+        for node in list.__iter__(self.graph.nodes):
+            self._add_node(node)
+        self._rebuild_needed = False
+
+
+    def _on_modified(self, obj):
+        # Everything will be re-indexed anyway.
+        if self._rebuild_needed:
+            return
+
+        obj_id = id(obj)
+        if obj_id in self._nodes:
+            self._dirty_nodes[obj_id] = obj
+        elif obj_id in self._tensors:
+            self._dirty_tensors[obj_id] = obj
+
+
+    def _on_nodes_modified(self, added, removed):
+        if self._rebuild_needed:
+            return
+
+        for node in added:
+            self._add_node(node)
+
+        for node in removed:
+            entry = self._nodes[id(node)]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._nodes[id(node)]
+                self._dirty_nodes[id(node)] = node
+
+
+    def _on_io_modified(self, added, removed):
+        self._io_dirty = True
+
+
+    def _add_node(self, node):
+        entry = self._nodes.setdefault(id(node), [node, 0])
+        entry[1] += 1
+        self._dirty_nodes[id(node)] = node
+
+
+    @staticmethod
+    def _add_to_map(mapping, key, obj):
+        mapping.setdefault(key, OrderedDict())[id(obj)] = obj
+
+
+    @staticmethod
+    def _remove_from_map(mapping, key, obj):
+        objs = mapping[key]
+        del objs[id(obj)]
+        if not objs:
+            del mapping[key]
+
+
+    def _add_tensor_ref(self, tensor):
+        entry = self._tensors.get(id(tensor))
+        if entry is not None:
+            entry[1] += 1
+            return
+
+        self._tensors[id(tensor)] = [tensor, 1]
+        self._tensor_names[id(tensor)] = tensor.name
+        # Empty tensors are omitted, like in Graph.tensors()
+        if tensor.name:
+            self._add_to_map(self._tensors_by_name, tensor.name, tensor)
+
+
+    def _remove_tensor_ref(self, tensor):
+        entry = self._tensors[id(tensor)]
+        entry[1] -= 1
+        if entry[1] > 0:
+            return
+
+        del self._tensors[id(tensor)]
+        name = self._tensor_names.pop(id(tensor))
+        if name:
+            self._remove_from_map(self._tensors_by_name, name, tensor)
+
+
+    def _sync(self):
+        if self._rebuild_needed:
+            self._reset()
+
+        for node_id, node in self._dirty_nodes.items():
+            old_entry = self._node_entries.pop(node_id, None)
+            new_entry = None
+            if node_id in self._nodes:
+                new_entry = (node.name, node.op, list(node.inputs) + list(node.outputs))
+                self._node_entries[node_id] = new_entry
+
+            # Add new references before removing old ones so that tensors which are still used are not re-indexed.
+            for tensor in (new_entry[2] if new_entry else []):
+                self._add_tensor_ref(tensor)
+            for tensor in (old_entry[2] if old_entry else []):
+                self._remove_tensor_ref(tensor)
+
+            for mapping, key_index in [(self._nodes_by_name, 0), (self._nodes_by_op, 1)]:
+                if old_entry and (not new_entry or old_entry[key_index] != new_entry[key_index]):
+                    self._remove_from_map(mapping, old_entry[key_index], node)
+                if new_entry and (not old_entry or old_entry[key_index] != new_entry[key_index]):
+                    self._add_to_map(mapping, new_entry[key_index], node)
+        self._dirty_nodes.clear()
+
+        if self._io_dirty:
+            io_tensors = list(self.graph.inputs) + list(self.graph.outputs)
+            for tensor in io_tensors:
+                self._add_tensor_ref(tensor)
+            for tensor in self._io_tensors:
+                self._remove_tensor_ref(tensor)
+            self._io_tensors = io_tensors
+            self._io_dirty = False
+
+        # Handle renamed tensors
+        for tensor_id, tensor in self._dirty_tensors.items():
+            if tensor_id in self._tensors and self._tensor_names[tensor_id] != tensor.name:
+                old_name = self._tensor_names[tensor_id]
+                if old_name:
+                    self._remove_from_map(self._tensors_by_name, old_name, tensor)
+                self._tensor_names[tensor_id] = tensor.name
+                if tensor.name:
+                    self._add_to_map(self._tensors_by_name, tensor.name, tensor)
+        self._dirty_tensors.clear()
+
+
+    def tensors(self) -> "OrderedDict[str, Tensor]":
+        """
+        Returns a mapping of tensor names to all the tensors used by the graph.
+        Unlike `Graph.tensors()`, the tensors are not in any particular order.
+
+        Raises:
+            OnnxGraphSurgeonException: If multiple distinct tensors in the graph share the same name.
+
+        Returns:
+            OrderedDict[str, Tensor]: A mapping of tensor names to tensors.
+        """
+        self._sync()
+        return OrderedDict([(name, self.get_tensor(name)) for name in self._tensors_by_name])
+
+
+    def get_tensor(self, name: str) -> Tensor:
+        """
+        Looks up a tensor in the graph by name.
+
+        Args:
+            name (str): The name of the tensor.
+
+        Raises:
+            OnnxGraphSurgeonException: If multiple distinct tensors in the graph share the same name.
+
+        Returns:
+            Tensor: The tensor, or None if there is no tensor with that name in the graph.
+        """
+        self._sync()
+        tensors = list(self._tensors_by_name.get(name, {}).values())
+        if len(tensors) > 1:
+            G_LOGGER.critical("Found distinct tensors that share the same name:\n{:}".format(
+                "\n".join(["[id: {:}] {:}".format(id(tensor), tensor) for tensor in tensors])))
+        return tensors[0] if tensors else None
+
+
+    def nodes_by_name(self, name: str) -> List[Node]:
+        """
+        Looks up nodes in the graph by name.
+
+        Args:
+            name (str): The name of the nodes.
+
+        Returns:
+            List[Node]: The nodes with the specified name. Each node is included only once.
+        """
+        self._sync()
+        return list(self._nodes_by_name.get(name, {}).values())
+
+
+    def nodes_by_op(self, op: str) -> List[Node]:
+        """
+        Looks up nodes in the graph by op.
+
+        Args:
+            op (str): The op of the nodes, e.g. "Conv".
+
+        Returns:
+            List[Node]: The nodes with the specified op. Each node is included only once.
+        """
+        self._sync()
+        return list(self._nodes_by_op.get(op, {}).values())
+
+
+    def producers(self, tensor: Tensor) -> List[Node]:
+        """
+        Returns the nodes in the graph which produce the specified tensor.
+        Nodes that are not part of the graph, for example nodes in subgraphs, are excluded.
+
+        Args:
+            tensor (Tensor): The tensor.
+
+        Returns:
+            List[Node]: The producers of the tensor.
+        """
+        self._sync()
+        return [node for node in tensor.inputs if id(node) in self._nodes]
+
+
+    def consumers(self, tensor: Tensor) -> List[Node]:
+        """
+        Returns the nodes in the graph which consume the specified tensor.
+        Nodes that are not part of the graph, for example nodes in subgraphs, are excluded.
+
+        Args:
+            tensor (Tensor): The tensor.
+
+        Returns:
+            List[Node]: The consumers of the tensor.
+        """
+        self._sync()
+        return [node for node in tensor.outputs if id(node) in self._nodes]
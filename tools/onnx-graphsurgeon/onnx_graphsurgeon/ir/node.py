@@ -91,6 +91,8 @@ class Node(object):
                 super().__setattr__(name, value)
         else:
             super().__setattr__(name, value)
+            if name in ["name", "op"] and misc.GRAPH_OBSERVERS:
+                misc.notify_modified(self)
 
 
     def copy(self, inputs: List["Tensor"]=None, outputs: List["Tensor"]=None, tensor_map=None):
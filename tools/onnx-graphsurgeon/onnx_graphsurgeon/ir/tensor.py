@@ -19,6 +19,9 @@ from onnx_graphsurgeon.util import misc
 
 from typing import Set, Sequence, Union
 import numpy as np
+import os
+import sys
+import weakref
 
 
 class Tensor(object):
@@ -41,6 +44,8 @@ class Tensor(object):
                 super().__setattr__(name, value)
         else:
             super().__setattr__(name, value)
+            if name == "name" and misc.GRAPH_OBSERVERS:
+                misc.notify_modified(self)
 
 
     def is_empty(self):
@@ -188,31 +193,89 @@ class Variable(Tensor):
         return Variable(self.name, self.dtype, self.shape)
 
 
+# Memory maps of external data files, shared by all LazyValues that reference the same file.
+# Entries are dropped automatically once no arrays backed by the mapping remain.
+_EXTERNAL_DATA_MMAPS = weakref.WeakValueDictionary()
+
+def _mmap_external_data_file(path):
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    mmap = _EXTERNAL_DATA_MMAPS.get(key)
+    if mmap is None:
+        # Copy-on-write, so that modifying the values never modifies the file on disk.
+        mmap = np.memmap(path, dtype=np.uint8, mode="c")
+        _EXTERNAL_DATA_MMAPS[key] = mmap
+    return mmap
+
+
 class LazyValues(object):
     """
     A special object that represents constant tensor values that should be lazily loaded.
     """
-    def __init__(self, tensor):
+    def __init__(self, tensor, base_dir=None):
         """
         Args:
             tensor (onnx.TensorProto): The ONNX tensor that this instance should lazily load.
+            base_dir (str):
+                    The directory containing any external data files referenced by the tensor.
+                    If this is provided, externally stored values are memory-mapped rather than read.
+                    Defaults to None.
         """
         from onnx_graphsurgeon.importers.onnx_importer import get_onnx_tensor_shape, get_onnx_tensor_dtype
         self.tensor = tensor
+        self.base_dir = base_dir
         self.shape = get_onnx_tensor_shape(self.tensor)
         self.dtype = get_onnx_tensor_dtype(self.tensor)
 
 
+    def is_external(self):
+        """
+        Whether the values of the tensor are stored in an external data file and have not been loaded yet.
+
+        Returns:
+            bool
+        """
+        import onnx
+        return self.tensor.data_location == onnx.TensorProto.EXTERNAL and not self.tensor.HasField("raw_data")
+
+
     def load(self):
         """
         Load a numpy array from the underlying tensor values.
 
+        Values stored in an external data file are memory-mapped when the directory containing
+        the file is known, so that no data is actually read until it is used. Values of types
+        which NumPy cannot represent, like BFLOAT16, are read and converted instead.
+
         Returns:
             np.array: A numpy array containing the values of the tensor.
         """
         import onnx
+        import onnx.external_data_helper
         import onnx.numpy_helper
-        return np.array(onnx.numpy_helper.to_array(self.tensor))
+        from onnx_graphsurgeon.importers.onnx_importer import has_numpy_equivalent
+
+        if (self.is_external() and self.base_dir is not None and has_numpy_equivalent(self.tensor.data_type)
+                and sys.byteorder == "little"):
+            info = onnx.external_data_helper.ExternalDataInfo(self.tensor)
+            dtype = np.dtype(self.dtype)
+            offset = info.offset or 0
+            shape = tuple(self.shape)
+            nbytes = int(np.prod(shape)) * dtype.itemsize
+            if nbytes == 0:
+                return np.empty(shape, dtype=dtype)
+
+            mmap = _mmap_external_data_file(os.path.join(self.base_dir, info.location))
+            if offset + nbytes > mmap.size or (info.length is not None and info.length < nbytes):
+                G_LOGGER.critical("External data for tensor: {:} is truncated. Expected {:} bytes at offset {:} of: {:}".format(
+                                  self.tensor.name, nbytes, offset, info.location))
+            return mmap[offset:offset + nbytes].view(dtype).reshape(shape)
+
+        values = onnx.numpy_helper.to_array(self.tensor, base_dir=misc.default_value(self.base_dir, ""))
+        # `to_array` returns a read-only view of `raw_data`. In all other cases, it has already made a copy.
+        if not values.flags.writeable:
+            values = np.array(values)
+        return values
 
 
     def __str__(self):
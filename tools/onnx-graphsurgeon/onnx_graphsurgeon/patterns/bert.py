@@ -0,0 +1,179 @@
+#
+# Copyright (c) 2021, NVIDIA CORPORATION. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+# Built-in patterns for the fusions used by BERT, as exported to ONNX by frameworks like PyTorch,
+# along with replacements that use the corresponding TensorRT plugins (see the BERT demo).
+
+from collections import OrderedDict
+
+import numpy as np
+from onnx_graphsurgeon.ir.graph import Graph
+from onnx_graphsurgeon.ir.node import Node
+from onnx_graphsurgeon.ir.tensor import Constant
+from onnx_graphsurgeon.logger.logger import G_LOGGER
+from onnx_graphsurgeon.patterns.pattern import Match, Pattern
+
+GELU_PLUGIN = "CustomGeluPluginDynamic"
+SKIP_LAYER_NORM_PLUGIN = "CustomSkipLayerNormPluginDynamic"
+
+
+def is_scalar(value, rtol=1e-3):
+    """
+    Returns a function that checks whether a tensor is a constant containing only the specified value.
+    """
+    def check(tensor):
+        return tensor.values.size > 0 and np.allclose(tensor.values, value, rtol=rtol)
+    return check
+
+
+def is_last_axis(axes):
+    return axes is not None and len(axes) == 1 and axes[0] == -1
+
+
+def add_layer_norm(pattern, x):
+    """
+    Adds the nodes of a layer normalization over the last axis of `x` to the pattern.
+    The scale and bias constants are named "gamma" and "beta" respectively.
+
+    Returns:
+        PatternTensor: The output of the layer normalization.
+    """
+    mean = pattern.node("ReduceMean", inputs=[x], attrs={"axes": is_last_axis})
+    centered = pattern.node("Sub", inputs=[x, mean])
+    squared = pattern.node("Pow", inputs=[centered, pattern.input("two", constant=True, check=is_scalar(2.0))])
+    variance = pattern.node("ReduceMean", inputs=[squared], attrs={"axes": is_last_axis})
+    stabilized = pattern.node("Add", inputs=[variance, pattern.input("epsilon", constant=True)])
+    stddev = pattern.node("Sqrt", inputs=[stabilized])
+    normalized = pattern.node("Div", inputs=[centered, stddev])
+    scaled = pattern.node("Mul", inputs=[normalized, pattern.input("gamma", constant=True)])
+    return pattern.node("Add", inputs=[scaled, pattern.input("beta", constant=True)], name="layer_norm")
+
+
+def layer_norm():
+    """
+    Creates a pattern matching a layer normalization over the last axis.
+
+    Returns:
+        Pattern: A pattern with a single input, "x".
+    """
+    pattern = Pattern()
+    add_layer_norm(pattern, pattern.input("x"))
+    return pattern
+
+
+def skip_layer_norm(with_bias=False):
+    """
+    Creates a pattern matching a residual connection followed by a layer normalization, which
+    TensorRT's SkipLayerNorm plugin implements.
+
+    Args:
+        with_bias (bool):
+                Whether to also match the addition of a constant bias to the first input, "x",
+                like the bias of the preceding fully connected layer. Defaults to False.
+
+    Returns:
+        Pattern: A pattern with inputs, "x", "skip" and, if `with_bias` is set, "bias".
+    """
+    pattern = Pattern()
+    x = pattern.input("x")
+    if with_bias:
+        x = pattern.node("Add", inputs=[x, pattern.input("bias", constant=True)], name="bias_add")
+    residual = pattern.node("Add", inputs=[x, pattern.input("skip")], name="residual")
+    add_layer_norm(pattern, residual)
+    return pattern
+
+
+def gelu():
+    """
+    Creates a pattern matching the exact (erf-based) GELU activation: `0.5 * x * (1 + erf(x / sqrt(2)))`.
+
+    Returns:
+        Pattern: A pattern with a single input, "x".
+    """
+    pattern = Pattern()
+    x = pattern.input("x")
+    scaled = pattern.node("Div", inputs=[x, pattern.input("sqrt2", constant=True, check=is_scalar(np.sqrt(2)))])
+    erf = pattern.node("Erf", inputs=[scaled])
+    shifted = pattern.node("Add", inputs=[erf, pattern.input("one", constant=True, check=is_scalar(1.0))])
+    product = pattern.node("Mul", inputs=[x, shifted])
+    pattern.node("Mul", inputs=[product, pattern.input("half", constant=True, check=is_scalar(0.5))], name="gelu")
+    return pattern
+
+
+def replace_skip_layer_norm(match: Match, type_id: int=0):
+    """
+    Creates a SkipLayerNorm plugin node to replace a match of `skip_layer_norm()`.
+
+    Args:
+        match (Match): The match.
+        type_id (int): The data type the plugin should use. 0 for FP32, 1 for FP16.
+
+    Returns:
+        Node: The plugin node, or None if the scale and bias do not have the expected shapes.
+    """
+    gamma, beta = match["gamma"].values, match["beta"].values
+    if gamma.ndim != 1 or gamma.shape != beta.shape:
+        G_LOGGER.warning("Skipping SkipLayerNorm fusion because gamma and beta are not 1D tensors of the same shape: {:}".format(match))
+        return None
+
+    attrs = OrderedDict([
+        ("ld", int(gamma.shape[0])),
+        ("type_id", type_id),
+        ("beta", Constant("{:}_beta".format(match["layer_norm"].name), beta.astype(np.float32))),
+        ("gamma", Constant("{:}_gamma".format(match["layer_norm"].name), gamma.astype(np.float32))),
+    ])
+    if "bias" in match.tensors:
+        attrs["bias"] = Constant("{:}_bias".format(match["layer_norm"].name), match["bias"].values.astype(np.float32))
+
+    return Node(SKIP_LAYER_NORM_PLUGIN, name=match["layer_norm"].name, attrs=attrs,
+                inputs=[match["x"], match["skip"]], outputs=list(match.outputs))
+
+
+def replace_gelu(match: Match, type_id: int=0):
+    """
+    Creates a GELU plugin node to replace a match of `gelu()`.
+
+    Args:
+        match (Match): The match.
+        type_id (int): The data type the plugin should use. 0 for FP32, 1 for FP16.
+
+    Returns:
+        Node: The plugin node.
+    """
+    return Node(GELU_PLUGIN, name=match["gelu"].name, attrs=OrderedDict([("type_id", type_id)]),
+                inputs=[match["x"]], outputs=list(match.outputs))
+
+
+def fuse(graph: Graph, type_id: int=0):
+    """
+    Replaces all the SkipLayerNorm and GELU subgraphs in a BERT graph with the corresponding TensorRT plugins,
+    as the BERT demo does when building its network.
+
+    Args:
+        graph (Graph): The graph.
+        type_id (int): The data type the plugins should use. 0 for FP32, 1 for FP16.
+
+    Returns:
+        OrderedDict[str, int]: The number of subgraphs replaced by each plugin.
+    """
+    counts = OrderedDict()
+    counts[SKIP_LAYER_NORM_PLUGIN] = 0
+    # Match the bias first, so that it is folded into the plugin whenever possible.
+    for pattern in [skip_layer_norm(with_bias=True), skip_layer_norm()]:
+        counts[SKIP_LAYER_NORM_PLUGIN] += pattern.rewrite(graph, lambda match: replace_skip_layer_norm(match, type_id))
+    counts[GELU_PLUGIN] = gelu().rewrite(graph, lambda match: replace_gelu(match, type_id))
+    G_LOGGER.info("Fused: {:}".format(dict(counts)))
+    return counts
@@ -0,0 +1,413 @@
+#
+# Copyright (c) 2021, NVIDIA CORPORATION. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from collections import OrderedDict
+from typing import Callable, Dict, List, Sequence, Union
+
+from onnx_graphsurgeon.ir.graph import Graph
+from onnx_graphsurgeon.ir.node import Node
+from onnx_graphsurgeon.ir.tensor import Constant, Tensor
+from onnx_graphsurgeon.logger.logger import G_LOGGER
+from onnx_graphsurgeon.util import misc
+
+# Ops whose two inputs may be matched in either order, unless specified otherwise.
+COMMUTATIVE_OPS = set(["Add", "Mul", "Max", "Min", "Sum", "And", "Or", "Xor", "Equal"])
+
+
+class PatternTensor(object):
+    def __init__(self, name: str, producer: "PatternNode"=None, constant: bool=False, check: Callable[[Tensor], bool]=None):
+        """
+        A tensor in a Pattern. This should not be constructed directly - instead, use `Pattern.input()` or `Pattern.node()`.
+        """
+        self.name = name
+        self.producer = producer
+        self.consumers = []
+        self.constant = constant
+        self.check = check
+
+
+    def matches(self, tensor: Tensor):
+        if self.constant and not isinstance(tensor, Constant):
+            return False
+        return self.check is None or self.check(tensor)
+
+
+    def __repr__(self):
+        return "PatternTensor({:})".format(self.name)
+
+
+class PatternNode(object):
+    def __init__(self, name: str, op: Union[str, Sequence[str]], inputs: List[PatternTensor], num_outputs: int,
+                 attrs: Dict[str, object], check: Callable[[Node], bool], commutative: bool):
+        """
+        A node in a Pattern. This should not be constructed directly - instead, use `Pattern.node()`.
+        """
+        self.name = name
+        self.ops = None if op is None else (set([op]) if isinstance(op, str) else set(op))
+        self.inputs = inputs
+        self.outputs = []
+        self.num_outputs = num_outputs
+        self.attrs = misc.default_value(attrs, {})
+        self.check = check
+        self.commutative = commutative
+
+
+    def matches(self, node: Node):
+        if self.ops is not None and node.op not in self.ops:
+            return False
+
+        if len(node.inputs) != len(self.inputs) or len(node.outputs) != self.num_outputs:
+            return False
+
+        for attr_name, expected in self.attrs.items():
+            value = node.attrs.get(attr_name)
+            if callable(expected):
+                if not expected(value):
+                    return False
+            elif value != expected:
+                return False
+
+        return self.check is None or self.check(node)
+
+
+    def input_orders(self):
+        # Returns the orders in which the inputs of a matching node may be assigned to the inputs of this pattern node.
+        identity = list(range(len(self.inputs)))
+        commutative = self.commutative
+        if commutative is None:
+            commutative = self.ops is not None and self.ops.issubset(COMMUTATIVE_OPS)
+
+        if commutative and len(self.inputs) == 2:
+            return [identity, [1, 0]]
+        return [identity]
+
+
+    def __repr__(self):
+        return "PatternNode({:}: {:})".format(self.name, self.ops)
+
+
+class Match(object):
+    def __init__(self, pattern: "Pattern", nodes: "OrderedDict[str, Node]", tensors: "OrderedDict[str, Tensor]"):
+        """
+        A match of a Pattern in a graph.
+
+        Attributes:
+            nodes (OrderedDict[str, Node]): Maps the names of the nodes in the pattern to the matched nodes.
+            tensors (OrderedDict[str, Tensor]): Maps the names of the tensors in the pattern to the matched tensors.
+            inputs (List[Tensor]): The tensors matched by the inputs of the pattern.
+            outputs (List[Tensor]): The tensors matched by the outputs of the pattern.
+        """
+        self.nodes = nodes
+        self.tensors = tensors
+        self.inputs = [tensors[inp.name] for inp in pattern.inputs]
+        self.outputs = [tensors[out.name] for out in pattern.outputs]
+
+
+    def __getitem__(self, name: str) -> Union[Node, Tensor]:
+        """
+        Returns the node or tensor matched by the pattern node or tensor with the specified name.
+        """
+        if name in self.nodes:
+            return self.nodes[name]
+        return self.tensors[name]
+
+
+    def __repr__(self):
+        return "Match(nodes={:}, inputs={:}, outputs={:})".format(
+                    [node.name for node in self.nodes.values()], [t.name for t in self.inputs], [t.name for t in self.outputs])
+
+
+class Pattern(object):
+    def __init__(self):
+        """
+        A pattern of nodes that can be matched against graphs, and optionally replaced.
+
+        Patterns are built by declaring their input tensors and nodes. For example, the following pattern
+        matches an `Add` of some tensor and a constant, followed by a `Relu`:
+        ::
+
+            pattern = gs.Pattern()
+            x = pattern.input("x")
+            bias = pattern.input("bias", constant=True)
+            add = pattern.node("Add", inputs=[x, bias])
+            relu = pattern.node("Relu", inputs=[add], name="relu")
+
+            for match in pattern.match(graph):
+                print(match["relu"], match["bias"].values)
+
+        Intermediate tensors in a match may only be used by the nodes in the match. Tensors produced by
+        the pattern which are not consumed by other nodes in the pattern are the outputs of the pattern,
+        unless the outputs are set explicitly with the `outputs` attribute.
+        """
+        self.inputs = [] # List[PatternTensor]
+        self.nodes = [] # List[PatternNode]
+        self._outputs = None
+        self._plan = None
+
+
+    @property
+    def outputs(self) -> List[PatternTensor]:
+        if self._outputs is not None:
+            return self._outputs
+        return [out for node in self.nodes for out in node.outputs if not out.consumers]
+
+
+    @outputs.setter
+    def outputs(self, outputs: Sequence[PatternTensor]):
+        self._outputs = list(outputs)
+        self._plan = None
+
+
+    def input(self, name: str=None, constant: bool=False, check: Callable[[Tensor], bool]=None) -> PatternTensor:
+        """
+        Adds an input to the pattern, which may match any tensor.
+
+        Args:
+            name (str): The name of the input, which can be used to look up the matched tensor in a `Match`.
+            constant (bool): Whether the input may only match constants. Defaults to False.
+            check (Callable[[Tensor], bool]): An additional predicate which the matched tensor must satisfy.
+
+        Returns:
+            PatternTensor: The input.
+        """
+        tensor = PatternTensor(misc.default_value(name, "input{:}".format(len(self.inputs))), constant=constant, check=check)
+        self.inputs.append(tensor)
+        self._plan = None
+        return tensor
+
+
+    def node(self, op: Union[str, Sequence[str]], inputs: Sequence[PatternTensor], name: str=None, attrs: Dict[str, object]=None,
+             num_outputs: int=1, check: Callable[[Node], bool]=None, commutative: bool=None) -> Union[PatternTensor, List[PatternTensor]]:
+        """
+        Adds a node to the pattern.
+
+        Args:
+            op (Union[str, Sequence[str]]): The op, or any of several ops, which the node must have. None matches any op.
+            inputs (Sequence[PatternTensor]):
+                    The inputs of the node, which must be inputs of the pattern or outputs of other nodes in the pattern.
+                    Matched nodes must have exactly this many inputs.
+            name (str): The name of the node, which can be used to look up the matched node in a `Match`.
+            attrs (Dict[str, object]):
+                    Attributes which the node must have. Each value is either the expected value of the attribute,
+                    or a predicate which accepts the value of the attribute (None if the attribute is not present).
+            num_outputs (int): The number of outputs which the node must have. Defaults to 1.
+            check (Callable[[Node], bool]): An additional predicate which the matched node must satisfy.
+            commutative (bool):
+                    Whether the two inputs of the node may be matched in either order.
+                    Defaults to True for commutative ops like `Add` and `Mul`.
+
+        Returns:
+            Union[PatternTensor, List[PatternTensor]]: The output of the node, or a list of outputs if `num_outputs` is not 1.
+        """
+        name = misc.default_value(name, "node{:}".format(len(self.nodes)))
+        node = PatternNode(name, op, list(inputs), num_outputs, attrs, check, commutative)
+        for inp in node.inputs:
+            inp.consumers.append(node)
+        node.outputs = [PatternTensor("{:}_out{:}".format(name, index) if num_outputs != 1 else "{:}_out".format(name), producer=node)
+                        for index in range(num_outputs)]
+        self.nodes.append(node)
+        self._plan = None
+        return node.outputs[0] if num_outputs == 1 else node.outputs
+
+
+    # Determines the order in which pattern nodes are matched, starting from the producer of the first output.
+    # Each subsequent node is found through a tensor bound by a previously matched node: either as a producer
+    # of that tensor, or as a consumer.
+    def _get_plan(self):
+        if self._plan is not None:
+            return self._plan
+
+        outputs = self.outputs
+        if not outputs:
+            G_LOGGER.critical("Pattern has no outputs")
+
+        anchor = outputs[0].producer
+        plan = []
+        placed = set([id(anchor)])
+        bound_tensors = OrderedDict([(id(t), t) for t in anchor.inputs + anchor.outputs])
+        while len(placed) < len(self.nodes):
+            progress = False
+            for tensor in list(bound_tensors.values()):
+                candidates = [("producer", tensor.producer)] if tensor.producer is not None else []
+                candidates += [("consumer", consumer) for consumer in tensor.consumers]
+                for relation, node in candidates:
+                    if id(node) not in placed:
+                        placed.add(id(node))
+                        plan.append((node, relation, tensor))
+                        bound_tensors.update([(id(t), t) for t in node.inputs + node.outputs])
+                        progress = True
+            if not progress:
+                G_LOGGER.critical("All nodes in a pattern must be connected. Disconnected nodes: {:}".format(
+                                  [node for node in self.nodes if id(node) not in placed]))
+
+        internal_tensors = [out for node in self.nodes for out in node.outputs if all(out is not t for t in outputs)]
+        self._plan = (anchor, plan, internal_tensors)
+        return self._plan
+
+
+    def _match_at(self, node: Node, graph_node_ids: Dict[int, Node], used_node_ids: Dict[int, Node], graph_output_ids: Dict[int, Tensor]):
+        anchor, plan, internal_tensors = self._get_plan()
+
+        bound_nodes = OrderedDict() # Dict[int, Node]: Maps ids of pattern nodes to graph nodes
+        bound_tensors = {} # Dict[int, Tensor]: Maps ids of pattern tensors to graph tensors
+
+        def bind(pattern_node, node, order):
+            newly_bound = []
+            pairs = [(pattern_node.inputs[pattern_index], node.inputs[node_index]) for pattern_index, node_index in enumerate(order)]
+            pairs += list(zip(pattern_node.outputs, node.outputs))
+            for pattern_tensor, tensor in pairs:
+                bound = bound_tensors.get(id(pattern_tensor))
+                if bound is not None:
+                    if bound is not tensor:
+                        break
+                    continue
+                if not pattern_tensor.matches(tensor):
+                    break
+                bound_tensors[id(pattern_tensor)] = tensor
+                newly_bound.append(id(pattern_tensor))
+            else:
+                return newly_bound
+
+            for tensor_id in newly_bound:
+                del bound_tensors[tensor_id]
+            return None
+
+        # Intermediate tensors may only be used by nodes in the match.
+        def internal_tensors_valid():
+            matched_ids = set(map(id, bound_nodes.values()))
+            for pattern_tensor in internal_tensors:
+                tensor = bound_tensors[id(pattern_tensor)]
+                if id(tensor) in graph_output_ids or any(id(consumer) not in matched_ids for consumer in tensor.outputs):
+                    return False
+            return True
+
+        def search(pattern_node, node, step):
+            if id(node) in used_node_ids or any(node is bound for bound in bound_nodes.values()) or not pattern_node.matches(node):
+                return False
+
+            for order in pattern_node.input_orders():
+                newly_bound = bind(pattern_node, node, order)
+                if newly_bound is None:
+                    continue
+
+                bound_nodes[id(pattern_node)] = node
+                if step == len(plan):
+                    if internal_tensors_valid():
+                        return True
+                else:
+                    next_pattern_node, relation, via = plan[step]
+                    tensor = bound_tensors[id(via)]
+                    candidates = tensor.inputs if relation == "producer" else tensor.outputs
+                    for candidate in list(candidates):
+                        if id(candidate) in graph_node_ids and search(next_pattern_node, candidate, step + 1):
+                            return True
+
+                del bound_nodes[id(pattern_node)]
+                for tensor_id in newly_bound:
+                    del bound_tensors[tensor_id]
+            return False
+
+        if not search(anchor, node, 0):
+            return None
+
+        pattern_nodes = {id(pattern_node): pattern_node for pattern_node in self.nodes}
+        pattern_tensors = {id(t): t for t in self.inputs + [out for pattern_node in self.nodes for out in pattern_node.outputs]}
+        nodes = OrderedDict([(pattern_nodes[pattern_node_id].name, node) for pattern_node_id, node in bound_nodes.items()])
+        tensors = OrderedDict([(pattern_tensors[tensor_id].name, tensor) for tensor_id, tensor in bound_tensors.items()])
+        return Match(self, nodes, tensors)
+
+
+    # The nodes of the graph are visited in order rather than looked up by op with `Graph.index()`, since the index
+    # does not keep nodes in graph order, which decides between overlapping matches. Sorting the candidates would cost
+    # as much as this pass. Moreover, `rewrite()` assigns a new list of nodes, which makes the index rebuild itself,
+    # and creating an index here would make the graph track all later modifications made by the caller.
+    def match(self, graph: Graph) -> List[Match]:
+        """
+        Finds all non-overlapping matches of this pattern in the graph.
+
+        Matches are found in a single pass over the nodes of the graph. When matches overlap,
+        the one whose first output is produced earliest in the graph is chosen.
+
+        Args:
+            graph (Graph): The graph to search. Subgraphs are not searched.
+
+        Returns:
+            List[Match]: The matches.
+        """
+        anchor, _, _ = self._get_plan()
+        graph_node_ids = {id(node): node for node in graph.nodes}
+        graph_output_ids = {id(out): out for out in graph.outputs}
+
+        matches = []
+        used_node_ids = {}
+        for node in graph.nodes:
+            if anchor.ops is not None and node.op not in anchor.ops:
+                continue
+            match = self._match_at(node, graph_node_ids, used_node_ids, graph_output_ids)
+            if match is not None:
+                used_node_ids.update({id(node): node for node in match.nodes.values()})
+                matches.append(match)
+
+        G_LOGGER.debug("Found {:} match(es) for pattern with outputs: {:}".format(len(matches), self.outputs))
+        return matches
+
+
+    def rewrite(self, graph: Graph, replace: Callable[[Match], Union[Node, List[Node]]]) -> int:
+        """
+        Replaces all non-overlapping matches of this pattern in the graph.
+
+        All matches are found before any are replaced. Then, for each match, `replace` is called with the match,
+        and should return the node(s) that replace the matched nodes, or None to leave the match unchanged.
+        The replacement nodes would generally consume `match.inputs` and produce `match.outputs`.
+
+        The matched nodes are then disconnected and removed from the graph, and each group of replacement nodes is inserted
+        at the position of the last of the nodes it replaces. Hence, if the graph was topologically sorted, it will remain so
+        as long as the replacement nodes are in topological order.
+
+        Args:
+            graph (Graph): The graph in which to replace matches.
+            replace (Callable[[Match], Union[Node, List[Node]]]): A function which creates the replacement for a match.
+
+        Returns:
+            int: The number of matches that were replaced.
+        """
+        node_positions = {id(node): index for index, node in enumerate(graph.nodes)}
+
+        removed_node_ids = set()
+        replacements = {} # Dict[int, List[Node]]: Maps the positions of the last nodes in matches to their replacements.
+        for match in self.match(graph):
+            new_nodes = replace(match)
+            if new_nodes is None:
+                continue
+            if isinstance(new_nodes, Node):
+                new_nodes = [new_nodes]
+
+            for node in match.nodes.values():
+                node.inputs.clear()
+                node.outputs.clear()
+                removed_node_ids.add(id(node))
+            replacements[max(node_positions[id(node)] for node in match.nodes.values())] = new_nodes
+
+        if replacements:
+            new_graph_nodes = []
+            for index, node in enumerate(graph.nodes):
+                if id(node) not in removed_node_ids:
+                    new_graph_nodes.append(node)
+                new_graph_nodes.extend(replacements.get(index, []))
+            graph.nodes = new_graph_nodes
+
+        G_LOGGER.debug("Replaced {:} match(es) for pattern with outputs: {:}".format(len(replacements), self.outputs))
+        return len(replacements)
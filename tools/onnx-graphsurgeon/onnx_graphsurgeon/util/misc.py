@@ -14,6 +14,7 @@
 # limitations under the License.
 #
 
+import weakref
 from collections import OrderedDict
 from typing import List, Sequence
 
@@ -68,38 +69,229 @@ def is_dynamic_shape(shape):
     return any(is_dynamic_dimension(dim) for dim in shape)
 
 
+# Objects that are notified of structural changes to nodes and tensors, e.g. instances of GraphIndex.
+# Each observer must implement `_on_modified(obj)`, which is called with every node or tensor whose inputs,
+# outputs, name or op change. When there are no observers, the only overhead is checking whether this set is empty.
+GRAPH_OBSERVERS = weakref.WeakSet()
+
+
+def notify_modified(obj):
+    for observer in GRAPH_OBSERVERS:
+        observer._on_modified(obj)
+
+
+# List that invokes a callback with the elements that were added and removed whenever it is modified.
+# This is used to track modifications to the node and I/O lists of a Graph while it is indexed.
+class ObservedList(list):
+    def __init__(self, callback, initial):
+        super().__init__(initial)
+        self.callback = callback
+
+
+    def __setitem__(self, index, elem):
+        removed = list.__getitem__(self, index)
+        if isinstance(index, slice):
+            elem = list(elem)
+            super().__setitem__(index, elem)
+            self.callback(elem, removed)
+        else:
+            super().__setitem__(index, elem)
+            self.callback([elem], [removed])
+
+
+    def __delitem__(self, index):
+        removed = list.__getitem__(self, index)
+        super().__delitem__(index)
+        self.callback([], removed if isinstance(index, slice) else [removed])
+
+
+    def __iadd__(self, other_list):
+        self.extend(other_list)
+        return self
+
+
+    def __imul__(self, factor):
+        added = list(self) * (factor - 1) if factor > 0 else []
+        removed = list(self) if factor <= 0 else []
+        super().__imul__(factor)
+        self.callback(added, removed)
+        return self
+
+
+    def append(self, x):
+        super().append(x)
+        self.callback([x], [])
+
+
+    def extend(self, iterable):
+        elems = list(iterable)
+        super().extend(elems)
+        self.callback(elems, [])
+
+
+    def insert(self, i, x):
+        super().insert(i, x)
+        self.callback([x], [])
+
+
+    def remove(self, x):
+        index = self.index(x)
+        removed = list.__getitem__(self, index)
+        super().__delitem__(index)
+        self.callback([], [removed])
+
+
+    def pop(self, i=-1):
+        elem = super().pop(i)
+        self.callback([], [elem])
+        return elem
+
+
+    def clear(self):
+        removed = list(self)
+        super().clear()
+        self.callback([], removed)
+
+
 # Special type of list that synchronizes contents with another list.
 # Concrete example: Assume some node, n, contains an input tensor, t. If we remove t from n.inputs,
 # we also need to remove n from t.outputs. To avoid having to do this manually, we use SynchronizedList,
 # which takes an attribute name as a parameter, and then synchronizes to that attribute of each of its elements.
 # So, in the example above, we can make n.inputs a synchronized list whose field_name is set to "outputs".
+#
+# Removing an element from the middle of a peer list would require a linear search. Since peer lists can be very
+# long (e.g. the outputs of a tensor used by many nodes), disconnecting all of them one at a time would be quadratic.
+# Instead, removals from peer lists are deferred: each list keeps track of its pending removals by object identity,
+# and removes them all in a single pass the next time it is accessed.
 # See test_ir.TestNodeIO for functional tests
 class SynchronizedList(list):
     def __init__(self, parent_obj, field_name, initial):
         self.parent_obj = parent_obj
         self.field_name = field_name
+        self._pending_removals = {} # Dict[int, Tuple[object, int]]: Maps ids to elements and the number of copies to remove
         self.extend(initial)
 
 
+    def _flush(self):
+        # Removes the first occurrences of all elements pending removal, preserving the order of the remaining elements.
+        if not self._pending_removals:
+            return
+
+        pending_removals = self._pending_removals
+        self._pending_removals = {}
+
+        kept = []
+        for elem in list.__iter__(self):
+            elem_id = id(elem)
+            if elem_id in pending_removals:
+                pending_elem, count = pending_removals[elem_id]
+                if count == 1:
+                    del pending_removals[elem_id]
+                else:
+                    pending_removals[elem_id] = (pending_elem, count - 1)
+                continue
+            kept.append(elem)
+        list.__setitem__(self, slice(None), kept)
+
+
+    def _defer_remove(self, elem):
+        _, count = self._pending_removals.get(id(elem), (elem, 0))
+        # Holding a reference to the element guarantees that its id is not reused before the list is flushed.
+        self._pending_removals[id(elem)] = (elem, count + 1)
+
+
     def _add_to_elem(self, elem):
-        # Explicitly avoid SynchronizedList overrides to prevent infinite recursion
+        # Explicitly avoid SynchronizedList overrides to prevent infinite recursion.
+        # Appending never depends on the positions of pending removals, so there is no need to flush.
         list.append(getattr(elem, self.field_name), self.parent_obj)
+        if GRAPH_OBSERVERS:
+            notify_modified(self.parent_obj)
+            notify_modified(elem)
 
 
     def _remove_from_elem(self, elem):
-        # Explicitly avoid SynchronizedList overrides to prevent infinite recursion
-        list.remove(getattr(elem, self.field_name), self.parent_obj)
+        peer = getattr(elem, self.field_name)
+        if isinstance(peer, SynchronizedList):
+            peer._defer_remove(self.parent_obj)
+        else:
+            list.remove(peer, self.parent_obj)
+        if GRAPH_OBSERVERS:
+            notify_modified(self.parent_obj)
+            notify_modified(elem)
 
 
     def __delitem__(self, index):
-        self._remove_from_elem(self[index])
+        self._flush()
+        elems = list.__getitem__(self, index)
+        for elem in (elems if isinstance(index, slice) else [elems]):
+            self._remove_from_elem(elem)
         super().__delitem__(index)
 
 
     def __setitem__(self, index, elem):
-        self._remove_from_elem(self[index])
-        super().__setitem__(index, elem)
-        self._add_to_elem(elem)
+        self._flush()
+        if isinstance(index, slice):
+            elem = list(elem)
+            for old_elem in list.__getitem__(self, index):
+                self._remove_from_elem(old_elem)
+            super().__setitem__(index, elem)
+            for new_elem in elem:
+                self._add_to_elem(new_elem)
+        else:
+            self._remove_from_elem(list.__getitem__(self, index))
+            super().__setitem__(index, elem)
+            self._add_to_elem(elem)
+
+
+    def __getitem__(self, index):
+        self._flush()
+        return super().__getitem__(index)
+
+
+    def __len__(self):
+        self._flush()
+        return super().__len__()
+
+
+    def __iter__(self):
+        self._flush()
+        return super().__iter__()
+
+
+    def __reversed__(self):
+        self._flush()
+        return super().__reversed__()
+
+
+    def __contains__(self, elem):
+        self._flush()
+        return super().__contains__(elem)
+
+
+    def __eq__(self, other):
+        self._flush()
+        if isinstance(other, SynchronizedList):
+            other._flush()
+        return super().__eq__(other)
+
+
+    def __ne__(self, other):
+        return not self == other
+
+
+    def __repr__(self):
+        self._flush()
+        return super().__repr__()
+
+
+    def index(self, *args):
+        self._flush()
+        return super().index(*args)
+
+
+    def count(self, elem):
+        self._flush()
+        return super().count(elem)
 
 
     def append(self, x):
@@ -108,36 +300,61 @@ class SynchronizedList(list):
 
 
     def extend(self, iterable: Sequence[object]):
-        super().extend(iterable)
-        for elem in iterable:
+        self._flush()
+        elems = list(iterable)
+        super().extend(elems)
+        for elem in elems:
             self._add_to_elem(elem)
 
+
     def insert(self, i, x):
+        self._flush()
         super().insert(i, x)
         self._add_to_elem(x)
 
 
     def remove(self, x):
+        self._flush()
         super().remove(x)
         self._remove_from_elem(x)
 
 
     def pop(self, i=-1):
+        self._flush()
         elem = super().pop(i)
         self._remove_from_elem(elem)
         return elem
 
 
     def clear(self):
-        for elem in self:
+        self._flush()
+        for elem in list.__iter__(self):
             self._remove_from_elem(elem)
         super().clear()
 
 
+    def sort(self, *args, **kwargs):
+        self._flush()
+        super().sort(*args, **kwargs)
+
+
+    def reverse(self):
+        self._flush()
+        super().reverse()
+
+
+    def copy(self):
+        return list(self)
+
+
     def __add__(self, other_list: List[object]):
         return list(self) + list(other_list)
 
 
+    def __radd__(self, other_list: List[object]):
+        return list(other_list) + list(self)
+
+
     def __iadd__(self, other_list: List[object]):
         self.extend(other_list)
         return self
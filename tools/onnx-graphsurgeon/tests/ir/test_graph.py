@@ -15,10 +15,14 @@
 #
 
 import copy
+import os
+import sys
 
 import numpy as np
+import onnx
 import onnx_graphsurgeon as gs
 import pytest
+from onnx_graphsurgeon.ir import graph as graph_module
 from onnx_graphsurgeon.ir.graph import Graph
 from onnx_graphsurgeon.ir.node import Node
 from onnx_graphsurgeon.ir.tensor import Constant, LazyValues, Variable
@@ -388,6 +392,67 @@ class TestToposort(object):
         assert subgraph.nodes == expected_node_order
 
 
+    # Deep graphs must not be limited by Python's recursion limit.
+    def test_toposort_deep_chain(self):
+        num_nodes = 10000
+        tensors = [Variable(name="tensor{:}".format(index)) for index in range(num_nodes + 1)]
+        nodes = [Node(op="Identity", name="node{:}".format(index), inputs=[tensors[index]], outputs=[tensors[index + 1]])
+                    for index in range(num_nodes)]
+        expected_node_order = list(nodes)
+
+        graph = Graph(nodes=list(reversed(nodes)), inputs=[tensors[0]], outputs=[tensors[-1]])
+        graph.toposort()
+        assert all(node is expected for node, expected in zip(graph.nodes, expected_node_order))
+
+
+    # Graph structure (repeated num_diamonds times):
+    #     x
+    #    / \
+    # Left  Right
+    #    \ /
+    #    Join
+    #     |
+    #     y
+    def test_toposort_deep_diamonds(self):
+        num_diamonds = 5000
+        inp = Variable(name="x")
+        tensor = inp
+        expected_node_order = []
+        for index in range(num_diamonds):
+            left_out = Variable(name="left_out{:}".format(index))
+            right_out = Variable(name="right_out{:}".format(index))
+            join_out = Variable(name="join_out{:}".format(index))
+            expected_node_order.extend([
+                Node(op="Identity", name="Left{:}".format(index), inputs=[tensor], outputs=[left_out]),
+                Node(op="Identity", name="Right{:}".format(index), inputs=[tensor], outputs=[right_out]),
+                Node(op="Add", name="Join{:}".format(index), inputs=[left_out, right_out], outputs=[join_out]),
+            ])
+            tensor = join_out
+
+        graph = Graph(nodes=list(reversed(expected_node_order)), inputs=[inp], outputs=[tensor])
+        graph.toposort()
+        # Left and Right are on the same level, so their relative order is reversed.
+        for index in range(num_diamonds):
+            left, right, join = expected_node_order[index * 3: index * 3 + 3]
+            assert graph.nodes[index * 3: index * 3 + 3] == [right, left, join]
+
+
+    def test_toposort_cycle(self):
+        inp = Variable(name="x")
+        intermediate0 = Variable(name="intermediate0")
+        intermediate1 = Variable(name="intermediate1")
+        out = Variable(name="y")
+        nodes = [
+            Node(op="Add", name="Test0", inputs=[inp, intermediate1], outputs=[intermediate0]),
+            Node(op="Add", name="Test1", inputs=[intermediate0], outputs=[intermediate1]),
+            Node(op="Add", name="Test2", inputs=[intermediate1], outputs=[out]),
+        ]
+        graph = Graph(nodes=nodes, inputs=[inp], outputs=[out])
+
+        with pytest.raises(OnnxGraphSurgeonException, match=r"Nodes in the cycle are: \['Test0', 'Test1'\]"):
+            graph.toposort()
+
+
 def build_basic_graph():
     inputs = [Variable(name="x")]
     outputs = [Variable(name="y")]
@@ -544,6 +609,36 @@ class TestCleanup(object):
         assert graph.nodes[0].inputs == [X]
 
 
+    # Nodes with multiple used outputs should only be visited (and have their subgraphs traversed) once.
+    def test_multi_output_nested_node_visited_once(self):
+        X = Variable("X", dtype=np.float32, shape=(1, ))
+        Y = Variable("Y", dtype=np.float32, shape=(1, ))
+        graph = Graph(inputs=[X, Y])
+
+        X_p = graph.identity(X)
+
+        subgraph_outputs = [Variable("subgraph_out0"), Variable("subgraph_out1")]
+        subgraph = Graph(nodes=[Node(op="Identity", inputs=[X_p], outputs=[out]) for out in subgraph_outputs],
+                         outputs=subgraph_outputs)
+
+        outputs = [Variable("nested_out0"), Variable("nested_out1")]
+        graph.nodes.append(Node(op="Nested", inputs=[Y], outputs=outputs, attrs={"body": subgraph}))
+        graph.outputs = outputs
+
+        num_calls = [0]
+        foreign_tensors = subgraph._foreign_tensors
+        def count_foreign_tensors(*args, **kwargs):
+            num_calls[0] += 1
+            return foreign_tensors(*args, **kwargs)
+        subgraph._foreign_tensors = count_foreign_tensors
+
+        graph.cleanup(remove_unused_graph_inputs=True, recurse_subgraphs=False)
+
+        assert num_calls[0] == 1
+        assert graph.inputs == [X, Y]
+        assert len(graph.nodes) == 2
+
+
     def test_input_is_output(self):
         graph = Graph()
 
@@ -565,6 +660,192 @@ class TestCleanup(object):
         assert graph.nodes[0].outputs == [C]
 
 
+class TestIndex(object):
+    @staticmethod
+    def check_index(graph):
+        index = graph.index()
+        tensors = graph.tensors()
+        assert dict(index.tensors()) == dict(tensors)
+        node_ids = set(map(id, graph.nodes))
+        for name, tensor in tensors.items():
+            assert index.get_tensor(name) is tensor
+            assert list(map(id, index.producers(tensor))) == [id(node) for node in tensor.inputs if id(node) in node_ids]
+            assert list(map(id, index.consumers(tensor))) == [id(node) for node in tensor.outputs if id(node) in node_ids]
+
+        for node in graph.nodes:
+            assert set(map(id, index.nodes_by_op(node.op))) == set([id(n) for n in graph.nodes if n.op == node.op])
+            assert set(map(id, index.nodes_by_name(node.name))) == set([id(n) for n in graph.nodes if n.name == node.name])
+
+
+    def test_lookups(self):
+        graph, _ = toposort_linear_graph()
+        index = graph.index()
+        self.check_index(graph)
+
+        assert len(index.nodes_by_op("Add")) == 4
+        assert index.nodes_by_op("Identity") == []
+        assert index.get_tensor("x") is graph.inputs[0]
+        assert index.get_tensor("missing") is None
+
+
+    def test_node_io_modifications(self):
+        graph, _ = toposort_linear_graph()
+        index = graph.index()
+
+        # Insert a node between the second and third nodes
+        a = graph.nodes[1].outputs[0]
+        b = Variable("b")
+        node = Node("Relu", name="relu", inputs=[a], outputs=[b])
+        graph.nodes.append(node)
+        graph.nodes[2].inputs[0] = b
+        self.check_index(graph)
+        assert index.nodes_by_op("Relu") == [node]
+
+        # Disconnect the node, then remove it
+        graph.nodes[2].inputs[0] = a
+        node.outputs.clear()
+        self.check_index(graph)
+        assert index.get_tensor("b") is None
+
+        graph.nodes.remove(node)
+        self.check_index(graph)
+        assert index.nodes_by_name("relu") == []
+
+
+    def test_renames(self):
+        graph, _ = toposort_linear_graph()
+        index = graph.index()
+
+        tensor = graph.nodes[0].outputs[0]
+        tensor.name = "renamed"
+        graph.nodes[0].op = "Relu"
+        graph.nodes[0].name = "relu"
+        self.check_index(graph)
+        assert index.get_tensor("renamed") is tensor
+        assert index.nodes_by_op("Relu") == [graph.nodes[0]]
+        assert index.nodes_by_name("relu") == [graph.nodes[0]]
+
+
+    def test_graph_io_and_node_list_assignment(self):
+        graph, _ = toposort_linear_graph()
+        index = graph.index()
+
+        unused = Variable("unused", dtype=np.float32)
+        graph.inputs.append(unused)
+        self.check_index(graph)
+        assert index.get_tensor("unused") is unused
+
+        graph.inputs = graph.inputs[:1]
+        graph.nodes = graph.nodes[:2]
+        graph.outputs = [graph.nodes[-1].outputs[0]]
+        self.check_index(graph)
+        assert index.get_tensor("unused") is None
+
+        graph.cleanup().toposort()
+        self.check_index(graph)
+
+
+    def test_duplicate_names(self):
+        graph, _ = toposort_linear_graph()
+        index = graph.index()
+        graph.nodes[0].outputs[0].name = "x"
+        with pytest.raises(OnnxGraphSurgeonException):
+            index.get_tensor("x")
+
+
+    def test_drop_index(self):
+        graph, _ = toposort_linear_graph()
+        graph.index()
+        graph.drop_index()
+        assert type(graph.nodes) == list
+        assert type(graph.inputs) == list
+        graph.nodes.clear()
+        self.check_index(graph)
+
+
+    def test_random_modifications(self):
+        rng = np.random.RandomState(0)
+        tensors = [Variable("t{:}".format(i)) for i in range(20)]
+        nodes = [Node("Op{:}".format(i % 3), name="n{:}".format(i % 5)) for i in range(20)]
+        graph = Graph(nodes=nodes[:10], inputs=tensors[:2], outputs=tensors[-2:])
+        graph.index()
+
+        for i in range(500):
+            node = nodes[rng.randint(len(nodes))]
+            tensor = tensors[rng.randint(len(tensors))]
+            action = rng.randint(8)
+            if action == 0:
+                node.inputs.append(tensor)
+            elif action == 1:
+                node.outputs.append(tensor)
+            elif action == 2 and node.inputs:
+                del node.inputs[rng.randint(len(node.inputs))]
+            elif action == 3 and tensor.outputs:
+                tensor.outputs.pop(0)
+            elif action == 4:
+                if any(n is node for n in graph.nodes):
+                    graph.nodes.remove(node)
+                else:
+                    graph.nodes.append(node)
+            elif action == 5:
+                tensor.name = "renamed{:}".format(i)
+            elif action == 6:
+                node.op = "Op{:}".format(rng.randint(3))
+            else:
+                graph.outputs[rng.randint(len(graph.outputs))] = tensor
+
+            if i % 5 == 0:
+                self.check_index(graph)
+        self.check_index(graph)
+
+
+    # Looking up tensors while rewriting the graph should not require walking the entire graph each time.
+    # Instead of timing the rewrite, count the work done: the index must only be built once, and must
+    # only update the entries of the nodes that were modified.
+    def test_rewrite_is_linear(self, monkeypatch):
+        from onnx_graphsurgeon.ir.graph_index import GraphIndex
+
+        counts = {"tensors": 0, "_reset": 0, "_add_tensor_ref": 0}
+        def count_calls(cls, name):
+            func = getattr(cls, name)
+            def wrapper(*args, **kwargs):
+                counts[name] += 1
+                return func(*args, **kwargs)
+            monkeypatch.setattr(cls, name, wrapper)
+
+        count_calls(Graph, "tensors")
+        count_calls(GraphIndex, "_reset")
+        count_calls(GraphIndex, "_add_tensor_ref")
+
+        def make_graph(num_nodes):
+            tensors = [Variable("t{:}".format(i)) for i in range(num_nodes + 1)]
+            nodes = [Node("Identity", inputs=[tensors[i]], outputs=[tensors[i + 1]]) for i in range(num_nodes)]
+            return Graph(nodes=nodes, inputs=[tensors[0]], outputs=[tensors[-1]])
+
+        def rewrite(num_nodes):
+            graph = make_graph(num_nodes)
+            for key in counts:
+                counts[key] = 0
+
+            index = graph.index()
+            for i in range(len(graph.nodes)):
+                out = index.get_tensor("t{:}".format(i + 1))
+                node = index.producers(out)[0]
+                relu_out = Variable("relu{:}".format(i))
+                graph.nodes.append(Node("Relu", inputs=[out], outputs=[relu_out]))
+                node.name = "n{:}".format(i)
+                assert index.get_tensor("relu{:}".format(i)) is relu_out
+            return dict(counts)
+
+        for num_nodes in [10, 1000]:
+            counts_after = rewrite(num_nodes)
+            assert counts_after["tensors"] == 0
+            assert counts_after["_reset"] == 1
+            # Building the index references each tensor of each node, plus the graph inputs and outputs.
+            # Each iteration then references the tensors of the new node, and of the renamed node once more.
+            assert counts_after["_add_tensor_ref"] == 2 * num_nodes + 2 + 4 * num_nodes
+
+
 class TestCopy(object):
     def test_copy(self):
         def make_graph():
@@ -751,9 +1032,83 @@ class TestFoldConstants(object):
 
 
     def test_with_invalid_nodes_no_recursive(self, foldable_with_invalid_node):
-        # No folding should take place without recursive partitioning
-        original = foldable_with_invalid_node.copy()
-        assert foldable_with_invalid_node.fold_constants() == original
+        # Without recursive partitioning, nothing that depends on the invalid node can be folded.
+        # However, `c` can be evaluated with NumPy, so it should be folded regardless.
+        foldable_with_invalid_node.fold_constants().cleanup()
+
+        tensor_map = foldable_with_invalid_node.tensors()
+
+        assert [node.op for node in foldable_with_invalid_node.nodes] == ["Fake", "Add", "Add"]
+        assert np.all(tensor_map["c"].values == (np.ones(shape=(1, 3), dtype=np.float32) * 2))
+
+
+    def test_with_invalid_nodes_basic(self, foldable_with_invalid_node):
+        foldable_with_invalid_node.fold_constants(partitioning="basic").cleanup()
+
+        tensor_map = foldable_with_invalid_node.tensors()
+
+        assert [node.op for node in foldable_with_invalid_node.nodes] == ["Fake", "Add", "Add"]
+        assert np.all(tensor_map["c"].values == (np.ones(shape=(1, 3), dtype=np.float32) * 2))
+
+
+    # Graph:
+    # a = neg(w)     b = fake(w)
+    # c = neg(a)     d = neg(b)
+    #      e = (c + d)
+    #   output = input + e
+    #
+    # Only the branch that depends on the invalid node should be excluded from folding.
+    def test_recursive_partitioning_independent_branch(self):
+        weights = np.ones(shape=(1, 3), dtype=np.float32)
+
+        graph = Graph()
+        inp = Variable("input", shape=(1, 3), dtype=np.float32)
+        a = graph.layer(op="Neg", inputs=[weights], outputs=["a"])[0]
+        b = graph.fake(weights, name="b")
+        c = graph.layer(op="Neg", inputs=[a], outputs=["c"])[0]
+        d = graph.layer(op="Neg", inputs=[b], outputs=["d"])[0]
+        e = graph.add(c, d, name="e")
+        graph.outputs = [graph.add(inp, e, name="output")]
+        graph.inputs = [inp]
+
+        graph.fold_constants(partitioning="recursive").cleanup()
+
+        assert [node.op for node in graph.nodes] == ["Fake", "Neg", "Add", "Add"]
+        assert isinstance(c, Constant)
+        assert np.all(c.values == weights)
+
+
+    def test_recursive_partitioning_bisects(self):
+        weights = np.ones(shape=(1, 3), dtype=np.float32)
+        num_nodes = 64
+
+        graph = Graph()
+        inp = Variable("input", shape=(1, 3), dtype=np.float32)
+        tensor = graph.layer(op="Neg", inputs=[weights], outputs=["neg_out"])[0]
+        for _ in range(num_nodes - 1):
+            tensor = graph.layer(op="Neg", inputs=[tensor], outputs=["neg_out"])[0]
+        fake_inp = tensor
+        tensor = graph.fake(tensor)
+        graph.outputs = [graph.add(inp, tensor, name="output")]
+        graph.inputs = [inp]
+
+        import onnxruntime as rt
+        num_sessions = [0]
+        InferenceSession = rt.InferenceSession
+        def count_sessions(*args, **kwargs):
+            num_sessions[0] += 1
+            return InferenceSession(*args, **kwargs)
+
+        rt.InferenceSession = count_sessions
+        try:
+            graph.fold_constants(partitioning="recursive").cleanup()
+        finally:
+            rt.InferenceSession = InferenceSession
+
+        assert [node.op for node in graph.nodes] == ["Fake", "Add"]
+        assert np.all(fake_inp.values == weights)
+        # Peeling nodes one at a time would require one session per node.
+        assert num_sessions[0] < 2 * np.log2(num_nodes) + 2
 
 
     def test_no_foldable_constants(self):
@@ -886,6 +1241,26 @@ class TestFoldConstants(object):
         check_no_const_loaded(new_graph)
 
 
+    # Constants imported lazily from external data files must be loaded before being evaluated with ONNX-Runtime.
+    @pytest.mark.parametrize("partitioning", [None, "basic"])
+    def test_external_data_from_path(self, tmp_path, partitioning):
+        weight = Constant("weight", values=np.arange(-3, 3, dtype=np.float32).reshape(2, 3))
+        relu_out = Variable("relu_out", dtype=np.float32, shape=(2, 3))
+        inp = Variable("input", dtype=np.float32, shape=(2, 3))
+        out = Variable("output", dtype=np.float32, shape=(2, 3))
+        graph = Graph(nodes=[Node("Relu", inputs=[weight], outputs=[relu_out]), Node("Add", inputs=[inp, relu_out], outputs=[out])],
+                      inputs=[inp], outputs=[out])
+
+        path = str(tmp_path / "model.onnx")
+        onnx.save(gs.export_onnx(graph), path, save_as_external_data=True, size_threshold=0)
+
+        graph = gs.import_onnx(path)
+        graph.fold_constants(partitioning=partitioning).cleanup()
+
+        assert [node.op for node in graph.nodes] == ["Add"]
+        assert np.all(graph.nodes[0].inputs[1].values == np.maximum(np.arange(-3, 3, dtype=np.float32).reshape(2, 3), 0))
+
+
     @pytest.mark.parametrize("shape, indices", [
         (("batch", 3, "height", "width"), 1), # Scalar indices case
         (None, 1), # Shape not inferered case
@@ -920,7 +1295,15 @@ class TestFoldConstants(object):
         assert isinstance(graph.outputs[2], Variable)
 
 
-    def test_with_nested_graph(self):
+    @pytest.fixture
+    def use_subgraph_workers(self, monkeypatch):
+        # Subgraphs in tests are too small to be folded in worker processes otherwise.
+        monkeypatch.setattr(graph_module, "_MIN_NODES_PER_SUBGRAPH_WORKER", 1)
+        monkeypatch.setattr(os, "cpu_count", lambda: 4)
+
+
+    @pytest.mark.parametrize("subgraph_workers", [None, 2])
+    def test_with_nested_graph(self, subgraph_workers, use_subgraph_workers):
         cond = gs.Variable("cond", dtype=np.bool, shape=(1, ))
 
         X = gs.Variable("X", dtype=np.float32, shape=(1, ))
@@ -935,7 +1318,7 @@ class TestFoldConstants(object):
 
         graph.outputs = [graph.if_op(cond, then_graph, else_graph)]
 
-        graph.fold_constants()
+        graph.fold_constants(subgraph_workers=subgraph_workers)
         graph.cleanup()
 
         assert len(then_graph.nodes) == 0
@@ -946,6 +1329,66 @@ class TestFoldConstants(object):
         assert np.all(else_graph.nodes[0].inputs[1].values == (Y.values * 2))
 
 
+    def test_parallel_subgraphs(self, use_subgraph_workers):
+        cond = gs.Variable("cond", dtype=np.bool, shape=(1, ))
+        X = gs.Variable("X", dtype=np.float32, shape=(1, ))
+        Y = gs.Constant("Y", values=np.full((1, ), -1, dtype=np.float32))
+        graph = Graph(inputs=[X, cond])
+
+        def branch(name, inp):
+            subgraph = Graph(name=name)
+            # Relu cannot be evaluated with NumPy, so this also exercises ONNX-Runtime in the workers.
+            relu_out = subgraph.layer(op="Relu", inputs=[Y], outputs=["{:}_relu_out".format(name)])[0]
+            subgraph.outputs = [subgraph.add(inp, subgraph.add(relu_out, Y))]
+            return subgraph
+
+        then_graph = branch("Then", X)
+        nested_then, nested_else = branch("NestedThen", X), branch("NestedElse", Y)
+        else_graph = Graph(name="Else")
+        else_graph.outputs = [else_graph.if_op(cond, nested_then, nested_else)]
+        graph.outputs = [graph.if_op(cond, then_graph, else_graph)]
+
+        relu_out = then_graph.nodes[0].outputs[0]
+        graph.fold_constants(subgraph_workers=4)
+
+        # Folded values should be applied to the original tensors.
+        assert isinstance(relu_out, Constant)
+        assert not relu_out.inputs
+        assert np.all(relu_out.values == 0)
+
+        assert isinstance(nested_then.outputs[0], Variable)
+        assert isinstance(nested_else.outputs[0], Constant)
+        assert np.all(nested_else.outputs[0].values == -2)
+        # Foreign tensors should remain shared with the outer graph.
+        assert nested_then.nodes[-1].inputs[0] is X
+        assert nested_else.nodes[-1].inputs[0] is Y
+
+        graph.cleanup()
+        assert [node.op for node in then_graph.nodes] == ["Add"]
+        assert not nested_else.nodes
+
+
+    def test_small_subgraphs_fold_serially(self, monkeypatch):
+        import concurrent.futures
+
+        def no_process_pool(*args, **kwargs):
+            assert False, "Small subgraphs should not be folded in worker processes"
+        monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", no_process_pool)
+        monkeypatch.setattr(os, "cpu_count", lambda: 4)
+
+        cond = gs.Variable("cond", dtype=np.bool, shape=(1, ))
+        Y = gs.Constant("Y", values=np.ones((1, ), dtype=np.float32))
+        graph = Graph(inputs=[cond])
+        then_graph, else_graph = Graph(name="Then"), Graph(name="Else")
+        then_graph.outputs = [then_graph.add(Y, Y)]
+        else_graph.outputs = [else_graph.add(Y, else_graph.add(Y, Y))]
+        graph.outputs = [graph.if_op(cond, then_graph, else_graph)]
+
+        graph.fold_constants(subgraph_workers=4)
+        assert isinstance(then_graph.outputs[0], Constant)
+        assert isinstance(else_graph.outputs[0], Constant)
+
+
     def test_const_inp_but_non_foldable_nested_graph(self):
         cond = gs.Constant("cond", values=np.array(True))
         X = gs.Variable("X", dtype=np.float32, shape=(1, ))
@@ -971,6 +1414,137 @@ class TestFoldConstants(object):
         assert len(else_graph.nodes) == 2
 
 
+def constant(name, values, dtype):
+    return Constant(name, values=np.array(values, dtype=dtype))
+
+
+NUMPY_FOLD_CASES = [
+    # (op, inputs, attrs, opset)
+    ("Shape", [np.ones((2, 3, 4), dtype=np.float32)], {}, 11),
+    ("Gather", [np.arange(12, dtype=np.int64).reshape(3, 4), np.array(1, dtype=np.int64)], {}, 11),
+    ("Gather", [np.arange(12, dtype=np.int64).reshape(3, 4), np.array([[0, -1]], dtype=np.int64)], {"axis": 1}, 11),
+    ("Concat", [np.ones((1, 2), dtype=np.float32), np.zeros((3, 2), dtype=np.float32)], {"axis": 0}, 11),
+    ("Unsqueeze", [np.ones((2, 3), dtype=np.float32)], {"axes": [0, -1]}, 11),
+    ("Unsqueeze", [np.ones((2, 3), dtype=np.float32), np.array([1, 3], dtype=np.int64)], {}, 13),
+    ("Squeeze", [np.ones((1, 3, 1), dtype=np.float32)], {"axes": [-1]}, 11),
+    ("Squeeze", [np.ones((1, 3, 1), dtype=np.float32)], {}, 11),
+    ("Squeeze", [np.ones((1, 3, 1), dtype=np.float32), np.array([0], dtype=np.int64)], {}, 13),
+    ("Reshape", [np.arange(24, dtype=np.float32).reshape(2, 3, 4), np.array([0, -1, 2], dtype=np.int64)], {}, 11),
+    ("Cast", [np.array([-1.5, 0.5, 2.7], dtype=np.float32)], {"to": 7}, 11), # INT64
+    ("Cast", [np.array([1, 2, 3], dtype=np.int64)], {"to": 10}, 11), # FLOAT16
+    ("Add", [np.ones((2, 3), dtype=np.float32), np.arange(3, dtype=np.float32)], {}, 11),
+    ("Sub", [np.array(5, dtype=np.int64), np.arange(3, dtype=np.int64)], {}, 11),
+    ("Mul", [np.ones((2, 1), dtype=np.float16), np.arange(3, dtype=np.float16)], {}, 11),
+    ("Div", [np.array([7.0, -7.0], dtype=np.float32), np.array([2.0, 2.0], dtype=np.float32)], {}, 11),
+    ("Div", [np.array([7, -7, 7, -7], dtype=np.int64), np.array([2, 2, -2, -2], dtype=np.int64)], {}, 11),
+    ("Slice", [np.arange(24, dtype=np.float32).reshape(2, 3, 4), np.array([0, 1], dtype=np.int64),
+               np.array([1, 1000], dtype=np.int64)], {}, 11),
+    ("Slice", [np.arange(24, dtype=np.float32).reshape(2, 3, 4), np.array([-1], dtype=np.int64),
+               np.array([-1000], dtype=np.int64), np.array([2], dtype=np.int64), np.array([-2], dtype=np.int64)], {}, 11),
+    ("Slice", [np.arange(24, dtype=np.float32).reshape(2, 3, 4)], {"starts": [1], "ends": [3], "axes": [1]}, 9),
+    ("Transpose", [np.arange(24, dtype=np.float32).reshape(2, 3, 4)], {}, 11),
+    ("Transpose", [np.arange(24, dtype=np.float32).reshape(2, 3, 4)], {"perm": [1, 0, 2]}, 11),
+    ("Range", [np.array(1, dtype=np.int64), np.array(10, dtype=np.int64), np.array(3, dtype=np.int64)], {}, 11),
+    ("Range", [np.array(0.5, dtype=np.float32), np.array(-2, dtype=np.float32), np.array(-0.5, dtype=np.float32)], {}, 11),
+    ("ConstantOfShape", [np.array([2, 3], dtype=np.int64)], {}, 11),
+    ("ConstantOfShape", [np.array([2, 3], dtype=np.int64)], {"value": Constant("value", np.array([5], dtype=np.int32))}, 11),
+]
+
+
+class TestFoldConstantsNumpy(object):
+    @pytest.mark.parametrize("op, inputs, attrs, opset", NUMPY_FOLD_CASES)
+    def test_matches_onnxruntime(self, op, inputs, attrs, opset, monkeypatch):
+        import onnxruntime as rt
+        from onnx_graphsurgeon.exporters.onnx_exporter import export_onnx
+
+        def make_graph():
+            inps = [Constant("input{:}".format(index), values=inp) for index, inp in enumerate(inputs)]
+            out = Variable("output")
+            return Graph(nodes=[Node(op=op, attrs=attrs, inputs=inps, outputs=[out])], outputs=[out], opset=opset)
+
+        sess = rt.InferenceSession(export_onnx(make_graph(), do_type_check=False).SerializeToString())
+        expected = sess.run(["output"], {})[0]
+
+        # NumPy evaluation should not require ONNX-Runtime at all.
+        monkeypatch.setitem(sys.modules, "onnxruntime", None)
+        graph = make_graph()
+        graph.fold_constants(error_ok=False)
+
+        [out] = graph.outputs
+        assert isinstance(out, Constant)
+        assert out.values.dtype == expected.dtype
+        assert out.values.shape == expected.shape
+        assert np.array_equal(out.values, expected)
+
+
+    def test_shape_subgraph(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "onnxruntime", None)
+
+        # Typical pattern from exported models, where the shape of a tensor is computed and then
+        # reassembled into a new shape.
+        graph = Graph()
+        data = Constant("data", values=np.ones((2, 3, 4), dtype=np.float32))
+        inp = Variable("input", dtype=np.float32, shape=("batch", 12))
+        batch_dim = graph.layer(op="Gather", inputs=[graph.shape(data), np.array([0], dtype=np.int64)], outputs=["batch"])[0]
+        new_shape = graph.layer(op="Concat", inputs=[batch_dim, np.array([-1], dtype=np.int64)], outputs=["new_shape"], attrs={"axis": 0})[0]
+        out = graph.layer(op="Reshape", inputs=[inp, new_shape], outputs=["output"])[0]
+        out.dtype = np.float32
+        graph.inputs = [inp]
+        graph.outputs = [out]
+
+        graph.fold_constants(error_ok=False).cleanup()
+
+        assert len(graph.nodes) == 1
+        assert graph.nodes[0].op == "Reshape"
+        assert np.array_equal(graph.nodes[0].inputs[1].values, np.array([2, -1], dtype=np.int64))
+        # Intermediate values only used by folded nodes should not be stored.
+        assert not isinstance(batch_dim, Constant)
+
+
+    def test_cast_to_type_without_numpy_equivalent(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "onnxruntime", None)
+
+        graph = Graph()
+        values = np.array([1.001, 2.5], dtype=np.float32)
+        graph.outputs = graph.layer(op="Cast", inputs=[values], outputs=["cast_out"], attrs={"to": onnx.TensorProto.BFLOAT16})
+
+        # BFLOAT16 values cannot be computed with NumPy, so the Cast should not be folded.
+        graph.fold_constants().cleanup()
+        assert [node.op for node in graph.nodes] == ["Cast"]
+        assert not isinstance(graph.outputs[0], Constant)
+
+
+    def test_falls_back_to_onnxruntime(self):
+        graph = Graph()
+        values = np.array([-1, 2, -3], dtype=np.float32)
+        # Neg is not evaluated with NumPy, but its input is.
+        neg_inp = graph.layer(op="Add", inputs=[values, values], outputs=["add_out"])[0]
+        graph.outputs = graph.layer(op="Neg", inputs=[neg_inp], outputs=["neg_out"])
+
+        graph.fold_constants(error_ok=False).cleanup()
+
+        assert not graph.nodes
+        assert np.array_equal(graph.outputs[0].values, -(values + values))
+
+
+    def test_onnxruntime_not_installed(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "onnxruntime", None)
+
+        graph = Graph()
+        values = np.array([-1, 2, -3], dtype=np.float32)
+        neg_inp = graph.layer(op="Add", inputs=[values, values], outputs=["add_out"])[0]
+        graph.outputs = graph.layer(op="Neg", inputs=[neg_inp], outputs=["neg_out"])
+
+        graph.fold_constants().cleanup()
+
+        # Nodes that can be evaluated with NumPy should still be folded.
+        assert [node.op for node in graph.nodes] == ["Neg"]
+        assert np.array_equal(graph.nodes[0].inputs[0].values, values + values)
+
+        with pytest.raises(ImportError):
+            graph.fold_constants(error_ok=False)
+
+
 class TestIO(object):
     def test_io_cannot_be_sync_list_on_init(self):
         inp = Variable("input0", shape=(1, 3), dtype=np.float32)
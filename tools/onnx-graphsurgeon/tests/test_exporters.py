@@ -14,14 +14,17 @@
 # limitations under the License.
 #
 
+import os
+import shutil
 from collections import OrderedDict
 
 import numpy as np
 import onnx
 import onnx.numpy_helper
 import pytest
-from onnx_graphsurgeon.exporters.onnx_exporter import OnnxExporter
-from onnx_graphsurgeon.importers.onnx_importer import OnnxImporter
+from onnx_graphsurgeon.exporters.onnx_exporter import OnnxExporter, export_onnx
+from onnx_graphsurgeon.importers.onnx_importer import OnnxImporter, import_onnx
+from onnx_graphsurgeon.ir.graph import Graph
 from onnx_graphsurgeon.ir.node import Node
 from onnx_graphsurgeon.ir.tensor import Constant, LazyValues, Tensor, Variable
 
@@ -180,3 +183,140 @@ class TestOnnxExporter(object):
         # ONNX exports the initializers in this model differently after importing - ONNX GS can't do much about this.
         if model.path != lstm_model().path:
             assert onnx_graph == exported_onnx_graph
+
+
+    def test_export_graph_keeps_external_data_references(self):
+        model = ext_weights()
+        graph = import_onnx(model.path)
+        exported_model = export_onnx(graph)
+
+        for initializer in exported_model.graph.initializer:
+            assert initializer.data_location == onnx.TensorProto.EXTERNAL
+            assert not initializer.HasField("raw_data")
+
+        # Exporting should not load the values of the initializers.
+        assert all(isinstance(tensor._values, LazyValues) for tensor in graph.tensors().values() if isinstance(tensor, Constant))
+        assert exported_model.graph == onnx.load(model.path, load_external_data=False).graph
+
+
+    @pytest.mark.parametrize("alignment", [1, 64, 4096])
+    def test_export_onnx_external_data(self, tmp_path, alignment):
+        large = [Constant("large{:}".format(i), values=np.random.random_sample(size=(i + 1, 100)).astype(np.float32)) for i in range(3)]
+        small = Constant("small", values=np.ones((2, 2), dtype=np.float32))
+        inp = Variable("input", dtype=np.float32, shape=(1, 100))
+
+        nodes = []
+        tensor = inp
+        for const in large + [small]:
+            out = Variable("{:}_out".format(const.name), dtype=np.float32)
+            nodes.append(Node("MatMul" if const is small else "Add", inputs=[tensor, const], outputs=[out]))
+            tensor = out
+        graph = Graph(nodes=nodes, inputs=[inp], outputs=[tensor])
+
+        data_path = str(tmp_path / "model.data")
+        model = export_onnx(graph, external_data_path=data_path, external_data_size_threshold=400, external_data_alignment=alignment)
+
+        initializers = {tensor.name: tensor for tensor in model.graph.initializer}
+        assert not initializers["small"].external_data
+        for const in large:
+            onnx_tensor = initializers[const.name]
+            assert onnx_tensor.data_location == onnx.TensorProto.EXTERNAL
+            assert not onnx_tensor.HasField("raw_data")
+            info = {entry.key: entry.value for entry in onnx_tensor.external_data}
+            assert info["location"] == "model.data"
+            assert int(info["offset"]) % alignment == 0
+
+        model_path = str(tmp_path / "model.onnx")
+        onnx.save(model, model_path)
+        reimported = OnnxImporter.import_graph(onnx.load(model_path).graph)
+        for const in large + [small]:
+            assert np.array_equal(reimported.tensors()[const.name].values, const.values)
+
+
+    # Constants imported lazily should be copied into the new external data file without being embedded in the model.
+    def test_export_onnx_external_data_from_lazy_values(self, tmp_path):
+        graph = import_onnx(ext_weights().path)
+        data_path = str(tmp_path / "model.data")
+        model = export_onnx(graph, external_data_path=data_path, external_data_size_threshold=0)
+
+        for initializer in model.graph.initializer:
+            assert initializer.data_location == onnx.TensorProto.EXTERNAL
+            assert not initializer.HasField("raw_data")
+        assert all(isinstance(tensor._values, LazyValues) for tensor in graph.tensors().values() if isinstance(tensor, Constant))
+
+        model_path = str(tmp_path / "model.onnx")
+        onnx.save(model, model_path)
+        ext_weights().assert_equal(import_onnx(model_path))
+
+
+
+    # References to unloaded external data are relative to the original model, so saving elsewhere requires copying the data.
+    @pytest.mark.parametrize("size_threshold", [0, 1024])
+    def test_export_onnx_external_data_to_other_directory(self, tmp_path, size_threshold):
+        graph = import_onnx(ext_weights().path)
+        model = export_onnx(graph, external_data_path=str(tmp_path / "model.data"), external_data_size_threshold=size_threshold)
+
+        for initializer in model.graph.initializer:
+            location = {entry.key: entry.value for entry in initializer.external_data}.get("location")
+            assert location == ("model.data" if size_threshold == 0 else None)
+
+        model_path = str(tmp_path / "model.onnx")
+        onnx.save(model, model_path)
+        ext_weights().assert_equal(import_onnx(model_path))
+
+
+    def test_export_onnx_external_data_to_same_directory_keeps_references(self, tmp_path):
+        for name in ["ext_weights.onnx", "ext_weights.data"]:
+            shutil.copy(os.path.join(os.path.dirname(ext_weights().path), name), str(tmp_path))
+
+        graph = import_onnx(str(tmp_path / "ext_weights.onnx"))
+        model = export_onnx(graph, external_data_path=str(tmp_path / "model.data"), external_data_size_threshold=0)
+        assert model.graph == onnx.load(str(tmp_path / "ext_weights.onnx"), load_external_data=False).graph
+
+        model_path = str(tmp_path / "model.onnx")
+        onnx.save(model, model_path)
+        ext_weights().assert_equal(import_onnx(model_path))
+
+
+    # Overwriting the external data file that the values are memory-mapped from must not corrupt them.
+    def test_export_onnx_external_data_to_original_file(self, tmp_path):
+        for name in ["ext_weights.onnx", "ext_weights.data"]:
+            shutil.copy(os.path.join(os.path.dirname(ext_weights().path), name), str(tmp_path))
+
+        model_path = str(tmp_path / "ext_weights.onnx")
+        graph = import_onnx(model_path)
+        graph.tensors()["a"].values[:] = 2
+        model = export_onnx(graph, external_data_path=str(tmp_path / "ext_weights.data"), external_data_size_threshold=0)
+        onnx.save(model, model_path)
+
+        reimported = import_onnx(model_path).tensors()
+        assert np.all(reimported["a"].values == 2)
+        assert np.all(reimported["b"].values == 1)
+        assert sorted(os.listdir(str(tmp_path))) == ["ext_weights.data", "ext_weights.onnx"]
+
+
+    # Types which NumPy cannot represent must keep their ONNX data type and original bytes.
+    @pytest.mark.parametrize("from_path", [False, True])
+    def test_export_onnx_external_data_bfloat16(self, tmp_path, from_path):
+        data = np.arange(1024, dtype=np.uint16).tobytes()
+        tensor = onnx.helper.make_tensor("a", onnx.TensorProto.BFLOAT16, dims=(1024, ), vals=data, raw=True)
+        node = onnx.helper.make_node("Identity", inputs=["a"], outputs=["out"])
+        out = onnx.helper.make_tensor_value_info("out", onnx.TensorProto.BFLOAT16, (1024, ))
+        model = onnx.helper.make_model(onnx.helper.make_graph([node], "bf16", inputs=[], outputs=[out], initializer=[tensor]))
+
+        if from_path:
+            os.mkdir(str(tmp_path / "original"))
+            original_path = str(tmp_path / "original" / "model.onnx")
+            onnx.save(model, original_path, save_as_external_data=True, location="model.data", size_threshold=0)
+            graph = import_onnx(original_path)
+        else:
+            graph = import_onnx(model)
+
+        exported = export_onnx(graph, external_data_path=str(tmp_path / "model.data"))
+        initializer = exported.graph.initializer[0]
+        assert initializer.data_type == onnx.TensorProto.BFLOAT16
+        assert {entry.key: entry.value for entry in initializer.external_data}["length"] == str(len(data))
+
+        model_path = str(tmp_path / "model.onnx")
+        onnx.save(exported, model_path)
+        assert onnx.load(model_path).graph.initializer[0].raw_data == data
@@ -21,8 +21,8 @@ import onnx
 import onnx.numpy_helper
 import onnx.shape_inference
 import pytest
-from onnx_graphsurgeon.importers.onnx_importer import OnnxImporter
-from onnx_graphsurgeon.ir.tensor import Constant, Variable
+from onnx_graphsurgeon.importers.onnx_importer import OnnxImporter, import_onnx
+from onnx_graphsurgeon.ir.tensor import Constant, LazyValues, Variable
 from onnx_graphsurgeon.logger.logger import G_LOGGER
 
 from onnx_models import (dim_param_model, ext_weights, identity_model,
@@ -152,3 +152,59 @@ class TestOnnxImporter(object):
         model = dim_param_model()
         graph = OnnxImporter.import_graph(model.load().graph)
         model.assert_equal(graph)
+
+
+    def test_import_onnx_from_path(self):
+        model = ext_weights()
+        graph = import_onnx(model.path)
+        model.assert_equal(graph)
+
+
+    def test_import_onnx_from_path_maps_external_data(self):
+        model = ext_weights()
+        graph = import_onnx(model.path)
+
+        constants = [tensor for tensor in graph.tensors().values() if isinstance(tensor, Constant)]
+        assert len(constants) == 3
+        for tensor in constants:
+            assert isinstance(tensor._values, LazyValues)
+            assert tensor._values.is_external()
+            assert tuple(tensor.shape) == (1, 3)
+
+            assert isinstance(tensor.values, np.memmap)
+            assert np.all(tensor.values == np.ones((1, 3), dtype=np.float32))
+
+        # Modifying the values must not modify the external data file.
+        constants[0].values[:] = 2
+        assert np.all(onnx.numpy_helper.to_array(model.load().graph.initializer[0]) == 1)
+
+
+
+    # BFLOAT16 values are imported as FLOAT, which is twice as large, so they cannot be memory-mapped.
+    @pytest.mark.parametrize("with_length", [True, False])
+    def test_import_onnx_from_path_bfloat16_external_data(self, tmp_path, with_length):
+        values = np.array([[1.5, -2, 0.25], [3, 0, -0.5]], dtype=np.float32)
+        data = (values.view(np.uint32) >> 16).astype(np.uint16).tobytes()
+        with open(str(tmp_path / "model.data"), "wb") as f:
+            # Without a length, the data extends to the end of the file. Otherwise, trailing bytes must not be read.
+            f.write(data + (b"\xff" * len(data) if with_length else b""))
+
+        tensor = onnx.TensorProto()
+        tensor.name = "a"
+        tensor.data_type = onnx.TensorProto.BFLOAT16
+        tensor.dims.extend(values.shape)
+        tensor.data_location = onnx.TensorProto.EXTERNAL
+        for key, value in [("location", "model.data"), ("offset", "0")] + ([("length", str(len(data)))] if with_length else []):
+            entry = tensor.external_data.add()
+            entry.key = key
+            entry.value = value
+
+        node = onnx.helper.make_node("Identity", inputs=["a"], outputs=["out"])
+        out = onnx.helper.make_tensor_value_info("out", onnx.TensorProto.BFLOAT16, values.shape)
+        model_path = str(tmp_path / "model.onnx")
+        onnx.save(onnx.helper.make_model(onnx.helper.make_graph([node], "bf16", inputs=[], outputs=[out], initializer=[tensor])), model_path)
+
+        graph = import_onnx(model_path)
+        const = graph.tensors()["a"]
+        assert const.values.dtype == np.float32
+        assert np.array_equal(const.values, values)
@@ -310,3 +310,60 @@ class TestNodeIO(object):
         assert nlist[0] == new_tensor
         assert len(getattr(self.tensors[0], tensor_field)) == 0
         assert getattr(new_tensor, tensor_field)[0] == self.node
+
+
+    def test_remove_preserves_peer_order(self):
+        tensor = self.tensors[0]
+        nodes = [Node(op="Dummy", name="node_{:}".format(i), inputs=[tensor]) for i in range(5)]
+        nodes[1].inputs.clear()
+        nodes[3].inputs.remove(tensor)
+        assert len(tensor.outputs) == 3
+        assert all([out is node for out, node in zip(tensor.outputs, [nodes[0], nodes[2], nodes[4]])])
+
+
+    def test_remove_duplicate_entry(self):
+        tensor = self.tensors[0]
+        self.node.inputs.extend([tensor, tensor])
+        assert tensor.outputs == [self.node, self.node]
+        self.node.inputs.pop()
+        assert tensor.outputs == [self.node]
+        self.node.inputs.pop()
+        assert tensor.outputs == []
+
+
+    # Removal should be based on identity rather than equality.
+    def test_remove_equal_but_not_identical(self):
+        tensor = self.tensors[0]
+        node0 = Node(op="Dummy", name="node", inputs=[tensor])
+        node1 = Node(op="Dummy", name="node", inputs=[tensor])
+        assert node0 == node1
+
+        node1.inputs.clear()
+        assert len(tensor.outputs) == 1
+        assert tensor.outputs[0] is node0
+
+
+    def test_re_add_after_remove(self):
+        tensor = self.tensors[0]
+        other = Node(op="Dummy", name="other", inputs=[tensor])
+        self.node.inputs.append(tensor)
+        self.node.inputs.clear()
+        self.node.inputs.append(tensor)
+        assert len(tensor.outputs) == 2
+        assert tensor.outputs[0] is other
+        assert tensor.outputs[1] is self.node
+
+
+    @pytest.mark.parametrize("fanout", [5000])
+    def test_rewire_high_fanout_tensor(self, fanout):
+        tensor = self.tensors[0]
+        new_tensor = self.tensors[1]
+        nodes = [Node(op="Dummy", name="node_{:}".format(i), inputs=[tensor]) for i in range(fanout)]
+
+        # Rewire in reverse order, which is the worst case for a linear search.
+        for node in reversed(nodes):
+            node.inputs[0] = new_tensor
+
+        assert len(tensor.outputs) == 0
+        assert len(new_tensor.outputs) == fanout
+        assert all([out is node for out, node in zip(new_tensor.outputs, reversed(nodes))])
@@ -0,0 +1,265 @@
+#
+# Copyright (c) 2021, NVIDIA CORPORATION. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import numpy as np
+import onnx_graphsurgeon as gs
+import pytest
+from onnx_graphsurgeon.ir.graph import Graph
+from onnx_graphsurgeon.ir.node import Node
+from onnx_graphsurgeon.ir.tensor import Constant, Variable
+from onnx_graphsurgeon.logger.logger import G_LOGGER
+from onnx_graphsurgeon.patterns import bert
+from onnx_graphsurgeon.patterns.pattern import Pattern, PatternNode
+from onnx_graphsurgeon.util.exception import OnnxGraphSurgeonException
+
+G_LOGGER.severity = G_LOGGER.ULTRA_VERBOSE
+
+
+def add_relu_pattern():
+    pattern = Pattern()
+    x = pattern.input("x")
+    bias = pattern.input("bias", constant=True)
+    add = pattern.node("Add", inputs=[x, bias], name="add")
+    pattern.node("Relu", inputs=[add], name="relu")
+    return pattern
+
+
+# Builds a chain of (Add(bias) -> Relu) blocks.
+def add_relu_graph(num_blocks, swap_inputs=False):
+    inp = Variable("input", dtype=np.float32, shape=(4, ))
+    tensor = inp
+    nodes = []
+    for index in range(num_blocks):
+        bias = Constant("bias{:}".format(index), np.ones((4, ), dtype=np.float32))
+        add_out = Variable("add_out{:}".format(index))
+        relu_out = Variable("relu_out{:}".format(index))
+        nodes.append(Node("Add", name="add{:}".format(index), inputs=[bias, tensor] if swap_inputs else [tensor, bias], outputs=[add_out]))
+        nodes.append(Node("Relu", name="relu{:}".format(index), inputs=[add_out], outputs=[relu_out]))
+        tensor = relu_out
+    return Graph(nodes=nodes, inputs=[inp], outputs=[tensor])
+
+
+class TestPattern(object):
+    @pytest.mark.parametrize("swap_inputs", [False, True])
+    def test_match(self, swap_inputs):
+        graph = add_relu_graph(3, swap_inputs=swap_inputs)
+        matches = add_relu_pattern().match(graph)
+
+        assert len(matches) == 3
+        for index, match in enumerate(matches):
+            assert match["add"] is graph.nodes[2 * index]
+            assert match["relu"] is graph.nodes[2 * index + 1]
+            assert match["bias"].name == "bias{:}".format(index)
+            assert match.inputs == [match["x"], match["bias"]]
+            assert match.outputs == [graph.nodes[2 * index + 1].outputs[0]]
+
+
+    def test_no_match_non_commutative(self):
+        graph = add_relu_graph(1, swap_inputs=True)
+        pattern = add_relu_pattern()
+        pattern.nodes[0].commutative = False
+        assert pattern.match(graph) == []
+
+
+    def test_no_match_constant(self):
+        graph = add_relu_graph(1)
+        graph.nodes[0].inputs[1] = Variable("not_a_constant")
+        assert add_relu_pattern().match(graph) == []
+
+
+    def test_no_match_intermediate_used_outside(self):
+        graph = add_relu_graph(2)
+        # The output of the first Add is now also used by a node outside the pattern.
+        graph.nodes.append(Node("Identity", inputs=[graph.nodes[0].outputs[0]], outputs=[Variable("identity_out")]))
+        matches = add_relu_pattern().match(graph)
+        assert len(matches) == 1
+        assert matches[0]["add"] is graph.nodes[2]
+
+
+    def test_no_match_intermediate_graph_output(self):
+        graph = add_relu_graph(1)
+        graph.outputs.append(graph.nodes[0].outputs[0])
+        assert add_relu_pattern().match(graph) == []
+
+
+    def test_attrs(self):
+        pattern = Pattern()
+        x = pattern.input("x")
+        pattern.node("Transpose", inputs=[x], attrs={"perm": [1, 0]}, name="transpose")
+        check_pattern = Pattern()
+        check_pattern.node("Transpose", inputs=[check_pattern.input()], attrs={"perm": lambda perm: perm is None})
+
+        inp = Variable("input")
+        nodes = [
+            Node("Transpose", attrs={"perm": [1, 0]}, inputs=[inp], outputs=[Variable("out0")]),
+            Node("Transpose", attrs={"perm": [0, 1]}, inputs=[inp], outputs=[Variable("out1")]),
+            Node("Transpose", inputs=[inp], outputs=[Variable("out2")]),
+        ]
+        graph = Graph(nodes=nodes, inputs=[inp], outputs=[node.outputs[0] for node in nodes])
+
+        assert [match["transpose"] for match in pattern.match(graph)] == [nodes[0]]
+        assert [match.nodes["node0"] for match in check_pattern.match(graph)] == [nodes[2]]
+
+
+    def test_multi_output(self):
+        pattern = Pattern()
+        x = pattern.input("x")
+        first, second = pattern.node("Split", inputs=[x], num_outputs=2, name="split")
+        relu = pattern.node("Relu", inputs=[first], name="relu")
+        sigmoid = pattern.node("Sigmoid", inputs=[second], name="sigmoid")
+        pattern.outputs = [sigmoid, relu]
+
+        inp = Variable("input")
+        split_outs = [Variable("split_out0"), Variable("split_out1")]
+        relu_out, sigmoid_out = Variable("relu_out"), Variable("sigmoid_out")
+        nodes = [
+            Node("Split", inputs=[inp], outputs=split_outs),
+            Node("Relu", inputs=[split_outs[0]], outputs=[relu_out]),
+            Node("Sigmoid", inputs=[split_outs[1]], outputs=[sigmoid_out]),
+        ]
+        graph = Graph(nodes=nodes, inputs=[inp], outputs=[relu_out, sigmoid_out])
+
+        matches = pattern.match(graph)
+        assert len(matches) == 1
+        assert matches[0].outputs == [sigmoid_out, relu_out]
+        assert set(map(id, matches[0].nodes.values())) == set(map(id, nodes))
+
+
+    def test_non_overlapping(self):
+        pattern = Pattern()
+        x = pattern.input("x")
+        pattern.node("Relu", inputs=[pattern.node("Relu", inputs=[x])])
+
+        # A chain of 5 Relus contains 4 overlapping matches, but only 2 non-overlapping ones.
+        tensors = [Variable("t{:}".format(index)) for index in range(6)]
+        nodes = [Node("Relu", inputs=[tensors[index]], outputs=[tensors[index + 1]]) for index in range(5)]
+        graph = Graph(nodes=nodes, inputs=[tensors[0]], outputs=[tensors[-1]])
+
+        matches = pattern.match(graph)
+        assert len(matches) == 2
+        assert len(set(id(node) for match in matches for node in match.nodes.values())) == 4
+
+
+    def test_disconnected_pattern(self):
+        pattern = Pattern()
+        pattern.node("Relu", inputs=[pattern.input()])
+        pattern.node("Relu", inputs=[pattern.input()])
+        with pytest.raises(OnnxGraphSurgeonException):
+            pattern.match(add_relu_graph(1))
+
+
+    def test_rewrite(self):
+        graph = add_relu_graph(3)
+        graph.nodes.append(Node("Identity", inputs=[graph.outputs[0]], outputs=[Variable("identity_out")]))
+        graph.outputs = [graph.nodes[-1].outputs[0]]
+
+        def replace(match):
+            # Leave the second match unchanged.
+            if match["bias"].name == "bias1":
+                return None
+            return Node("BiasRelu", inputs=match.inputs, outputs=match.outputs)
+
+        assert add_relu_pattern().rewrite(graph, replace) == 2
+        assert [node.op for node in graph.nodes] == ["BiasRelu", "Add", "Relu", "BiasRelu", "Identity"]
+        assert graph.nodes[0].outputs[0].inputs == [graph.nodes[0]]
+        assert graph.nodes[1].inputs[0] is graph.nodes[0].outputs[0]
+        assert graph.nodes[4].inputs[0] is graph.nodes[3].outputs[0]
+        # The replaced nodes are disconnected
+        assert len(graph.tensors()["bias0"].outputs) == 1
+
+        # The graph should still be topologically sorted.
+        nodes = list(graph.nodes)
+        graph.toposort()
+        assert all(a is b for a, b in zip(nodes, graph.nodes))
+
+
+    # Each node in the graph should be compared with at most one node in the pattern per match attempt,
+    # so the number of comparisons is proportional to the size of the graph.
+    @pytest.mark.parametrize("swap_inputs", [False, True])
+    def test_match_is_linear(self, swap_inputs, monkeypatch):
+        num_calls = [0]
+        pattern_node_matches = PatternNode.matches
+        def count_matches(self, node):
+            num_calls[0] += 1
+            return pattern_node_matches(self, node)
+        monkeypatch.setattr(PatternNode, "matches", count_matches)
+
+        for num_blocks in [10, 1000]:
+            num_calls[0] = 0
+            assert len(add_relu_pattern().match(add_relu_graph(num_blocks, swap_inputs=swap_inputs))) == num_blocks
+            assert num_calls[0] == 2 * num_blocks
+
+
+# Builds a BERT-like layer with the same ops as the ONNX models exported from PyTorch.
+def bert_layer_graph(hidden_size=8):
+    graph = Graph(opset=11)
+    inp = Variable("input", dtype=np.float32, shape=(1, 4, hidden_size))
+    graph.inputs = [inp]
+
+    def layer(op, inputs, **attrs):
+        return graph.layer(op=op, inputs=inputs, outputs=["{:}_out".format(op.lower())], attrs=attrs)[0]
+
+    def const(value):
+        return np.array(value, dtype=np.float32)
+
+    def layer_norm(x):
+        mean = layer("ReduceMean", [x], axes=[-1])
+        centered = layer("Sub", [x, mean])
+        variance = layer("ReduceMean", [layer("Pow", [centered, const(2.0)])], axes=[-1])
+        stddev = layer("Sqrt", [layer("Add", [variance, const(1e-12)])])
+        scaled = layer("Mul", [layer("Div", [centered, stddev]), np.ones(hidden_size, dtype=np.float32)])
+        return layer("Add", [scaled, np.zeros(hidden_size, dtype=np.float32)])
+
+    weights = np.random.random_sample((hidden_size, hidden_size)).astype(np.float32)
+    dense = layer("Add", [layer("MatMul", [inp, weights]), np.ones(hidden_size, dtype=np.float32)])
+    attention_ln = layer_norm(layer("Add", [dense, inp]))
+
+    intermediate = layer("MatMul", [attention_ln, weights])
+    product = layer("Mul", [intermediate, layer("Add", [layer("Erf", [layer("Div", [intermediate, const(1.4142135)])]), const(1.0)])])
+    gelu = layer("Mul", [product, const(0.5)])
+
+    out = layer("MatMul", [gelu, weights])
+    graph.outputs = [layer_norm(layer("Add", [attention_ln, out]))]
+    graph.outputs[0].dtype = np.float32
+    return graph
+
+
+class TestBertPatterns(object):
+    def test_patterns(self):
+        graph = bert_layer_graph()
+        assert len(bert.layer_norm().match(graph)) == 2
+        assert len(bert.skip_layer_norm().match(graph)) == 2
+        assert len(bert.skip_layer_norm(with_bias=True).match(graph)) == 1
+        assert len(bert.gelu().match(graph)) == 1
+
+
+    def test_fuse(self):
+        graph = bert_layer_graph()
+        counts = bert.fuse(graph, type_id=1)
+        assert counts == {bert.SKIP_LAYER_NORM_PLUGIN: 2, bert.GELU_PLUGIN: 1}
+
+        graph.cleanup()
+        assert [node.op for node in graph.nodes] == ["MatMul", bert.SKIP_LAYER_NORM_PLUGIN, "MatMul", bert.GELU_PLUGIN,
+                                                      "MatMul", bert.SKIP_LAYER_NORM_PLUGIN]
+        first_skip_ln = graph.nodes[1]
+        assert first_skip_ln.attrs["ld"] == 8
+        assert first_skip_ln.attrs["type_id"] == 1
+        assert np.all(first_skip_ln.attrs["bias"].values == 1)
+        assert "bias" not in graph.nodes[5].attrs
+        assert graph.nodes[3].inputs[0] is graph.nodes[2].outputs[0]
+
+        # The fused graph should be exportable
+        gs.export_onnx(graph)
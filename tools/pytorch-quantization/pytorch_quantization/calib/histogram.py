@@ -16,9 +16,8 @@
 
 
 """Histogram based calibrators"""
-from collections import Counter
 import numpy as np
-from scipy.stats import entropy
+from scipy.special import rel_entr
 
 from absl import logging
 
@@ -37,6 +36,9 @@ class HistogramCalibrator(_Calibrator):
     Histogram will be only collected once. compute_amax() performs entropy, percentile, or mse
         calibration based on arguments
 
+    If axis is set, one histogram is collected per channel. The counts of all channels are stored in a single tensor,
+        and amax has the same shape as the one of MaxCalibrator.
+
     Args:
         num_bits: An integer. Number of bits of quantization.
         axis: A tuple. see QuantDescriptor.
@@ -53,40 +55,99 @@ class HistogramCalibrator(_Calibrator):
         self._calib_bin_edges = None
         self._calib_hist = None
 
-        if axis is not None:
-            raise NotImplementedError("Calibrator histogram collection only supports per tensor scaling")
-
         if grow_method is not None:
             logging.warning("grow_method is deprecated. Got %s, ingored!", grow_method)
 
     def collect(self, x):
-        """Collect histogram"""
-        if torch.min(x) < 0.:
+        """Collect histogram
+
+        Counts are accumulated on the device of x, only the bin edges are kept on the host. The range of x is copied
+        to the host to update the edges, which are copied back to bin x. That round trip is the only synchronization
+        per call.
+
+        Args:
+            x: A tensor
+
+        Raises:
+            RuntimeError: If histogram shape changes
+        """
+        x = x.detach().float()
+        # Take abs() unconditionally, checking the sign first would synchronize. Negative values are only logged, so
+        # the minimum of x is copied to the host together with the range below.
+        x_min_signed = x.min()
+        x = x.abs()
+
+        # Histograms are computed for all channels at once, one row of x per channel. Per tensor is a single channel.
+        if self._axis is None:
+            amax_shape = []
+            x = x.reshape(1, -1)
+        else:
+            axis = self._axis if isinstance(self._axis, (list, tuple)) else [self._axis]
+            axis = sorted(i % x.dim() for i in axis)
+            amax_shape = [x.shape[i] if i in axis else 1 for i in range(x.dim())]
+            reduce_axis = [i for i in range(x.dim()) if i not in axis]
+            x = x.permute(*axis, *reduce_axis).reshape(int(np.prod(amax_shape)), -1)
+
+        if self._skip_zeros:
+            skip = x == 0
+            x_min = x.masked_fill(skip, float("inf")).amin(dim=1)
+            x_max = x.masked_fill(skip, -float("inf")).amax(dim=1)
+        else:
+            skip = None
+            x_min, x_max = x.amin(dim=1), x.amax(dim=1)
+        x_range = torch.cat((x_min, x_max, x_min_signed.view(1))).double().cpu().numpy()
+        x_min, x_max = x_range[:-1].reshape(2, -1)
+        if x_range[-1] < 0.:
             logging.log_first_n(
                 logging.INFO,
                 ("Calibrator encountered negative values. It shouldn't happen after ReLU. "
                  "Make sure this is the right tensor to calibrate."),
                 1)
-            x = x.abs()
-        x_np = x.cpu().detach().numpy()
-
-        if self._skip_zeros:
-            x_np = x_np[np.where(x_np != 0)]
 
         if self._calib_bin_edges is None and self._calib_hist is None:
-            # first time it uses num_bins to compute histogram.
-            self._calib_hist, self._calib_bin_edges = np.histogram(x_np, bins=self._num_bins)
+            # first time it uses num_bins to compute histogram. The range of each channel is picked like np.histogram
+            # does, including for empty and constant channels.
+            empty = x_min > x_max
+            first_edge = np.where(empty, 0., x_min)
+            last_edge = np.where(empty, 1., x_max)
+            constant = first_edge == last_edge
+            first_edge = np.where(constant, first_edge - 0.5, first_edge)
+            last_edge = np.where(constant, last_edge + 0.5, last_edge)
+            calib_bin_edges = np.linspace(first_edge, last_edge, self._num_bins + 1, axis=-1)
+            calib_hist = torch.zeros(x.shape[0], self._num_bins, dtype=torch.long, device=x.device)
         else:
-            temp_amax = np.max(x_np)
-            if temp_amax > self._calib_bin_edges[-1]:
-                # increase the number of bins
-                width = self._calib_bin_edges[1] - self._calib_bin_edges[0]
-                # NOTE: np.arange may create an extra bin after the one containing temp_amax
-                new_bin_edges = np.arange(self._calib_bin_edges[-1] + width, temp_amax + width, width)
-                self._calib_bin_edges = np.hstack((self._calib_bin_edges, new_bin_edges))
-            hist, self._calib_bin_edges = np.histogram(x_np, bins=self._calib_bin_edges)
-            hist[:len(self._calib_hist)] += self._calib_hist
-            self._calib_hist = hist
+            if list(self._calib_hist.shape[:-1]) != amax_shape:
+                raise RuntimeError("Histogram shape changed!")
+            calib_bin_edges = self._calib_bin_edges.reshape(x.shape[0], -1)
+            calib_hist = self._calib_hist.view(x.shape[0], -1)
+
+            last_edge = calib_bin_edges[:, -1]
+            if np.any(x_max > last_edge):
+                # increase the number of bins. Collected counts stay in their bins, new ones are empty. All channels
+                # get the same number of bins, so that their counts stay a 2-D tensor.
+                width = calib_bin_edges[:, 1] - calib_bin_edges[:, 0]
+                num_new_bins = np.ceil((x_max - last_edge) / width)
+                num_new_bins[last_edge + num_new_bins * width < x_max] += 1
+                num_new_bins = int(np.max(num_new_bins))
+                new_bin_edges = last_edge[:, None] + width[:, None] * np.arange(1, num_new_bins + 1)
+                calib_bin_edges = np.hstack((calib_bin_edges, new_bin_edges))
+                calib_hist = torch.cat((calib_hist, calib_hist.new_zeros(x.shape[0], num_new_bins)), dim=1)
+
+        # Bins are uniform, so the bin of every value of every channel is computed directly, like torch.histc does.
+        # Values outside of the edges are dropped, like np.histogram does.
+        num_bins = calib_hist.shape[1]
+        first_edge = torch.tensor(calib_bin_edges[:, :1], dtype=torch.float32, device=x.device)
+        last_edge = torch.tensor(calib_bin_edges[:, -1:], dtype=torch.float32, device=x.device)
+        outside = (x < first_edge) | (x > last_edge)
+        skip = outside if skip is None else skip | outside
+
+        bin_index = ((x - first_edge) * (num_bins / (last_edge - first_edge))).long().clamp_(0, num_bins - 1)
+        bin_index += torch.arange(x.shape[0], device=x.device).unsqueeze(1) * num_bins
+        # Skipped values are counted with a weight of 0 instead of being masked out, which would synchronize.
+        calib_hist.view(-1).scatter_add_(0, bin_index.view(-1), (~skip).view(-1).long())
+
+        self._calib_bin_edges = calib_bin_edges.reshape(*amax_shape, -1)
+        self._calib_hist = calib_hist.view(*amax_shape, -1)
 
     def reset(self):
         """Reset the collected histogram"""
@@ -108,14 +169,19 @@ class HistogramCalibrator(_Calibrator):
         Returns:
             amax: a tensor
         """
+        # Only mse is computed on the device of the histogram, the others need it on the host.
+        calib_hist = self._calib_hist
+        if calib_hist is not None and method != 'mse':
+            calib_hist = calib_hist.cpu().numpy()
+
         if method == 'entropy':
             calib_amax = _compute_amax_entropy(
-                self._calib_hist, self._calib_bin_edges, self._num_bits, self._unsigned, stride, start_bin)
+                calib_hist, self._calib_bin_edges, self._num_bits, self._unsigned, stride, start_bin)
         elif method == 'mse':
             calib_amax = _compute_amax_mse(
-                self._calib_hist, self._calib_bin_edges, self._num_bits, self._unsigned, stride, start_bin)
+                calib_hist, self._calib_bin_edges, self._num_bits, self._unsigned, stride, start_bin)
         elif method == 'percentile':
-            calib_amax = _compute_amax_percentile(self._calib_hist, self._calib_bin_edges, percentile)
+            calib_amax = _compute_amax_percentile(calib_hist, self._calib_bin_edges, percentile)
         else:
             raise TypeError("Unknown calibration method {}".format(method))
 
@@ -128,7 +194,8 @@ class HistogramCalibrator(_Calibrator):
             bin_edge_str = "None"
         else:
             bin_edge_str = "[{:.3f}, ..., {:.3f}]({})".format(
-                self._calib_bin_edges[0], self._calib_bin_edges[-1], len(self._calib_bin_edges))
+                self._calib_bin_edges[..., 0].min(), self._calib_bin_edges[..., -1].max(),
+                self._calib_bin_edges.shape[-1])
         s += "calib_bin_edges={})".format(bin_edge_str)
         return s
 
@@ -141,6 +208,10 @@ class HistogramCalibrator(_Calibrator):
     # pylint:enable=missing-docstring
 
 
+# Maximum number of elements of the [candidates x bins] intermediates of _compute_amax_mse
+_MSE_CHUNK_NUMEL = 1 << 22
+
+
 # Ideally, we want to decouple collector (collect histogram) and calibrator (compute amax) as opposed to
 # the current calibrator design. The following compute amax functions are broken out from the calibrator
 # as first step towards there.
@@ -151,18 +222,20 @@ def _compute_amax_entropy(calib_hist, calib_bin_edges, num_bits, unsigned, strid
     if calib_bin_edges is None and calib_hist is None:
         return None
 
-    def _normalize_distr(distr):
-        summ = np.sum(distr)
-        if summ != 0:
-            distr = distr / summ
+    if calib_hist.ndim > 1:
+        # One histogram per channel, each of them is swept on its own.
+        calib_amax = [
+            _compute_amax_entropy(hist, bin_edges, num_bits, unsigned, stride, start_bin) for hist, bin_edges in zip(
+                calib_hist.reshape(-1, calib_hist.shape[-1]), calib_bin_edges.reshape(-1, calib_bin_edges.shape[-1]))]
+        return torch.stack(calib_amax).reshape(calib_hist.shape[:-1])
 
-    bins = calib_hist[:]
+    # Copy, calib_hist may share memory with the collected histogram, which must not be modified.
+    bins = np.array(calib_hist, copy=True)
     bins[0] = bins[1]
 
     total_data = np.sum(bins)
 
     divergences = []
-    arguments = []
 
     # we are quantizing to 128 values + sign if num_bits=8
     nbins = 1 << (num_bits - 1 + int(unsigned))
@@ -170,33 +243,29 @@ def _compute_amax_entropy(calib_hist, calib_bin_edges, num_bits, unsigned, strid
     starting = start_bin
     stop = len(bins)
 
-    new_density_counts = np.zeros(nbins, dtype=np.float64)
+    # Prefix sums of the counts and of the number of non-empty bins, so that the totals of any range of bins
+    # can be looked up without iterating over it. Counts are integers, so the sums are exact.
+    nonzero = bins != 0
+    bins_cumsum = np.concatenate(([0], np.cumsum(bins)))
+    nonzero_cumsum = np.concatenate(([0], np.cumsum(nonzero)))
 
     for i in range(starting, stop + 1, stride):
-        new_density_counts.fill(0)
+        # Bin j is merged into quantized bin k if space[k] <= j < space[k + 1] (as np.digitize would do),
+        # so quantized bin k covers the bins in [ceil(space[k]), ceil(space[k + 1])).
         space = np.linspace(0, i, num=nbins + 1)
-        digitized_space = np.digitize(range(i), space) - 1
-
-        digitized_space[bins[:i] == 0] = -1
-
-        for idx, digitized in enumerate(digitized_space):
-            if digitized != -1:
-                new_density_counts[digitized] += bins[idx]
-
-        counter = Counter(digitized_space)
-        for key, val in counter.items():
-            if key != -1:
-                new_density_counts[key] = new_density_counts[key] / val
+        edges = np.ceil(space).astype(np.int64)
 
-        new_density = np.zeros(i, dtype=np.float64)
-        for idx, digitized in enumerate(digitized_space):
-            if digitized != -1:
-                new_density[idx] = new_density_counts[digitized]
+        # Spread the counts of each quantized bin evenly over its non-empty bins.
+        counts = bins_cumsum[edges[1:]] - bins_cumsum[edges[:-1]]
+        num_nonzero = nonzero_cumsum[edges[1:]] - nonzero_cumsum[edges[:-1]]
+        new_density_counts = np.divide(counts, num_nonzero, out=np.zeros(nbins, dtype=np.float64),
+                                       where=num_nonzero != 0)
+        new_density = np.where(nonzero[:i], np.repeat(new_density_counts, np.diff(edges)), 0.)
 
-        total_counts_new = np.sum(new_density) + np.sum(bins[i:])
-        _normalize_distr(new_density)
+        sum_new_density = np.sum(new_density)
+        total_counts_new = sum_new_density + np.sum(bins[i:])
 
-        reference_density = np.array(bins[:len(digitized_space)])
+        reference_density = np.array(bins[:i])
         reference_density[-1] += np.sum(bins[i:])
 
         total_counts_old = np.sum(reference_density)
@@ -204,11 +273,11 @@ def _compute_amax_entropy(calib_hist, calib_bin_edges, num_bits, unsigned, strid
             raise RuntimeError("Count mismatch! total_counts_new={}, total_counts_old={}, total_data={}".format(
                 total_counts_new, total_counts_old, total_data))
 
-        _normalize_distr(reference_density)
-
-        ent = entropy(reference_density, new_density)
+        # Same arithmetic as scipy.stats.entropy(reference_density, new_density), without its per call overhead,
+        # which would otherwise dominate the sweep.
+        with np.errstate(invalid='ignore'):
+            ent = np.sum(rel_entr(reference_density / total_counts_old, new_density / sum_new_density))
         divergences.append(ent)
-        arguments.append(i)
 
     divergences = np.array(divergences)
     logging.debug("divergences={}".format(divergences))
@@ -225,26 +294,25 @@ def _compute_amax_mse(calib_hist, calib_bin_edges, num_bits, unsigned, stride=1,
     if calib_bin_edges is None and calib_hist is None:
         return None
 
-    counts = torch.from_numpy(calib_hist[:]).float()
-    edges = torch.from_numpy(calib_bin_edges[:]).float()
-    centers = (edges[1:] + edges[:-1]) / 2
-
-    mses = []
-    arguments = []
-
-    for i in range(start_bin, len(centers), stride):
-
-        amax = centers[i]
-        quant_centers = fake_tensor_quant(centers, amax, num_bits, unsigned)
+    counts = torch.as_tensor(calib_hist).float()
+    edges = torch.as_tensor(calib_bin_edges, device=counts.device).float()
+    centers = (edges[..., 1:] + edges[..., :-1]) / 2
 
-        mse = ((quant_centers - centers)**2 * counts).mean()
+    # Quantize the bin centers of all histograms against a chunk of candidate amaxs at a time. Each chunk is a
+    # [candidates x bins] broadcast per histogram, so the chunk size bounds the memory used.
+    arguments = torch.arange(start_bin, centers.shape[-1], stride, device=centers.device)
+    chunk_size = max(1, _MSE_CHUNK_NUMEL // centers.numel())
 
-        mses.append(mse)
-        arguments.append(i)
+    mses = []
+    for chunk in arguments.split(chunk_size):
+        amax = centers[..., chunk].unsqueeze(-1)
+        quant_centers = fake_tensor_quant(centers.unsqueeze(-2), amax, num_bits, unsigned)
+        mses.append(((quant_centers - centers.unsqueeze(-2))**2 * counts.unsqueeze(-2)).mean(dim=-1))
+    mses = torch.cat(mses, dim=-1)
 
     logging.debug("mses={}".format(mses))
-    argmin = np.argmin(mses)
-    calib_amax = centers[arguments[argmin]]
+    argmin = torch.argmin(mses, dim=-1, keepdim=True)
+    calib_amax = centers.gather(-1, arguments[argmin]).squeeze(-1)
 
     return calib_amax
 
@@ -258,11 +326,13 @@ def _compute_amax_percentile(calib_hist, calib_bin_edges, percentile):
     if calib_bin_edges is None and calib_hist is None:
         return None
 
-    total = calib_hist.sum()
-    cdf = np.cumsum(calib_hist / total)
-    idx = np.searchsorted(cdf, percentile / 100)
-    calib_amax = calib_bin_edges[idx]
-    calib_amax = torch.tensor(calib_amax.item()) #pylint: disable=not-callable
+    # Histograms are along the last axis. Counting the cdf values below the percentile is np.searchsorted(cdf, ...)
+    # for every histogram at once.
+    total = calib_hist.sum(axis=-1, keepdims=True)
+    cdf = np.cumsum(calib_hist / total, axis=-1)
+    idx = np.sum(cdf < percentile / 100, axis=-1)
+    calib_amax = np.take_along_axis(calib_bin_edges, idx[..., None], axis=-1)[..., 0]
+    calib_amax = torch.tensor(calib_amax, dtype=torch.float32) #pylint: disable=not-callable
 
     return calib_amax
 
@@ -276,7 +346,7 @@ def calibrate_weights(model, method="percentile", perchannel=True, percentile=99
     .. note::
         This function uses `method` specified by the argument to decide which method to use, NOT the one
         specified by the calibrator embedded in weight_quantizer.
-        We haven't moved calibration to GPU, so everything is transfered to CPU
+        Histograms of all channels are collected at once, on the device of the weight.
 
     Args:
         model: A torch.nn.Module.
@@ -300,43 +370,16 @@ def calibrate_weights(model, method="percentile", perchannel=True, percentile=99
                 axis = 1 if isinstance(module, channel_second_modules) else 0
             else:
                 axis = None
-            axis_size = module.weight.shape[axis] if axis is not None else 1
-
-            # Histogram is always collected even if method is "max". Although "max" is supported here
-            # but it is not the primary usage of this function
-            if axis is None:
-                calib_hist, calib_bin_edges = np.histogram(module.weight.abs().cpu().detach().numpy(), bins=2048)
-                calib_hist = [calib_hist]
-                calib_bin_edges = [calib_bin_edges]
-            else:
-                calib_hist = []
-                calib_bin_edges = []
-                for i in range(axis_size):
-                    hist, bin_edges = np.histogram(
-                        module.weight.index_select(
-                            axis, torch.tensor(i, device=module.weight.device)).abs().cpu().detach().numpy(),
-                        bins=num_bins)
-                    calib_hist.append(hist)
-                    calib_bin_edges.append(bin_edges)
-
-            calib_amax = []
+
+            # "max" is supported here but it is not the primary usage of this function
             if method == "max":
-                reduce_axis = list(range(module.weight.dim()))
-                reduce_axis.remove(axis)
-                calib_amax.append(quant_utils.reduce_amax(module.weight, axis=reduce_axis))
-            elif method == 'mse':
-                for i in range(axis_size):
-                    calib_amax.append(_compute_amax_mse(calib_hist[i], calib_bin_edges[i], num_bits, unsigned))
-            elif method == 'percentile':
-                for i in range(axis_size):
-                    calib_amax.append(_compute_amax_percentile(calib_hist[i], calib_bin_edges[i], percentile))
+                reduce_axis = None if axis is None else [i for i in range(module.weight.dim()) if i != axis]
+                calib_amax = quant_utils.reduce_amax(module.weight, axis=reduce_axis)
+            elif method in ("mse", "percentile"):
+                calibrator = HistogramCalibrator(num_bits, axis, unsigned, num_bins=num_bins)
+                calibrator.collect(module.weight)
+                calib_amax = calibrator.compute_amax(method, percentile=percentile)
             else:
                 raise TypeError("Unsupported calibration method {}".format(method))
 
-            if axis is None:
-                calib_amax = calib_amax[0]
-            else:
-                calib_amax_shape = [1] * module.weight.dim()
-                calib_amax_shape[axis] = module.weight.shape[axis]
-                calib_amax = torch.stack(calib_amax).reshape(calib_amax_shape)
             module.weight_quantizer.amax = calib_amax.detach().cpu().numpy()
@@ -86,7 +86,7 @@ class TensorQuantizer(nn.Module):
         self._if_calib = if_calib
 
         if quant_desc.amax is not None:
-            self.register_buffer('_amax', torch.tensor(quant_desc.amax))
+            self.register_buffer('_amax', self._check_amax(torch.tensor(quant_desc.amax)))
 
         # Clip module consumes a lot of memory, so only create it if learn_amax is True
         if self._learn_amax:
@@ -195,9 +195,9 @@ class TensorQuantizer(nn.Module):
             if isinstance(value, torch.Tensor):
                 logging.warning("amax setter is not designed to take tensor.")
             if not hasattr(self, "_amax"):
-                self.register_buffer('_amax', torch.tensor(value))
+                self.register_buffer('_amax', self._check_amax(torch.tensor(value)))
             else:
-                value = torch.tensor(value, device=self._amax.device)
+                value = self._check_amax(torch.tensor(value, device=self._amax.device))
                 if self._amax.shape != value.shape:
                     raise TypeError("Changing shape when setting amax is not allowed.")
                 self._amax.data.copy_(value.data)
@@ -234,6 +234,7 @@ class TensorQuantizer(nn.Module):
                 calib_amax = torch.tensor(math.nan)
             else:
                 raise RuntimeError(err_msg + " Passing 'strict=False' to `load_calib_amax()` will ignore the error.")
+        self._check_amax(calib_amax)
         logging.warning("Load calibrated amax, shape={}.".format(calib_amax.shape))
         logging.log_first_n(
             logging.WARNING, "Call .cuda() if running on GPU after loading calibrated amax.", 1)
@@ -242,6 +243,20 @@ class TensorQuantizer(nn.Module):
         else:
             self._amax.copy_(calib_amax)
 
+    @staticmethod
+    def _check_amax(amax):
+        """Checks amax when it is set, so that fake_tensor_quant doesn't have to check it on every call.
+
+        Returns:
+            amax: The checked tensor.
+
+        Raises:
+            ValueError: If amax has negative values.
+        """
+        if (amax < 0).any():
+            raise ValueError("Negative values in amax")
+        return amax
+
     def init_learn_amax(self):
         """Initialize learned amax from fixed amax"""
         if self._learn_amax is False:
@@ -390,6 +405,8 @@ class TensorQuantizer(nn.Module):
         """
         dst_has_amax = '_amax' in self._buffers
         src_has_amax = prefix + '_amax' in state_dict
+        if src_has_amax:
+            self._check_amax(state_dict[prefix + '_amax'])
 
         if not src_has_amax and dst_has_amax:
             logging.error("{}: No amax in state_dict.".format(prefix[:-1]))
@@ -297,21 +297,72 @@ class TensorQuantFunction(Function):
 class FakeTensorQuantFunction(Function):
     """Fake version of TensorQuantFunction
     See comments of TensorQuantFunction, arguments are the same.
+
+    Unlike TensorQuantFunction, it never synchronizes with the device: amax is expected to be non-negative, which
+    TensorQuantizer checks once when amax is set, and inputs of unsigned quantization are not checked. A negative
+    amax quantizes to 0 and negative inputs of unsigned quantization are clamped to 0. Set ``check_inputs`` to True
+    to raise on them like TensorQuantFunction does, e.g. when calling fake_tensor_quant directly while debugging.
+
+    Raises:
+        ValueError: If check_inputs is True and amax has negative values.
+        TypeError: If check_inputs is True and unsigned quantization gets negative inputs.
     """
 
+    # A static switch for checking amax and the inputs of unsigned quantization on every call. The checks synchronize
+    # with the device, so it is off by default.
+    check_inputs = False
+
     @staticmethod
     def forward(ctx, inputs, amax, num_bits=8, unsigned=False, narrow_range=True):
+        if FakeTensorQuantFunction.check_inputs:
+            if unsigned and inputs.min() < 0.:
+                raise TypeError("Negative values encountered in unsigned quantization.")
+            if amax.min() < 0:
+                raise ValueError("Negative values in amax")
         ctx.save_for_backward(inputs, amax)
-        outputs, scale = _tensor_quant(inputs, amax, num_bits, unsigned, narrow_range)
-        return outputs / scale.to(inputs.dtype)
+        return _fake_tensor_quant(inputs, amax, int(num_bits), bool(unsigned), bool(narrow_range))
 
     @staticmethod
     def backward(ctx, grad_outputs):
         inputs, amax = ctx.saved_tensors
-        zero = grad_outputs.new_zeros(1)
-        grad_inputs = torch.where(inputs.abs() <= amax, grad_outputs, zero)
+        grad_inputs = _fake_tensor_quant_backward(grad_outputs, inputs, amax)
         return grad_inputs, None, None, None, None
 
+# The fake quantization functions are scripted so that their elementwise ops can be fused into a single kernel.
+# They compute the same values as _tensor_quant followed by the division by scale, without any host sync.
+@torch.jit.script
+def _fake_tensor_quant(inputs, amax, num_bits: int = 8, unsigned: bool = False, narrow_range: bool = True):
+    """Fake quantizes inputs. See FakeTensorQuantFunction"""
+    max_bound = 2.0**(num_bits - 1 + int(unsigned)) - 1.0
+    if unsigned:
+        min_bound = 0.
+    elif narrow_range:
+        min_bound = -max_bound
+    else:
+        min_bound = -max_bound - 1.
+
+    # Computation must be in FP32 to prevent potential over flow.
+    x = inputs
+    if inputs.dtype == torch.half:
+        x = inputs.float()
+    if amax.dtype == torch.half:
+        amax = amax.float()
+
+    # Treat amax smaller than minimum representable of fp16 as 0. Values quantized with amax=0 should all be 0, and
+    # dividing them by 1 makes more sense.
+    zero_amax = amax <= 1. / (1 << 24)
+    scale = torch.full_like(amax, max_bound) / amax
+    quant_scale = torch.where(zero_amax, torch.zeros_like(scale), scale)
+    dequant_scale = torch.where(zero_amax, torch.ones_like(scale), scale)
+
+    outputs = torch.clamp((x * quant_scale).round(), min_bound, max_bound)
+    return outputs.to(inputs.dtype) / dequant_scale.to(inputs.dtype)
+
+@torch.jit.script
+def _fake_tensor_quant_backward(grad_outputs, inputs, amax):
+    """Straight through estimation with clipping. See TensorQuantFunction.backward"""
+    return grad_outputs.masked_fill(~(inputs.abs() <= amax), 0.)
+
 def _tensor_quant(inputs, amax, num_bits=8, unsigned=False, narrow_range=True):
     """Shared function body between TensorQuantFunction and FakeTensorQuantFunction"""
         # Fine scale, per channel scale will be handled by broadcasting, which could be tricky. Pop a warning.
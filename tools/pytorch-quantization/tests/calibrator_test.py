@@ -16,14 +16,21 @@
 
 
 """Tests of calibrators"""
+import time
+from collections import Counter
+
 import pytest
 import numpy as np
 
+from scipy.stats import entropy
 import torch
 
 from pytorch_quantization import utils as quant_utils
 from pytorch_quantization import calib
 from pytorch_quantization import nn as quant_nn
+from pytorch_quantization.calib import histogram
+from pytorch_quantization.calib.histogram import _compute_amax_entropy, _compute_amax_mse
+from pytorch_quantization.tensor_quant import fake_tensor_quant
 import tests.utils as test_utils
 from tests.fixtures import verbose
 from tests.fixtures.models import QuantLeNet
@@ -139,6 +146,93 @@ class TestHistogramCalibrator():
         # amax should be close to 5
         assert (amax - 5.).abs() < 10/2048
 
+    def test_collect_matches_numpy(self):
+        calibrator = calib.HistogramCalibrator(8, None, False)
+        x_1 = torch.rand(10000)
+        x_2 = torch.rand(10000) * 3. # grows the range
+        x_3 = torch.rand(10000) * 2.
+        for x in [x_1, x_2, x_3]:
+            calibrator.collect(x)
+
+        assert calibrator._calib_hist.dtype == torch.long
+        np.testing.assert_allclose(calibrator._calib_bin_edges[1:] - calibrator._calib_bin_edges[:-1],
+                                   calibrator._calib_bin_edges[1] - calibrator._calib_bin_edges[0])
+        assert calibrator._calib_bin_edges[-1] >= x_2.max().item()
+
+        # Values below the first edge are dropped, like np.histogram does
+        ref_hist, _ = np.histogram(torch.cat([x_1, x_2, x_3]).cpu().numpy(), bins=calibrator._calib_bin_edges)
+        hist = calibrator._calib_hist.cpu().numpy()
+        assert hist.sum() == ref_hist.sum()
+        # Values very close to an edge may be counted in the neighbouring bin
+        assert np.abs(hist - ref_hist).sum() <= 1e-3 * ref_hist.sum()
+
+    def test_collect_on_device(self):
+        calibrator = calib.HistogramCalibrator(8, None, False)
+        calibrator.collect(torch.rand(11, 7, 3, 3).cuda())
+        calibrator.collect(torch.rand(11, 7, 3, 3).cuda() * 2.)
+
+        assert calibrator._calib_hist.is_cuda
+        assert calibrator._calib_hist.sum().item() == 2 * 11 * 7 * 3 * 3
+
+        amax = calibrator.compute_amax("mse")
+        assert amax.is_cuda
+
+    @pytest.mark.parametrize("method", ["entropy", "mse", "percentile"])
+    def test_per_channel(self, method):
+        x = torch.rand(3, 7, 31)
+        x[1] *= 4.
+        x[2, 1, 1] = 10. # create outlier
+
+        calibrator = calib.HistogramCalibrator(8, 1, False)
+        calibrator.collect(x)
+        assert calibrator._calib_hist.shape == (1, 7, 1, 2048)
+        amax = calibrator.compute_amax(method)
+        assert amax.shape == (1, 7, 1)
+
+        # Each channel matches its own per tensor histogram
+        for i in range(7):
+            ref_calibrator = calib.HistogramCalibrator(8, None, False)
+            ref_calibrator.collect(x[:, i])
+            np.testing.assert_array_equal(calibrator._calib_hist[0, i, 0].cpu().numpy(),
+                                          ref_calibrator._calib_hist.cpu().numpy())
+            np.testing.assert_array_equal(calibrator._calib_bin_edges[0, i, 0], ref_calibrator._calib_bin_edges)
+            test_utils.compare(amax[0, i, 0], ref_calibrator.compute_amax(method), rtol=0, atol=0, ctol=0)
+
+    def test_per_channel_grow(self):
+        calibrator = calib.HistogramCalibrator(8, 0, False, num_bins=128)
+        x_1 = torch.rand(4, 100)
+        x_2 = torch.rand(4, 100)
+        x_2[1] *= 1.5
+        x_2[3] *= 3.
+        calibrator.collect(x_1)
+        calibrator.collect(x_2)
+
+        # All channels get the bins needed by the widest one
+        num_bins = calibrator._calib_hist.shape[-1]
+        assert num_bins > 128
+        assert calibrator._calib_bin_edges.shape == (4, 1, num_bins + 1)
+        edges = calibrator._calib_bin_edges.reshape(4, -1)
+        np.testing.assert_allclose(edges[:, 1:] - edges[:, :-1], np.broadcast_to(edges[:, 1:2] - edges[:, :1], (4, num_bins)))
+        assert (edges[:, -1] >= x_2.max(dim=1)[0].cpu().numpy()).all()
+        # Only values below the range of the first batch are dropped
+        below = (x_2 < torch.tensor(edges[:, :1], dtype=torch.float32)).sum(dim=1)
+        np.testing.assert_array_equal(calibrator._calib_hist.reshape(4, -1).sum(dim=1).cpu().numpy(),
+                                      (200 - below).cpu().numpy())
+
+        with pytest.raises(RuntimeError, match="shape changed"):
+            calibrator.collect(torch.rand(5, 100))
+
+    @pytest.mark.parametrize("axis", [None, 1])
+    def test_compute_amax_keeps_histogram(self, axis):
+        calibrator = calib.HistogramCalibrator(8, axis, False)
+        calibrator.collect(torch.rand(3, 7, 31))
+        hist = calibrator._calib_hist.clone()
+        percentile_amax = calibrator.compute_amax("percentile", percentile=0.1)
+
+        calibrator.compute_amax("entropy")
+        assert torch.equal(calibrator._calib_hist, hist)
+        test_utils.compare(calibrator.compute_amax("percentile", percentile=0.1), percentile_amax, rtol=0, atol=0, ctol=0)
+
 class TestEntropyCalibrator():
 
     def test_one_tensor(self, verbose):
@@ -195,6 +289,79 @@ class TestEntropyCalibrator():
         hist_calibrator = calib.HistogramCalibrator(8, None, True)
         repr(hist_calibrator)
 
+def _reference_compute_amax_entropy(calib_hist, calib_bin_edges, num_bits, unsigned, stride=1, start_bin=128):
+    """Per bin implementation of the KL-Divergence sweep, which _compute_amax_entropy must match exactly"""
+    bins = calib_hist[:]
+    bins[0] = bins[1]
+    total_data = np.sum(bins)
+    divergences = []
+    nbins = 1 << (num_bits - 1 + int(unsigned))
+    new_density_counts = np.zeros(nbins, dtype=np.float64)
+
+    for i in range(start_bin, len(bins) + 1, stride):
+        new_density_counts.fill(0)
+        space = np.linspace(0, i, num=nbins + 1)
+        digitized_space = np.digitize(range(i), space) - 1
+        digitized_space[bins[:i] == 0] = -1
+
+        for idx, digitized in enumerate(digitized_space):
+            if digitized != -1:
+                new_density_counts[digitized] += bins[idx]
+        counter = Counter(digitized_space)
+        for key, val in counter.items():
+            if key != -1:
+                new_density_counts[key] = new_density_counts[key] / val
+
+        new_density = np.zeros(i, dtype=np.float64)
+        for idx, digitized in enumerate(digitized_space):
+            if digitized != -1:
+                new_density[idx] = new_density_counts[digitized]
+
+        reference_density = np.array(bins[:len(digitized_space)])
+        reference_density[-1] += np.sum(bins[i:])
+        assert round(np.sum(new_density) + np.sum(bins[i:])) == total_data
+        assert round(np.sum(reference_density)) == total_data
+
+        divergences.append(entropy(reference_density, new_density))
+
+    divergences = np.array(divergences)
+    last_argmin = len(divergences) - 1 - np.argmin(divergences[::-1])
+    return calib_bin_edges[last_argmin * stride + start_bin]
+
+class TestEntropySweep():
+
+    @pytest.mark.parametrize("num_bits, unsigned, stride, start_bin", [
+        (8, False, 1, 128), (8, True, 1, 128), (8, False, 3, 128), (4, True, 2, 10)])
+    def test_matches_reference(self, num_bits, unsigned, stride, start_bin):
+        samples = [
+            np.random.rand(5000),
+            np.append(np.abs(np.random.randn(20000)), 40.), # long tail
+            np.random.randint(0, 30, 300).astype(np.float32), # mostly empty bins
+        ]
+        for x in samples:
+            calib_hist, calib_bin_edges = np.histogram(x, bins=512)
+            amax = _compute_amax_entropy(
+                calib_hist.copy(), calib_bin_edges, num_bits, unsigned, stride, start_bin)
+            ref_amax = _reference_compute_amax_entropy(
+                calib_hist.copy(), calib_bin_edges, num_bits, unsigned, stride, start_bin)
+            assert amax.item() == np.float32(ref_amax)
+
+    def test_benchmark(self, verbose):
+        calib_hist, calib_bin_edges = np.histogram(np.abs(np.random.randn(100000)), bins=2048)
+
+        start = time.perf_counter()
+        amax = _compute_amax_entropy(calib_hist.copy(), calib_bin_edges, 8, False)
+        elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        ref_amax = _reference_compute_amax_entropy(calib_hist.copy(), calib_bin_edges, 8, False)
+        ref_elapsed = time.perf_counter() - start
+
+        assert amax.item() == np.float32(ref_amax)
+
+        if verbose:
+            print('entropy sweep: {:.3f}s, per bin reference: {:.3f}s'.format(elapsed, ref_elapsed), end=' ')
+
 class TestMSECalibrator():
 
     def test_one_tensor(self, verbose):
@@ -244,6 +411,32 @@ class TestMSECalibrator():
         # amax should be closer to 255
         assert (amax - 255.).abs() < (amax - 256.).abs()
 
+    @pytest.mark.parametrize("unsigned, stride", [(False, 1), (True, 1), (False, 5)])
+    def test_matches_per_candidate_sweep(self, unsigned, stride):
+        calib_hist, calib_bin_edges = np.histogram(np.abs(np.random.randn(10000)), bins=512)
+        amax = _compute_amax_mse(calib_hist, calib_bin_edges, 8, unsigned, stride)
+
+        counts = torch.from_numpy(calib_hist).float()
+        edges = torch.from_numpy(calib_bin_edges).float()
+        centers = (edges[1:] + edges[:-1]) / 2
+        mses = {}
+        for i in range(128, len(centers), stride):
+            quant_centers = fake_tensor_quant(centers, centers[i], 8, unsigned)
+            mses[centers[i].item()] = ((quant_centers - centers)**2 * counts).mean().item()
+
+        # Reductions may round differently, so only require amax to be one of the best candidates
+        assert mses[amax.item()] == pytest.approx(min(mses.values()), rel=1e-6)
+
+    def test_chunks(self, monkeypatch):
+        calib_hist, calib_bin_edges = np.histogram(np.abs(np.random.randn(10000)), bins=512)
+        amax = _compute_amax_mse(calib_hist, calib_bin_edges, 8, False)
+
+        # Only a few candidates fit in each chunk
+        monkeypatch.setattr(histogram, "_MSE_CHUNK_NUMEL", 3 * 512)
+        chunked_amax = _compute_amax_mse(calib_hist, calib_bin_edges, 8, False)
+
+        test_utils.compare(amax, chunked_amax, rtol=0, atol=0, ctol=0)
+
     def test_repr(self):
         calibrator = calib.HistogramCalibrator(8, None, False)
         repr(calibrator)
@@ -16,6 +16,8 @@
 
 
 """tests of tensor quantization function and module"""
+import time
+
 import pytest
 import numpy as np
 
@@ -266,6 +268,77 @@ class TestFakeTensorQuant():
         quant_x_torch = tensor_quant.fake_tensor_quant(x_torch, torch.max(torch.abs(x_torch)), 8, True, False)
         np.testing.assert_array_almost_equal(quant_x_torch.cpu().numpy(), quant_x_np)
 
+    @pytest.mark.parametrize("dtype", [torch.float32, torch.float64])
+    def test_matches_tensor_quant(self, dtype):
+        x = torch.randn(5, 7, 3).to(dtype) * 4.
+        amaxs = [x.abs().max(), x.abs().amax(dim=(0, 2), keepdim=True), torch.tensor(0.).to(dtype)]
+        amaxs[1][0, 3, 0] = 0. # quantizes the channel to 0
+        for amax in amaxs:
+            for num_bits, unsigned, narrow_range in [(8, False, True), (8, False, False), (4, False, True), (8, True, True)]:
+                inputs = x.abs() if unsigned else x
+                outputs, scale = tensor_quant._tensor_quant(inputs, amax, num_bits, unsigned, narrow_range)
+                ref_quant_x = outputs / scale.to(dtype)
+                quant_x = tensor_quant.fake_tensor_quant(inputs, amax, num_bits, unsigned, narrow_range)
+                assert quant_x.dtype == dtype
+                np.testing.assert_array_equal(quant_x.cpu().numpy(), ref_quant_x.cpu().numpy())
+
+    def test_check_inputs(self):
+        x = torch.randn(5, 7, 3)
+        # Not checked by default, to not synchronize
+        np.testing.assert_array_equal(tensor_quant.fake_tensor_quant(x, torch.tensor(-1.)).cpu().numpy(), 0.)
+        assert (tensor_quant.fake_tensor_quant(x, x.abs().max(), 8, True).cpu().numpy() >= 0).all()
+
+        tensor_quant.FakeTensorQuantFunction.check_inputs = True
+        try:
+            with pytest.raises(ValueError, match="Negative values in amax"):
+                tensor_quant.fake_tensor_quant(x, torch.tensor(-1.))
+            with pytest.raises(TypeError, match="Negative values encountered"):
+                tensor_quant.fake_tensor_quant(x, x.abs().max(), 8, True)
+            tensor_quant.fake_tensor_quant(x.abs(), x.abs().max(), 8, True)
+        finally:
+            tensor_quant.FakeTensorQuantFunction.check_inputs = False
+
+    def test_matches_tensor_quant_fp16(self):
+        x = torch.randn(1023).cuda().half()
+        for amax in [x.abs().max(), torch.tensor(1e-4).cuda().half()]:
+            outputs, scale = tensor_quant._tensor_quant(x, amax, 8, False, True)
+            ref_quant_x = outputs / scale.to(x.dtype)
+            quant_x = tensor_quant.fake_tensor_quant(x, amax, 8)
+            assert quant_x.dtype == torch.half
+            np.testing.assert_array_equal(quant_x.cpu().numpy(), ref_quant_x.cpu().numpy())
+
+    def test_benchmark_cpu(self, verbose):
+        x = torch.randn(32, 64, 32, 32, device="cpu")
+        amax = x.abs().amax(dim=(0, 2, 3), keepdim=True) * 0.8
+        num_iters = 10
+
+        def reference(inputs):
+            outputs, scale = tensor_quant._tensor_quant(inputs, amax)
+            return outputs / scale.to(inputs.dtype)
+
+        def reference_backward(grad_outputs, inputs):
+            return torch.where(inputs.abs() <= amax, grad_outputs, grad_outputs.new_zeros(1))
+
+        def benchmark(func, *args):
+            func(*args) # warm up, e.g. scripting
+            start = time.perf_counter()
+            for _ in range(num_iters):
+                outputs = func(*args)
+            return outputs, (time.perf_counter() - start) / num_iters
+
+        ref_quant_x, ref_forward_time = benchmark(reference, x)
+        quant_x, forward_time = benchmark(tensor_quant.fake_tensor_quant, x, amax)
+        np.testing.assert_array_equal(quant_x.numpy(), ref_quant_x.numpy())
+
+        grad_outputs = torch.randn_like(x)
+        ref_grad_x, ref_backward_time = benchmark(reference_backward, grad_outputs, x)
+        grad_x, backward_time = benchmark(tensor_quant._fake_tensor_quant_backward, grad_outputs, x, amax)
+        np.testing.assert_array_equal(grad_x.numpy(), ref_grad_x.numpy())
+
+        if verbose:
+            print("forward: {:.2f}ms (reference {:.2f}ms), backward: {:.2f}ms (reference {:.2f}ms)".format(
+                forward_time * 1e3, ref_forward_time * 1e3, backward_time * 1e3, ref_backward_time * 1e3), end=' ')
+
 class TestQuantDescriptor():
 
     def test_scaled_mode(self):
@@ -165,6 +165,18 @@ class TestTensorQuantizer():
         quantizer3 = tensor_quantizer.TensorQuantizer(quant_desc3)
         assert quantizer3.amax is None
 
+    def test_negative_amax(self):
+        """amax is checked once when it is set, instead of on every quantization"""
+        with pytest.raises(ValueError, match="Negative values in amax"):
+            tensor_quantizer.TensorQuantizer(tensor_quant.QuantDescriptor(amax=[1., -1.]))
+
+        quantizer = tensor_quantizer.TensorQuantizer(tensor_quant.QuantDescriptor(amax=[3.142, 2.718]))
+        with pytest.raises(ValueError, match="Negative values in amax"):
+            quantizer.amax = [3.142, -2.718]
+        with pytest.raises(ValueError, match="Negative values in amax"):
+            quantizer.load_state_dict({'_amax': torch.tensor([-1., 1.])})
+        np.testing.assert_array_equal(quantizer.amax.detach().cpu().numpy(), np.float32([3.142, 2.718]))
+
     def test_init_calib(self):
         quant_desc2 = tensor_quant.QuantDescriptor(axis=(0, 1))
         quantizer2 = tensor_quantizer.TensorQuantizer(quant_desc2, if_calib=True).cuda()